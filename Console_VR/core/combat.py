@@ -1,479 +1,736 @@
-"""
-combat.py - Advanced turn-based combat system for FateQuest.
-Handles player vs enemy battles, skills, items, combos, statuses, and outcomes.
-"""
-
-import random
-from typing import Optional, List
-
-class Combat:
-    """
-    Combat system managing turn-based battles between the player and enemies.
-    """
-    def __init__(self, player, monster_manager, item_manager, achievement_system):
-        """
-        Initialize the combat system with references to player, monster manager,
-        item manager, and achievement system.
-        """
-        self.player = player
-        self.monster_manager = monster_manager
-        self.item_manager = item_manager
-        self.achievement_system = achievement_system
-        
-        self.enemy = None  # Current enemy object
-        self.enemy_original = None  # Template for enemy
-        self.combat_active = False
-        self.player_turn = True
-        self.turn_count = 0
-        self.skill_history: List[str] = []  # For combo tracking
-        self.status_effects = []  # Active status effects affecting combat
-        self.environment_effects = []  # Environmental effects for the battle
-        
-        # Example combo definitions: sequences of skills leading to combo effects
-        self.combos = {
-            ('Power Strike', 'Flurry'): 'Thunderous Combo',
-            ('Fireball', 'Ignite'): 'Firestorm',
-        }
-        
-    def start_combat(self, enemy):
-        """
-        Initiate combat with a given enemy (id, template, or object).
-        """
-        # Prepare enemy data
-        self.enemy = self._prepare_enemy(enemy)
-        self.combat_active = True
-        self.player_turn = True  # Player starts
-        
-        # Apply title effects or history modifications if any
-        self._apply_title_effects()
-        self._calculate_history_modifier()
-        
-        # Check for surprise attacks
-        if self._check_surprise_attack():
-            print(f"Surprise attack! {self.enemy['name']} strikes first!")
-            self.player_turn = False
-        
-        # Combat loop: alternate turns until combat ends
-        while self.combat_active:
-            self.turn_count += 1
-            # Player turn
-            if self.player_turn:
-                self._display_combat_status()
-                # In actual game, user would input command; here assume higher-level calls
-                # For demo, auto player attacks
-                self._player_attack()
-            else:
-                # Enemy turn
-                self._enemy_turn()
-            
-            # Update status effects after each full round
-            self._update_status_effects()
-            
-            # Check end conditions
-            if self.player.hp <= 0:
-                self.combat_active = False
-                print("Player has been defeated!")
-                self.end_combat(fled=False)
-                break
-            if self.enemy and self.enemy['current_hp'] <= 0:
-                self.combat_active = False
-                print(f"{self.enemy['name']} defeated!")
-                self._handle_drops()
-                self._check_combat_achievements()
-                self.end_combat(fled=False)
-                break
-            
-            # Toggle turn
-            self.player_turn = not self.player_turn
-    
-    def _prepare_enemy(self, enemy_template):
-        """
-        Prepare an enemy instance for combat from a template or ID.
-        """
-        if isinstance(enemy_template, dict):
-            # Assume already a template; apply variations
-            base_enemy = enemy_template.copy()
-        else:
-            # Could be an ID or key, use monster_manager to get template
-            base_enemy = self.monster_manager.get_enemy(enemy_template)
-        # Deep copy to not modify original data
-        enemy = base_enemy.copy()
-        # Initialize current HP and stats
-        enemy['current_hp'] = enemy.get('hp', 0)
-        enemy['level'] = enemy.get('level', 1)
-        enemy['status_effects'] = []
-        return enemy
-    
-    def _apply_title_effects(self):
-        """
-        Apply any combat modifiers based on player's titles.
-        """
-        # Example: if player has title 'Orc Slayer', increase damage vs orcs
-        for title in self.player.titles:  # Assume player has list of titles
-            if title == "Chasseur d'Orcs" and self.enemy.get('race') == 'Orc':
-                print("Title effect: Extra damage to Orcs!")
-                # e.g., boost player's damage stat temporarily
-                self.player.attack += 5
-    
-    def _check_for_race_title(self, race: str) -> bool:
-        """
-        Check if player has a title related to the enemy's race.
-        """
-        return any(race in title for title in self.player.titles)
-    
-    def _calculate_history_modifier(self):
-        """
-        Calculate modifiers based on past encounters or history (e.g., repeated fights).
-        """
-        # Example: if player repeatedly fights same enemy type, minor stat changes
-        pass  # Placeholder for history modifiers
-    
-    def _check_surprise_attack(self) -> bool:
-        """
-        Determine if a surprise attack occurs (enemy strikes first).
-        """
-        chance = 10  # 10% chance
-        roll = random.randint(1, 100)
-        return roll <= chance
-    
-    def process_command(self, command: str, args=None):
-        """
-        Process player command during combat.
-        """
-        if not self.combat_active:
-            return
-        cmd = command.lower()
-        if cmd == "attack":
-            self._player_attack()
-        elif cmd == "defend":
-            self._defend()
-        elif cmd == "skill" and args:
-            self._use_skill(args)
-        elif cmd == "use" and args:
-            self._use_item(args)
-        elif cmd == "analyze":
-            self._analyze_enemy()
-        elif cmd == "escape":
-            self._try_escape()
-        else:
-            print("Unknown command.")
-    
-    def _player_attack(self):
-        """
-        Player performs a basic attack on the enemy.
-        """
-        # Basic damage calculation: player's attack minus enemy defense
-        atk = getattr(self.player, 'attack', 1)
-        defense = self.enemy.get('defense', 0)
-        damage = max(atk - defense, 1)
-        self.enemy['current_hp'] -= damage
-        print(f"You attack {self.enemy['name']} for {damage} damage.")
-    
-    def _use_skill(self, skill_name: str):
-        """
-        Player uses a skill by name.
-        """
-        skill = self.player.skills.get(skill_name)
-        if not skill:
-            print(f"You don't know skill '{skill_name}'.")
-            return
-        # Process based on skill type
-        skill_type = skill.get('type')
-        print(f"You use {skill_name}.")
-        if skill_type == 'damage':
-            self._process_damage_skill(skill)
-        elif skill_type == 'heal':
-            self._process_heal_skill(skill)
-        elif skill_type == 'buff':
-            self._process_buff_skill(skill)
-        elif skill_type == 'debuff':
-            self._process_debuff_skill(skill)
-        elif skill_type == 'special':
-            self._process_special_skill(skill)
-        # Record skill use for combo detection
-        self._record_skill_use(skill_name)
-    
-    def _process_damage_skill(self, skill_data: dict):
-        """
-        Handle a damage-dealing skill.
-        """
-        power = skill_data.get('power', 0)
-        enemy_def = self.enemy.get('defense', 0)
-        damage = max(power - enemy_def, 1)
-        self.enemy['current_hp'] -= damage
-        print(f"{self.enemy['name']} takes {damage} damage from skill.")
-    
-    def _process_heal_skill(self, skill_data: dict):
-        """
-        Handle a healing skill.
-        """
-        amount = skill_data.get('power', 0)
-        self.player.hp = min(self.player.hp + amount, self.player.max_hp)
-        print(f"You heal yourself for {amount} HP.")
-    
-    def _process_buff_skill(self, skill_data: dict):
-        """
-        Handle a buff skill (increases player stats temporarily).
-        """
-        stat = skill_data.get('stat')
-        amount = skill_data.get('amount', 0)
-        duration = skill_data.get('duration', 3)
-        # Example buff effect
-        self.status_effects.append({'target': 'player', 'stat': stat, 'amount': amount, 'duration': duration})
-        print(f"You buff yourself: {stat} +{amount} for {duration} turns.")
-    
-    def _process_debuff_skill(self, skill_data: dict):
-        """
-        Handle a debuff skill (decreases enemy stats).
-        """
-        stat = skill_data.get('stat')
-        amount = skill_data.get('amount', 0)
-        duration = skill_data.get('duration', 3)
-        self.enemy['status_effects'].append({'target': 'enemy', 'stat': stat, 'amount': -amount, 'duration': duration})
-        print(f"{self.enemy['name']}'s {stat} decreased by {amount} for {duration} turns.")
-    
-    def _process_special_skill(self, skill_data: dict):
-        """
-        Handle a special skill with unique effects.
-        """
-        effect = skill_data.get('effect', 'none')
-        # Placeholder for special effects
-        print(f"Special effect '{effect}' activated!")
-    
-    def _use_item(self, item_name: str):
-        """
-        Player uses an item from inventory.
-        """
-        item = self.player.find_item_by_name(item_name)
-        if not item:
-            print(f"You don't have {item_name}.")
-            return
-        # Use the item (e.g. potion, scroll)
-        self.item_manager.use_item(item, self.player)
-        print(f"You use {item_name}.")
-    
-    def _defend(self):
-        """
-        Player defends, reducing incoming damage.
-        """
-        self.player.defending = True
-        print("You brace for the next attack, reducing incoming damage.")
-    
-    def _analyze_enemy(self):
-        """
-        Player analyzes the enemy, revealing information.
-        """
-        desc = self.monster_manager.get_monster_description(self.enemy)
-        print(desc)
-    
-    def _try_escape(self):
-        """
-        Player attempts to flee from combat.
-        """
-        chance = 50  # 50% base escape chance
-        roll = random.randint(1, 100)
-        if roll <= chance:
-            print("You successfully escaped!")
-            self.end_combat(fled=True)
-        else:
-            print("Escape failed!")
-    
-    def _display_combat_status(self):
-        """
-        Display current HP/status bars for player and enemy.
-        """
-        bar_width = 20
-        def bar(current, maximum):
-            filled = int(bar_width * current / maximum)
-            return '[' + '#' * filled + ' ' * (bar_width - filled) + ']'
-        print(f"Player HP: {bar(self.player.hp, self.player.max_hp)} {self.player.hp}/{self.player.max_hp}")
-        print(f"{self.enemy['name']} HP: {bar(self.enemy['current_hp'], self.enemy['hp'])} {self.enemy['current_hp']}/{self.enemy['hp']}")
-    
-    def _create_bar(self, percent, width, char, color=None):
-        """
-        Create a textual bar (unused in this context, as we built one above).
-        """
-        filled = int(width * percent)
-        return char * filled + '-' * (width - filled)
-    
-    def _show_available_skills(self):
-        """
-        List player's available skills during combat.
-        """
-        skills = ', '.join(self.player.skills.keys())
-        print(f"Available skills: {skills}")
-    
-    def _enemy_turn(self):
-        """
-        Execute enemy actions on its turn.
-        """
-        if not self._check_enemy_can_act():
-            print(f"{self.enemy['name']} is unable to act!")
-            return
-        action = self._decide_enemy_action()
-        if action == 'attack':
-            self._enemy_attack()
-        elif action == 'skill':
-            self._enemy_use_skill()
-        elif action == 'heal':
-            self._enemy_heal()
-    
-    def _update_status_effects(self):
-        """
-        Update or apply status effects each turn.
-        """
-        for effect in list(self.status_effects):
-            # Example: buff on player
-            target = effect['target']
-            if target == 'player' and effect['duration'] > 0:
-                setattr(self.player, effect['stat'], getattr(self.player, effect['stat'], 0) + effect['amount'])
-                effect['duration'] -= 1
-                if effect['duration'] <= 0:
-                    self.status_effects.remove(effect)
-        # Update enemy status effects
-        for effect in list(self.enemy['status_effects']):
-            if effect['duration'] > 0:
-                setattr(self.enemy, effect['stat'], self.enemy.get(effect['stat'], 0) + effect['amount'])
-                effect['duration'] -= 1
-                if effect['duration'] <= 0:
-                    self.enemy['status_effects'].remove(effect)
-    
-    def _check_enemy_can_act(self) -> bool:
-        """
-        Determine if the enemy is able to take an action (e.g., not stunned).
-        """
-        # If enemy has a 'stun' in status effects, cannot act
-        for effect in self.enemy['status_effects']:
-            if effect.get('stat') == 'stun' and effect.get('amount', 0) < 0:
-                return False
-        return True
-    
-    def _decide_enemy_action(self):
-        """
-        Decide the enemy's next action based on simple AI.
-        """
-        # Simple logic: if enemy HP low, try heal; else random between attack/skill
-        hp_ratio = self.enemy['current_hp'] / self.enemy['hp']
-        if hp_ratio < 0.3 and 'heal' in self.enemy.get('abilities', []):
-            return 'heal'
-        if random.random() < 0.7:
-            return 'attack'
-        elif 'abilities' in self.enemy and self.enemy['abilities']:
-            return 'skill'
-        else:
-            return 'attack'
-    
-    def _enemy_attack(self):
-        """
-        Enemy performs a basic attack on the player.
-        """
-        atk = self.enemy.get('attack', 1)
-        defense = getattr(self.player, 'defense', 0)
-        damage = max(atk - defense, 1)
-        # If player defended last turn, reduce damage
-        if getattr(self.player, 'defending', False):
-            damage = max(int(damage / 2), 1)
-            self.player.defending = False
-        self.player.hp -= damage
-        print(f"{self.enemy['name']} attacks you for {damage} damage.")
-    
-    def _enemy_use_skill(self):
-        """
-        Enemy uses a special ability against the player.
-        """
-        abilities = self.enemy.get('abilities', [])
-        if not abilities:
-            self._enemy_attack()
-            return
-        skill = random.choice(abilities)
-        # For simplicity, treat as damage skill
-        power = skill.get('power', 0) if isinstance(skill, dict) else 5
-        defense = getattr(self.player, 'defense', 0)
-        damage = max(power - defense, 1)
-        self.player.hp -= damage
-        print(f"{self.enemy['name']} uses {skill.get('name', 'skill')} dealing {damage} damage.")
-    
-    def _enemy_heal(self):
-        """
-        Enemy attempts to heal itself.
-        """
-        amount = self.enemy.get('heal_power', 5)
-        self.enemy['current_hp'] = min(self.enemy['current_hp'] + amount, self.enemy['hp'])
-        print(f"{self.enemy['name']} heals for {amount} HP.")
-    
-    def end_combat(self, fled: bool=False):
-        """
-        Clean up after combat ends.
-        """
-        self.combat_active = False
-        if fled:
-            print("You fled the combat.")
-        else:
-            print("Combat has ended.")
-        # Reset defending flag
-        self.player.defending = False
-    
-    def _handle_drops(self):
-        """
-        Handle loot drops when an enemy is defeated.
-        """
-        loot = []
-        if 'loot_table' in self.enemy:
-            for item_info in self.enemy['loot_table']:
-                chance = item_info.get('chance', 100)
-                roll = random.randint(1, 100)
-                if roll <= chance:
-                    loot.append(item_info.get('item_id'))
-        # Give loot to player
-        for item_id in loot:
-            item = self.item_manager.get_item_by_id(item_id)
-            self.player.add_item(item)
-            print(f"You obtained {item.get('name')} from the loot.")
-    
-    def _check_combat_achievements(self):
-        """
-        Check if any achievements are fulfilled by this combat.
-        """
-        stats = {'turns': self.turn_count, 'damage_dealt': None}  # Example stats
-        self.achievement_system.check_combat_achievements(stats)
-    
-    def _check_skill_combos(self, skill_name: str) -> Optional[str]:
-        """
-        Check if using a skill finishes a special combo.
-        """
-        for combo_skills, combo_name in self.combos.items():
-            if len(self.skill_history) >= len(combo_skills):
-                # get last n skills
-                if tuple(self.skill_history[-len(combo_skills):]) == combo_skills:
-                    return combo_name
-        return None
-    
-    def _apply_combo_effects(self, combo_name: str):
-        """
-        Apply special effects from a skill combo.
-        """
-        print(f"Combo {combo_name} activated! Extra effects apply.")
-        # Example: double damage next attack
-        if combo_name == 'Firestorm':
-            # Increase next damage
-            self.player.attack *= 2
-    
-    def _record_skill_use(self, skill_name: str):
-        """
-        Record a skill use for combo detection.
-        """
-        self.skill_history.append(skill_name)
-        # Limit history length
-        if len(self.skill_history) > 5:
-            self.skill_history.pop(0)
-        # Check for combos
-        combo = self._check_skill_combos(skill_name)
-        if combo:
-            self._apply_combo_effects(combo)
-    
-    def _check_environmental_effects(self):
-        """
-        Apply any environmental effects in the battle.
-        """
-        for effect in self.environment_effects:
-            print(f"Environmental effect: {effect}")
+"""
+combat.py - Advanced turn-based combat system for FateQuest.
+Handles player vs enemy battles, skills, items, combos, statuses, and outcomes.
+"""
+
+import random
+from collections.abc import Mapping
+from typing import Optional, List
+from core.monsters import MonsterInstance
+from core.estimator import estimate_battle, skill_power
+from core.messages import emit
+from core.effects import EffectScheduler
+from core.combos import compile_combo_automaton, load_combo_definitions
+from core.initiative import InitiativeQueue
+from core.loot import compile_loot_tables
+from core import replay
+from core.content import ContentRegistry
+
+# Écart de niveau à partir duquel un combat est résolu sans être joué
+AUTO_RESOLVE_LEVEL_GAP = 5
+
+class Combat:
+    """
+    Combat system managing turn-based battles between the player and enemies.
+    """
+    def __init__(self, player, monster_manager, item_manager, achievement_system, rng=None, data_dir="data", content=None,
+                 recorder=None):
+        """
+        Initialize the combat system with references to player, monster manager,
+        item manager, and achievement system.
+        rng: source of randomness (random.Random); the global random module by default.
+        recorder: optional replay.CombatRecorder; every fight is then recorded.
+        """
+        self.rng = rng if rng is not None else random
+        self.recorder = recorder
+        self.content = content or ContentRegistry.get_instance(data_dir)
+        self.player = player
+        self.monster_manager = monster_manager
+        self.item_manager = item_manager
+        self.achievement_system = achievement_system
+        
+        self.enemy = None  # Current enemy object (current target in group fights)
+        self.enemies = []  # All enemies of a group fight
+        self.enemy_original = None  # Template for enemy
+        self.combat_active = False
+        self.player_turn = True
+        self.turn_count = 0
+        self.skill_history: List[str] = []  # For combo tracking
+        self.environment_effects = []  # Environmental effects for the battle
+        
+        # Combos de data/skills/combo_skills.json, compilés en automate (partagé par registre)
+        self.combo_definitions = self.content.compiled("combo_definitions", load_combo_definitions)
+        self.combos = self.content.compiled("combo_automaton", compile_combo_automaton)
+        self._reset_combos()
+        
+    def start_combat(self, enemy):
+        """
+        Initiate combat with a given enemy (id, template, or object).
+        """
+        # Prepare enemy data
+        self.enemy = self._prepare_enemy(enemy)
+        self._reset_combos()
+        self.combat_active = True
+        self.player_turn = True  # Player starts
+        self.turn_count = 0
+        recorder = self.recorder
+        if recorder is not None:
+            self.rng = recorder.begin(self, replay.MODE_SINGLE, [self.enemy])
+        
+        # Apply title effects or history modifications if any
+        self._apply_title_effects()
+        self._calculate_history_modifier()
+        
+        # Check for surprise attacks
+        if self._check_surprise_attack():
+            self._say(f"Surprise attack! {self.enemy['name']} strikes first!")
+            self.player_turn = False
+        
+        # Combat loop: alternate turns until combat ends
+        while self.combat_active:
+            self.turn_count += 1
+            if recorder is not None:
+                recorder.start_turn(self.turn_count, replay.PLAYER_ACTOR if self.player_turn else 1,
+                                    self.player.hp, self.enemy['current_hp'])
+            # Player turn
+            if self.player_turn:
+                self._display_combat_status()
+                # In actual game, user would input command; here assume higher-level calls
+                # For demo, auto player attacks
+                self._player_attack()
+            else:
+                # Enemy turn
+                self._enemy_turn()
+            
+            # Update status effects after each full round
+            self._update_status_effects()
+            if recorder is not None:
+                recorder.end_turn(self.player.hp, self.enemy['current_hp'])
+            
+            # Check end conditions
+            if self.player.hp <= 0:
+                self.combat_active = False
+                self._say("Player has been defeated!")
+                self.end_combat(fled=False)
+                break
+            if self.enemy and self.enemy['current_hp'] <= 0:
+                self.combat_active = False
+                self._say(f"{self.enemy['name']} defeated!")
+                self._on_enemy_defeated()
+                self._check_combat_achievements()
+                self.end_combat(fled=False)
+                break
+            
+            # Toggle turn
+            self.player_turn = not self.player_turn
+    
+    def _say(self, message):
+        """
+        Sortie des messages de combat (bus de messages par défaut, muette dans CombatSimulator).
+        """
+        emit(message)
+    
+    def start_group_combat(self, enemies):
+        """
+        Fight several enemies at once. Turn order comes from an initiative queue
+        driven by the speed stat (ties: faster first, then join order), so each
+        turn costs O(log n) in the number of combatants. The player auto-attacks
+        the first enemy still standing, as in start_combat.
+        """
+        self.enemies = [self._prepare_enemy(enemy) for enemy in enemies]
+        if not self.enemies:
+            return
+        self._reset_combos()
+        self.combat_active = True
+        self.turn_count = 0
+        self.enemy = self.enemies[0]
+        recorder = self.recorder
+        if recorder is not None:
+            self.rng = recorder.begin(self, replay.MODE_GROUP, self.enemies)
+        self._apply_title_effects()
+        
+        queue = InitiativeQueue()
+        # Attaque surprise: tous les ennemis agissent avant le joueur
+        surprise = self._check_surprise_attack()
+        if surprise:
+            self._say("Surprise attack! The enemies strike first!")
+        queue.add('player', self.player, self._combatant_speed(None))
+        alive = {}
+        for index, enemy in enumerate(self.enemies):
+            alive[index] = enemy
+            queue.add(index, enemy, self._combatant_speed(enemy), delay=0 if surprise else None)
+        self._say(f"{len(alive)} enemies engage you!")
+        
+        while self.combat_active:
+            key, actor = queue.pop()
+            self.turn_count += 1
+            if key == 'player':
+                target_key = next(iter(alive))
+                self.enemy = alive[target_key]
+                if recorder is not None:
+                    recorder.start_turn(self.turn_count, replay.PLAYER_ACTOR, self.player.hp, self.enemy['current_hp'])
+                self._display_combat_status()
+                self._player_attack()
+                self.player.status_effects.advance()
+            else:
+                target_key = key
+                self.enemy = actor
+                if recorder is not None:
+                    recorder.start_turn(self.turn_count, key + 1, self.player.hp, actor['current_hp'])
+                self._enemy_turn()
+                actor['status_effects'].advance()
+            if recorder is not None:
+                recorder.end_turn(self.player.hp, self.enemy['current_hp'])
+            
+            if self.player.hp <= 0:
+                self.combat_active = False
+                self._say("Player has been defeated!")
+                self.end_combat(fled=False)
+                break
+            if self.enemy['current_hp'] <= 0:
+                self._say(f"{self.enemy['name']} defeated!")
+                queue.remove(target_key)
+                del alive[target_key]
+                self._on_enemy_defeated()
+                if not alive:
+                    self.combat_active = False
+                    self._check_combat_achievements()
+                    self.end_combat(fled=False)
+    
+    def _combatant_speed(self, enemy):
+        """Vitesse d'un ennemi, ou du joueur si enemy est None (sinon sa dextérité)."""
+        if enemy is None:
+            speed = getattr(self.player, 'speed', None)
+            if speed is None:
+                speed = getattr(self.player, 'stats', {}).get('dex', 10)
+            return speed + self.player.status_effects.total('speed')
+        return enemy.get('speed', 10) + enemy['status_effects'].total('speed')
+    
+    def _prepare_enemy(self, enemy_template):
+        """
+        Prepare an enemy instance for combat from a template or ID.
+        """
+        if isinstance(enemy_template, MonsterInstance):
+            # Déjà une instance (World.populate_enemies, get_enemy...): pas de copie
+            enemy = enemy_template
+        elif not isinstance(enemy_template, str):
+            # Modèle (compilé ou dict brut): on en fait une instance
+            enemy = self.monster_manager.instantiate(enemy_template)
+        else:
+            # Could be an ID or key, use monster_manager to get an instance
+            enemy = self.monster_manager.get_enemy(enemy_template)
+        # Initialize current HP and stats
+        enemy['current_hp'] = enemy.get('hp', 0)
+        enemy['status_effects'] = EffectScheduler()
+        return enemy
+    
+    def _apply_title_effects(self):
+        """
+        Apply any combat modifiers based on player's titles.
+        """
+        # Example: if player has title 'Orc Slayer', increase damage vs orcs
+        for title in self.player.titles:  # Assume player has list of titles
+            if title == "Chasseur d'Orcs" and self.enemy.get('race') == 'Orc':
+                self._say("Title effect: Extra damage to Orcs!")
+                # e.g., boost player's damage stat temporarily
+                self.player.attack = getattr(self.player, 'attack', 1) + 5
+    
+    def _check_for_race_title(self, race: str) -> bool:
+        """
+        Check if player has a title related to the enemy's race.
+        """
+        return any(race in title for title in self.player.titles)
+    
+    def _calculate_history_modifier(self):
+        """
+        Calculate modifiers based on past encounters or history (e.g., repeated fights).
+        """
+        # Example: if player repeatedly fights same enemy type, minor stat changes
+        pass  # Placeholder for history modifiers
+    
+    def _check_surprise_attack(self) -> bool:
+        """
+        Determine if a surprise attack occurs (enemy strikes first).
+        """
+        chance = 10  # 10% chance
+        roll = self.rng.randint(1, 100)
+        return roll <= chance
+    
+    def process_command(self, command: str, args=None):
+        """
+        Process player command during combat.
+        """
+        if not self.combat_active:
+            return
+        cmd = command.lower()
+        if cmd == "attack":
+            self._player_attack()
+        elif cmd == "defend":
+            self._defend()
+        elif cmd == "skill" and args:
+            self._use_skill(args)
+        elif cmd == "use" and args:
+            self._use_item(args)
+        elif cmd == "analyze":
+            self._analyze_enemy()
+        elif cmd == "escape":
+            self._try_escape()
+        else:
+            self._say("Unknown command.")
+    
+    def _record(self, code):
+        """Note une action dans l'enregistrement du combat en cours (s'il y en a un)."""
+        recorder = self.recorder
+        if recorder is not None:
+            record = recorder.record
+            if record is not None:
+                record((code, 0))
+    
+    def _player_stat(self, stat, default=0):
+        """Statistique du joueur, modificateurs d'effets actifs compris."""
+        return getattr(self.player, stat, default) + self.player.status_effects.total(stat)
+    
+    def _enemy_stat(self, stat, default=0):
+        """Statistique de l'ennemi, modificateurs d'effets actifs compris."""
+        return self.enemy.get(stat, default) + self.enemy['status_effects'].total(stat)
+    
+    def _player_attack(self):
+        """
+        Player performs a basic attack on the enemy.
+        """
+        self._record(replay.ACTION_ATTACK)
+        # Basic damage calculation: player's attack minus enemy defense
+        atk = self._player_stat('attack', 1)
+        defense = self._enemy_stat('defense')
+        damage = max(atk - defense, 1)
+        self.enemy['current_hp'] -= damage
+        self._say(f"You attack {self.enemy['name']} for {damage} damage.")
+    
+    def _use_skill(self, skill_name: str):
+        """
+        Player uses a skill by name.
+        """
+        skill = self.player.skills.get(skill_name)
+        if not skill:
+            self._say(f"You don't know skill '{skill_name}'.")
+            return
+        self._record(replay.ACTION_SKILL)
+        # Process based on skill type
+        skill_type = skill.get('type')
+        self._say(f"You use {skill_name}.")
+        if skill_type == 'damage':
+            self._process_damage_skill(skill)
+        elif skill_type == 'heal':
+            self._process_heal_skill(skill)
+        elif skill_type == 'buff':
+            self._process_buff_skill(skill)
+        elif skill_type == 'debuff':
+            self._process_debuff_skill(skill)
+        elif skill_type == 'special':
+            self._process_special_skill(skill)
+        # Record skill use for combo detection
+        self._record_skill_use(skill_name)
+    
+    def _process_damage_skill(self, skill_data: dict):
+        """
+        Handle a damage-dealing skill.
+        """
+        power = skill_data.get('power', 0)
+        enemy_def = self._enemy_stat('defense')
+        damage = max(power - enemy_def, 1)
+        self.enemy['current_hp'] -= damage
+        self._say(f"{self.enemy['name']} takes {damage} damage from skill.")
+    
+    def _process_heal_skill(self, skill_data: dict):
+        """
+        Handle a healing skill.
+        """
+        amount = skill_data.get('power', 0)
+        self.player.hp = min(self.player.hp + amount, self.player.max_hp)
+        self._say(f"You heal yourself for {amount} HP.")
+    
+    def _process_buff_skill(self, skill_data: dict):
+        """
+        Handle a buff skill (increases player stats temporarily).
+        """
+        stat = skill_data.get('stat')
+        amount = skill_data.get('amount', 0)
+        duration = skill_data.get('duration', 3)
+        # Example buff effect
+        self.player.status_effects.add(stat, amount, duration, source='skill')
+        self._say(f"You buff yourself: {stat} +{amount} for {duration} turns.")
+    
+    def _process_debuff_skill(self, skill_data: dict):
+        """
+        Handle a debuff skill (decreases enemy stats).
+        """
+        stat = skill_data.get('stat')
+        amount = skill_data.get('amount', 0)
+        duration = skill_data.get('duration', 3)
+        self.enemy['status_effects'].add(stat, -amount, duration, source='skill')
+        self._say(f"{self.enemy['name']}'s {stat} decreased by {amount} for {duration} turns.")
+    
+    def _process_special_skill(self, skill_data: dict):
+        """
+        Handle a special skill with unique effects.
+        """
+        effect = skill_data.get('effect', 'none')
+        # Placeholder for special effects
+        self._say(f"Special effect '{effect}' activated!")
+    
+    def _use_item(self, item_name: str):
+        """
+        Player uses an item from inventory.
+        """
+        item = self.player.find_item_by_name(item_name)
+        if not item:
+            self._say(self.player.item_not_found("You don't have {name}.", item_name))
+            return
+        self._record(replay.ACTION_ITEM)
+        # Use the item (e.g. potion, scroll)
+        self.item_manager.use_item(item, self.player)
+        self._say(f"You use {item_name}.")
+    
+    def _defend(self):
+        """
+        Player defends, reducing incoming damage.
+        """
+        self._record(replay.ACTION_DEFEND)
+        self.player.defending = True
+        self._say("You brace for the next attack, reducing incoming damage.")
+    
+    def _analyze_enemy(self):
+        """
+        Player analyzes the enemy, revealing information.
+        """
+        self._record(replay.ACTION_ANALYZE)
+        desc = self.monster_manager.get_monster_description(self.enemy)
+        self._say(desc)
+        estimate = estimate_battle(self.player, self.enemy)
+        self._say(f"Win chance: {estimate.win_probability:.0%} | "
+                  f"expected turns: {estimate.expected_turns:.1f} | "
+                  f"expected HP loss: {estimate.expected_hp_loss:.1f}")
+    
+    def _try_escape(self):
+        """
+        Player attempts to flee from combat.
+        """
+        self._record(replay.ACTION_ESCAPE)
+        chance = 50  # 50% base escape chance
+        roll = self.rng.randint(1, 100)
+        if roll <= chance:
+            self._say("You successfully escaped!")
+            self.end_combat(fled=True)
+        else:
+            self._say("Escape failed!")
+    
+    def _display_combat_status(self):
+        """
+        Display current HP/status bars for player and enemy.
+        """
+        bar_width = 20
+        def bar(current, maximum):
+            filled = int(bar_width * current / maximum)
+            return '[' + '#' * filled + ' ' * (bar_width - filled) + ']'
+        self._say(f"Player HP: {bar(self.player.hp, self.player.max_hp)} {self.player.hp}/{self.player.max_hp}")
+        self._say(f"{self.enemy['name']} HP: {bar(self.enemy['current_hp'], self.enemy['hp'])} {self.enemy['current_hp']}/{self.enemy['hp']}")
+    
+    def _create_bar(self, percent, width, char, color=None):
+        """
+        Create a textual bar (unused in this context, as we built one above).
+        """
+        filled = int(width * percent)
+        return char * filled + '-' * (width - filled)
+    
+    def _show_available_skills(self):
+        """
+        List player's available skills during combat.
+        """
+        skills = ', '.join(self.player.skills.keys())
+        self._say(f"Available skills: {skills}")
+    
+    def _enemy_turn(self):
+        """
+        Execute enemy actions on its turn.
+        """
+        if not self._check_enemy_can_act():
+            self._record(replay.ACTION_STUNNED)
+            self._say(f"{self.enemy['name']} is unable to act!")
+            return
+        action = self._decide_enemy_action()
+        if action == 'attack':
+            self._record(replay.ACTION_ENEMY_ATTACK)
+            self._enemy_attack()
+        elif action == 'skill':
+            self._record(replay.ACTION_ENEMY_SKILL)
+            self._enemy_use_skill()
+        elif action == 'heal':
+            self._record(replay.ACTION_ENEMY_HEAL)
+            self._enemy_heal()
+    
+    def _update_status_effects(self):
+        """
+        Update or apply status effects each turn.
+        """
+        # Les modificateurs s'appliquent tant qu'ils sont actifs (voir _player_stat/_enemy_stat);
+        # ici on ne fait qu'avancer l'horloge, ce qui expire les effets échus
+        self.player.status_effects.advance()
+        self.enemy['status_effects'].advance()
+    
+    def _check_enemy_can_act(self) -> bool:
+        """
+        Determine if the enemy is able to take an action (e.g., not stunned).
+        """
+        # If enemy has a 'stun' effect with a negative amount, cannot act
+        return not self.enemy['status_effects'].has_negative('stun')
+    
+    def _decide_enemy_action(self):
+        """
+        Decide the enemy's next action based on simple AI.
+        """
+        # Simple logic: if enemy HP low, try heal; else random between attack/skill
+        hp_ratio = self.enemy['current_hp'] / self.enemy['hp']
+        if hp_ratio < 0.3 and 'heal' in self.enemy.get('abilities', []):
+            return 'heal'
+        if self.rng.random() < 0.7:
+            return 'attack'
+        elif 'abilities' in self.enemy and self.enemy['abilities']:
+            return 'skill'
+        else:
+            return 'attack'
+    
+    def _enemy_attack(self):
+        """
+        Enemy performs a basic attack on the player.
+        """
+        atk = self._enemy_stat('attack', 1)
+        defense = self._player_stat('defense')
+        damage = max(atk - defense, 1)
+        # If player defended last turn, reduce damage
+        if getattr(self.player, 'defending', False):
+            damage = max(int(damage / 2), 1)
+            self.player.defending = False
+        self.player.hp -= damage
+        self._say(f"{self.enemy['name']} attacks you for {damage} damage.")
+    
+    def _enemy_use_skill(self):
+        """
+        Enemy uses a special ability against the player.
+        """
+        abilities = self.enemy.get('abilities', [])
+        if not abilities:
+            self._enemy_attack()
+            return
+        skill = self.rng.choice(abilities)
+        # For simplicity, treat as damage skill
+        power = skill_power(skill)
+        defense = self._player_stat('defense')
+        damage = max(power - defense, 1)
+        self.player.hp -= damage
+        skill_name = skill.get('name', 'skill') if isinstance(skill, Mapping) else skill
+        self._say(f"{self.enemy['name']} uses {skill_name} dealing {damage} damage.")
+    
+    def _enemy_heal(self):
+        """
+        Enemy attempts to heal itself.
+        """
+        amount = self.enemy.get('heal_power', 5)
+        self.enemy['current_hp'] = min(self.enemy['current_hp'] + amount, self.enemy['hp'])
+        self._say(f"{self.enemy['name']} heals for {amount} HP.")
+    
+    def end_combat(self, fled: bool=False):
+        """
+        Clean up after combat ends.
+        """
+        self.combat_active = False
+        if fled:
+            self._say("You fled the combat.")
+        else:
+            self._say("Combat has ended.")
+        # Reset defending flag
+        self.player.defending = False
+        if self.recorder is not None and self.recorder.active:
+            if fled:
+                result = replay.RESULT_FLED
+            else:
+                result = replay.RESULT_ENEMY if self.player.hp <= 0 else replay.RESULT_PLAYER
+            self.rng = self.recorder.finish(result)
+    
+    def _on_enemy_defeated(self):
+        """
+        Rewards for defeating the current enemy (drops, XP, kill counter), the same
+        for played, group and auto-resolved fights.
+        """
+        enemy = self.enemy
+        self._handle_drops()
+        exp = enemy.get('exp_reward', 0)
+        if exp and hasattr(self.player, 'gain_exp'):
+            self.player.gain_exp(exp)
+        if hasattr(self.player, 'increment_kill_counter'):
+            self.player.increment_kill_counter(enemy.get('type', enemy.get('id')))
+    
+    def _handle_drops(self):
+        """
+        Handle loot drops when an enemy is defeated.
+        """
+        # Tables compilées une fois par registre (voir core/loot.py)
+        loot_tables = self.content.compiled("loot_tables", compile_loot_tables)
+        loot = loot_tables.table_for(self.enemy).roll(self.rng)
+        # Give loot to player
+        for item_id in loot:
+            item = self.item_manager.get_item_by_id(item_id)
+            if item is None:
+                continue
+            self.player.add_item(item)
+            self._say(f"You obtained {item.get('name')} from the loot.")
+    
+    def _check_combat_achievements(self, damage_dealt=0):
+        """
+        Check if any achievements are fulfilled by this combat.
+        """
+        if self.achievement_system is None:
+            return
+        stats = {'turns': self.turn_count, 'damage_dealt': damage_dealt}
+        self.achievement_system.check_combat_achievements(stats)
+    
+    def is_trivial(self, enemy) -> bool:
+        """
+        True if the player out-levels the enemy by AUTO_RESOLVE_LEVEL_GAP or more.
+        """
+        return getattr(self.player, 'level', 1) - enemy.get('level', 1) >= AUTO_RESOLVE_LEVEL_GAP
+    
+    def auto_resolve(self, enemy):
+        """
+        Resolve a fight without playing it turn by turn, then apply HP loss and the
+        same rewards and achievements as a played fight in one step. Returns a
+        CombatOutcome. The outcome is computed in closed form when only the surprise
+        roll is random (the enemy cannot heal and all its actions deal the same
+        damage); otherwise one silent simulation with the same rules decides it.
+        With a recorder, the fight is recorded as one turn (replay.MODE_AUTO).
+        """
+        from core.simulation import CombatSimulator, CombatOutcome
+        self.enemy = enemy = self._prepare_enemy(enemy)
+        self._reset_combos()
+        self.turn_count = 0
+        recorder = self.recorder
+        if recorder is not None:
+            self.rng = recorder.begin(self, replay.MODE_AUTO, [enemy])
+            recorder.start_turn(1, replay.PLAYER_ACTOR, self.player.hp, enemy['current_hp'])
+        if self._has_closed_form():
+            self._apply_title_effects()
+            self._calculate_history_modifier()
+            outcome = CombatOutcome(*self._closed_form_outcome())
+        else:
+            # Le simulateur applique lui-même les effets de titres, à sa copie du joueur
+            simulator = CombatSimulator(self.player, self.monster_manager, seed=self.rng.randint(0, 2**32 - 1),
+                                        content=self.content)
+            outcome = simulator.simulate(enemy)
+        
+        self.turn_count = outcome.turns
+        self.player.hp = max(self.player.hp - outcome.damage_taken, 0)
+        enemy['current_hp'] = max(enemy['hp'] - outcome.damage_dealt, 0)
+        self.combat_active = False
+        self.player.defending = False
+        if recorder is not None:
+            recorder.end_turn(self.player.hp, enemy['current_hp'])
+        if outcome.winner == "player":
+            self._say(f"{enemy['name']} defeated in {outcome.turns} turns "
+                      f"(-{outcome.damage_taken} HP).")
+            self._on_enemy_defeated()
+            self._check_combat_achievements(outcome.damage_dealt)
+        elif outcome.winner == "enemy":
+            self._say(f"Player has been defeated by {enemy['name']}!")
+        else:
+            self._say(f"The fight against {enemy['name']} was left undecided.")
+        if recorder is not None and recorder.active:
+            results = {"player": replay.RESULT_PLAYER, "enemy": replay.RESULT_ENEMY}
+            self.rng = recorder.finish(results.get(outcome.winner, replay.RESULT_UNDECIDED))
+        return outcome
+    
+    def _has_closed_form(self):
+        """
+        True if the fight against self.enemy only depends on the surprise roll: the
+        enemy cannot heal, all its actions deal the same damage and the player is not defending.
+        """
+        abilities = list(self.enemy.get('abilities', ()))
+        if 'heal' in abilities or getattr(self.player, 'defending', False):
+            return False
+        defense = self._player_stat('defense')
+        enemy_damage = max(self._enemy_stat('attack', 1) - defense, 1)
+        return all(max(skill_power(ability) - defense, 1) == enemy_damage for ability in abilities)
+    
+    def _closed_form_outcome(self):
+        """
+        (winner, turns, damage_dealt, damage_taken) of a fight with a closed form (see
+        _has_closed_form). The player auto-attacks, the enemy deals a fixed damage.
+        """
+        enemy = self.enemy
+        enemy_damage = max(self._enemy_stat('attack', 1) - self._player_stat('defense'), 1)
+        player_damage = max(self._player_stat('attack', 1) - self._enemy_stat('defense'), 1)
+        player_hits = -(-enemy['current_hp'] // player_damage)  # attaques pour tuer l'ennemi
+        enemy_hits = -(-self.player.hp // enemy_damage)         # attaques pour tuer le joueur
+        surprise = self._check_surprise_attack()
+        # Tours alternés: le joueur frappe en premier sauf attaque surprise
+        if surprise:
+            player_wins = player_hits < enemy_hits
+        else:
+            player_wins = player_hits <= enemy_hits
+        if player_wins:
+            taken_hits = player_hits if surprise else player_hits - 1
+            turns = player_hits + taken_hits
+            return "player", turns, enemy['current_hp'], taken_hits * enemy_damage
+        dealt_hits = enemy_hits - 1 if surprise else enemy_hits
+        turns = enemy_hits + dealt_hits
+        return "enemy", turns, dealt_hits * player_damage, self.player.hp
+    
+    def _check_skill_combos(self, skill_name: str) -> Optional[str]:
+        """
+        Check if using a skill finishes a special combo: advances the combo
+        automaton by one skill and returns the longest combo completed, if any.
+        """
+        self.combo_state = self.combos.step(self.combo_state, skill_name)
+        completed = self.combos.matches(self.combo_state)
+        return completed[0] if completed else None
+    
+    def _reset_combos(self):
+        """Début de combat: automate de combos à la racine, aucun combo en recharge."""
+        self.combo_state = self.combos.ROOT
+        self.combo_cooldowns = {}  # id de combo -> tour à partir duquel il est de nouveau disponible
+    
+    def _apply_combo_effects(self, combo_name: str):
+        """
+        Apply special effects from a skill combo (combo_name is its id in combo_skills.json).
+        A combo with an unlock_condition must have been learned (Player.learn_skill); it
+        costs mp_cost and cannot trigger again for `cooldown` turns.
+        """
+        combo = self.combo_definitions.get(combo_name, {})
+        name = combo.get('name', combo_name)
+        if combo.get('unlock_condition') and combo_name not in getattr(self.player, 'skills', {}):
+            return
+        if self.turn_count < self.combo_cooldowns.get(combo_name, 0):
+            self._say(f"Combo {name} is still on cooldown.")
+            return
+        mp_cost = combo.get('mp_cost', 0)
+        if getattr(self.player, 'mp', 0) < mp_cost:
+            self._say(f"Not enough MP for combo {name} ({mp_cost} MP).")
+            return
+        if mp_cost:
+            self.player.mp -= mp_cost
+        self.combo_cooldowns[combo_name] = self.turn_count + combo.get('cooldown', 0)
+        self._say(f"Combo {name} activated! Extra effects apply.")
+        # Dégâts de base du combo, réduits par la défense comme les compétences
+        base_damage = combo.get('base_damage', 0)
+        if base_damage and self.enemy is not None:
+            damage = max(base_damage - self._enemy_stat('defense'), 1)
+            self.enemy['current_hp'] -= damage
+            self._say(f"{self.enemy['name']} takes {damage} combo damage.")
+    
+    def _record_skill_use(self, skill_name: str):
+        """
+        Record a skill use for combo detection.
+        """
+        self.skill_history.append(skill_name)
+        # Limit history length
+        if len(self.skill_history) > 5:
+            self.skill_history.pop(0)
+        # Check for combos
+        combo = self._check_skill_combos(skill_name)
+        if combo:
+            self._apply_combo_effects(combo)
+    
+    def _check_environmental_effects(self):
+        """
+        Apply any environmental effects in the battle.
+        """
+        for effect in self.environment_effects:
+            self._say(f"Environmental effect: {effect}")
@@ -0,0 +1,95 @@
+"""
+combos.py - Skill combo detection for FateQuest.
+Combos from data/skills/combo_skills.json are compiled into an Aho-Corasick
+automaton over skill ids: each skill used advances one state, and the state
+tells which combos (if any) were just completed.
+"""
+
+from collections import deque
+
+
+class ComboAutomaton:
+    """
+    Aho-Corasick automaton over skill ids.
+    State 0 is the empty history. step(state, skill_id) returns the next state in
+    amortized O(1) (transitions are memoized); matches(state) returns the ids of
+    the combos ending at that state, longest first.
+    """
+    ROOT = 0
+
+    def __init__(self, combos):
+        """combos: mapping combo_id -> sequence of skill ids (components)."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._depth = [0]
+        self._output = [()]
+        for combo_id, components in combos.items():
+            if components:
+                self._insert(combo_id, components)
+        self._build_failure_links()
+        # Transitions calculées (état, compétence) -> état
+        self._delta = {}
+
+    def _insert(self, combo_id, components):
+        state = self.ROOT
+        for skill_id in components:
+            next_state = self._goto[state].get(skill_id)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][skill_id] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[state] + 1)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (combo_id,)
+
+    def _build_failure_links(self):
+        """Parcours en largeur: lien d'échec = plus long suffixe propre présent dans le trie."""
+        queue = deque(self._goto[self.ROOT].values())
+        while queue:
+            state = queue.popleft()
+            for skill_id, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and skill_id not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(skill_id, self.ROOT)
+                self._fail[child] = target if target != child else self.ROOT
+                # Les combos du suffixe se terminent aussi ici (les plus longs d'abord)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def step(self, state, skill_id):
+        """État suivant après l'utilisation de skill_id."""
+        key = (state, skill_id)
+        next_state = self._delta.get(key)
+        if next_state is None:
+            current = state
+            while current and skill_id not in self._goto[current]:
+                current = self._fail[current]
+            next_state = self._goto[current].get(skill_id, self.ROOT)
+            self._delta[key] = next_state
+        return next_state
+
+    def matches(self, state):
+        """Ids des combos terminés dans cet état (les plus longs d'abord)."""
+        return self._output[state]
+
+    def __len__(self):
+        return len(self._goto)
+
+
+def load_combo_definitions(registry):
+    """combo_skills.json (dict ou liste) -> dict combo_id -> définition."""
+    data = registry.get("skills/combo_skills.json", {})
+    if isinstance(data, (list, tuple)):
+        return {combo["id"]: combo for combo in data if "id" in combo}
+    return dict(data)
+
+
+def compile_combo_automaton(registry):
+    """Automate des combos du registre (utilisé via ContentRegistry.compiled)."""
+    definitions = load_combo_definitions(registry)
+    return ComboAutomaton({
+        combo_id: tuple(combo.get("components", ())) for combo_id, combo in definitions.items()
+    })
@@ -0,0 +1,425 @@
+"""
+content.py - Shared content registry for FateQuest.
+Parses every JSON file under data/ exactly once per process and hands out
+shared read-only views to the managers (items, monsters, world, achievements...).
+
+A precompiled binary snapshot of the normalized content can be built with:
+    python -m core.content compile
+It is validated against the sizes, mtimes and hashes of the JSON files and
+ignored (JSON fallback) as soon as it is stale.
+"""
+
+import os
+import sys
+import json
+import time
+import marshal
+import hashlib
+import argparse
+from types import MappingProxyType
+
+# Fichiers d'objets chargés par l'ItemManager (ordre = priorité en cas de doublon d'ID)
+ITEM_FILES = [
+    "weapons.json", "armor.json", "consumables.json",
+    "quest_items.json", "legendary.json",
+    "crafting_materials.json", "enchantments.json"
+]
+
+# Fichiers de monstres groupés par rareté
+MONSTER_FILES = [
+    ("common.json", "common"),
+    ("uncommon.json", "uncommon"),
+    ("rare.json", "rare"),
+    ("elite.json", "elite"),
+    ("bosses.json", "boss")
+]
+
+ACHIEVEMENT_FILES = {
+    "combat": "achievements/combat.json",
+    "exploration": "achievements/exploration.json",
+    "collection": "achievements/collection.json",
+    "progression": "achievements/progression.json"
+}
+
+# Dossier data/ livré avec le jeu, indépendant du répertoire courant
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Snapshot binaire (marshal) écrit dans data_dir par "python -m core.content compile"
+SNAPSHOT_FILE = ".content_snapshot.bin"
+SNAPSHOT_VERSION = 1
+
+
+class ContentRegistry:
+    """
+    Process-wide registry of the game content.
+    One instance per data directory; every manager built on the same directory
+    shares the same parsed data instead of re-reading the files.
+    """
+    _instances = {}
+
+    @classmethod
+    def get_instance(cls, data_dir="data"):
+        """
+        Return the shared registry for data_dir, loading it on first use.
+        """
+        key = os.path.abspath(data_dir)
+        registry = cls._instances.get(key)
+        if registry is None:
+            registry = cls(data_dir)
+            cls._instances[key] = registry
+        return registry
+
+    @classmethod
+    def clear_instances(cls):
+        """
+        Forget every loaded registry (the next get_instance reloads from disk).
+        """
+        cls._instances.clear()
+
+    def __init__(self, data_dir="data", use_snapshot=True):
+        """
+        Load the whole data tree once, from the snapshot when it is fresh,
+        otherwise from the JSON files.
+        """
+        self.data_dir = data_dir
+        self._files = {}     # chemin relatif ("items/weapons.json") -> données JSON brutes
+        self._compiled = {}  # nom -> structure dérivée construite une seule fois
+        self.source = None   # "snapshot" ou "json"
+        self.load_times = {} # chemin relatif -> (lecture_s, parsing_s), pour le profilage
+        if not (use_snapshot and self.load_snapshot()):
+            self.load_all()
+
+    def load_all(self):
+        """
+        Parse every .json file under data_dir. Missing or corrupted files are skipped.
+        """
+        self._files = {}
+        self._compiled = {}
+        self.load_times = {}
+        for rel, path in self._iter_json_files():
+            data = self._load_json(path, rel)
+            if data is not None:
+                self._files[rel] = data
+        self.source = "json"
+
+    def _iter_json_files(self):
+        """Parcourt data_dir et renvoie les couples (clé relative, chemin) des fichiers JSON."""
+        for root, dirs, files in os.walk(self.data_dir):
+            dirs.sort()
+            for file_name in sorted(files):
+                if file_name.endswith(".json"):
+                    path = os.path.join(root, file_name)
+                    yield self._rel_key(path), path
+
+    def _rel_key(self, path):
+        """Clé normalisée d'un fichier: chemin relatif à data_dir avec des '/'."""
+        return os.path.relpath(path, self.data_dir).replace(os.sep, "/")
+
+    def _load_json(self, path, rel=None):
+        """
+        Lit et désérialise un fichier JSON, ou None s'il est absent/corrompu.
+        Les temps de lecture et de parsing sont notés dans load_times[rel].
+        """
+        start = time.perf_counter()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return None
+        read_done = time.perf_counter()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+        if rel is not None:
+            self.load_times[rel] = (read_done - start, time.perf_counter() - read_done)
+        return data
+
+    def get(self, rel_path, default=None):
+        """
+        Return the parsed content of a file relative to data_dir (shared, do not mutate).
+        """
+        data = self._files.get(rel_path.replace(os.sep, "/"))
+        return default if data is None else data
+
+    def has(self, rel_path):
+        """Indique si un fichier a été chargé avec succès."""
+        return rel_path.replace(os.sep, "/") in self._files
+
+    def compiled(self, name, builder):
+        """
+        Return a structure derived from the content, built once by builder(registry).
+        Used to share normalized tables and indexes between managers.
+        """
+        if name not in self._compiled:
+            self._compiled[name] = builder(self)
+        return self._compiled[name]
+
+    # ------------------------------------------------------------------
+    # Snapshot binaire
+    # ------------------------------------------------------------------
+
+    def snapshot_path(self):
+        """Chemin du snapshot associé à data_dir."""
+        return os.path.join(self.data_dir, SNAPSHOT_FILE)
+
+    def compile_snapshot(self, path=None):
+        """
+        Reparse the JSON files and write a marshal snapshot of the raw files and
+        normalized tables, together with a manifest (size, mtime, sha1) of the sources.
+        """
+        path = path or self.snapshot_path()
+        # Manifeste relevé avant la lecture: une modification concurrente rend le snapshot périmé
+        manifest = {}
+        for rel, file_path in self._iter_json_files():
+            st = os.stat(file_path)
+            manifest[rel] = (st.st_size, st.st_mtime_ns, _file_digest(file_path))
+        self.load_all()
+        tables = {name: _thaw_table(builder(self)) for name, builder in SNAPSHOT_TABLES.items()}
+        snapshot = {
+            "version": _snapshot_version(),
+            "manifest": manifest,
+            "files": self._files,
+            "tables": tables
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps(snapshot))
+        os.replace(tmp_path, path)
+        return path
+
+    def load_snapshot(self, path=None):
+        """
+        Load the content from the snapshot in a single read.
+        Returns False (nothing loaded) if it is missing, unreadable or stale.
+        """
+        path = path or self.snapshot_path()
+        try:
+            # Une seule lecture; marshal.loads est bien plus rapide que marshal.load(f)
+            with open(path, 'rb') as f:
+                snapshot = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if not isinstance(snapshot, dict) or snapshot.get("version") != _snapshot_version():
+            return False
+        if not self._manifest_is_fresh(snapshot.get("manifest", {})):
+            return False
+        self._files = snapshot["files"]
+        self._compiled = {name: _freeze_table(table) for name, table in snapshot["tables"].items()}
+        self.source = "snapshot"
+        return True
+
+    def _manifest_is_fresh(self, manifest):
+        """
+        Compare the manifest with the files on disk: same set of files, same sizes,
+        and same mtime or, failing that, same content hash.
+        """
+        current = dict(self._iter_json_files())
+        if set(current) != set(manifest):
+            return False
+        for rel, file_path in current.items():
+            size, mtime_ns, digest = manifest[rel]
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return False
+            if st.st_size != size:
+                return False
+            if st.st_mtime_ns != mtime_ns and _file_digest(file_path) != digest:
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Vues normalisées
+    # ------------------------------------------------------------------
+
+    def get_items(self):
+        """
+        All item templates keyed by ID, with 'id' and 'type' filled in.
+        """
+        return self.compiled("items", _build_items)
+
+    def get_monsters(self):
+        """
+        All monster templates (tuple), with rarity/faction defaults,
+        abilities resolved and behaviors attached.
+        """
+        return self.compiled("monsters", _build_monsters)
+
+    def get_achievements(self):
+        """
+        All achievements keyed by ID, with 'id' and 'category' filled in.
+        """
+        return self.compiled("achievements", _build_achievements)
+
+
+def freeze(value):
+    """
+    Return a deeply immutable copy of JSON-like data:
+    dicts become read-only mappings and lists become tuples.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(val) for key, val in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(val) for val in value)
+    return value
+
+
+class ContentTable:
+    """
+    Class-level descriptor exposing one JSON file of the registry.
+    Nothing is read at import time: the table is loaded on first access, from
+    the instance's data_dir or, when accessed on the class, from owner.data_root.
+    The data is shared by every instance using the same directory.
+    """
+    def __init__(self, rel_path):
+        self.rel_path = rel_path
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        data_dir = getattr(obj, "data_dir", None) if obj is not None else None
+        if data_dir is None:
+            data_dir = getattr(owner, "data_root", DEFAULT_DATA_DIR)
+        return ContentRegistry.get_instance(data_dir).get(self.rel_path, {})
+
+
+def _build_items(registry):
+    """Normalise les fichiers data/items/ en un dict id -> objet."""
+    items = {}
+    for file_name in ITEM_FILES:
+        data = registry.get(f"items/{file_name}")
+        # Normaliser en liste d'objets
+        if isinstance(data, dict):
+            items_list = []
+            for item_id, item_data in data.items():
+                item = dict(item_data)
+                item["id"] = item_id
+                items_list.append(item)
+        elif isinstance(data, list):
+            items_list = [dict(item) for item in data]
+        else:
+            continue
+
+        type_key = os.path.splitext(file_name)[0]  # ex: "weapons"
+        for item in items_list:
+            # Ajouter le type (singulier)
+            if "type" not in item:
+                item["type"] = type_key.rstrip('s')
+            items[item["id"]] = item
+    return MappingProxyType(items)
+
+
+def _build_monsters(registry):
+    """Normalise les fichiers data/monsters/ en une liste de modèles."""
+    abilities = registry.get("monsters/abilities.json", {})
+    behaviors = registry.get("monsters/behaviors.json", {})
+    monsters = []
+    for file_name, rarity in MONSTER_FILES:
+        data = registry.get(f"monsters/{file_name}")
+        # Normaliser en liste
+        if isinstance(data, dict):
+            monsters_list = []
+            for mon_id, mon_data in data.items():
+                monster = dict(mon_data)
+                monster["id"] = mon_id
+                monsters_list.append(monster)
+        elif isinstance(data, list):
+            monsters_list = [dict(monster) for monster in data]
+        else:
+            continue
+
+        for monster in monsters_list:
+            monster.setdefault("rarity", rarity)
+            monster.setdefault("faction", None)
+            # Remplacer IDs d'abilities par les données réelles si disponible
+            if "abilities" in monster and isinstance(monster["abilities"], list):
+                monster["abilities"] = [
+                    abilities.get(ab_id, ab_id) for ab_id in monster["abilities"]
+                ]
+            # Ajouter comportement si défini
+            if monster["id"] in behaviors:
+                monster["behavior"] = behaviors[monster["id"]]
+            monsters.append(monster)
+    return tuple(monsters)
+
+
+def _build_achievements(registry):
+    """Normalise les fichiers data/achievements/ en un dict id -> accomplissement."""
+    achievements = {}
+    for cat, rel in ACHIEVEMENT_FILES.items():
+        data = registry.get(rel)
+        if not isinstance(data, dict):
+            continue
+        for aid, ad in data.items():
+            ach = dict(ad)
+            ach["id"] = aid
+            ach["category"] = cat
+            achievements[aid] = ach
+    return MappingProxyType(achievements)
+
+
+# Tables normalisées embarquées dans le snapshot
+SNAPSHOT_TABLES = {
+    "items": _build_items,
+    "monsters": _build_monsters,
+    "achievements": _build_achievements
+}
+
+
+def _snapshot_version():
+    """Version du format: le format marshal dépend de la version de Python."""
+    return (SNAPSHOT_VERSION, sys.version_info[0], sys.version_info[1])
+
+
+def _file_digest(path):
+    """Empreinte sha1 du contenu d'un fichier."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _thaw_table(table):
+    """Convertit une vue en lecture seule en dict sérialisable par marshal."""
+    if isinstance(table, MappingProxyType):
+        return dict(table)
+    return table
+
+
+def _freeze_table(table):
+    """Inverse de _thaw_table: les dicts redeviennent des vues en lecture seule."""
+    if isinstance(table, dict):
+        return MappingProxyType(table)
+    return table
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m core.content {compile,check}
+    """
+    parser = argparse.ArgumentParser(prog="python -m core.content",
+                                     description="Gestion du snapshot de contenu FateQuest.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser("compile", help="Écrire le snapshot binaire du contenu")
+    compile_parser.add_argument("--data-dir", default="data")
+    compile_parser.add_argument("--output", default=None, help="Chemin du snapshot (défaut: <data-dir>/%s)" % SNAPSHOT_FILE)
+    check_parser = subparsers.add_parser("check", help="Vérifier que le snapshot est à jour")
+    check_parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        registry = ContentRegistry(args.data_dir, use_snapshot=False)
+        path = registry.compile_snapshot(args.output)
+        print(f"Snapshot written to {path} ({len(registry._files)} files).")
+        return 0
+    registry = ContentRegistry(args.data_dir)
+    if registry.source == "snapshot":
+        print("Snapshot is up to date.")
+        return 0
+    print("Snapshot is missing or stale; content is loaded from JSON.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+crafting.py - Crafting engine for FateQuest.
+Recipes (data/items/recipes.json) are compiled once into a graph: item -> recipes
+producing it, material -> recipes using it, and for each recipe the items of its
+chain in dependency order. The CraftingTracker keeps the set of recipes that can
+be crafted right now in step with the inventory, touching only the recipes that
+use the material whose count changed.
+"""
+
+import math
+import weakref
+from core.search import TrigramIndex
+
+RECIPES_FILE = "items/recipes.json"
+# Part des matériaux d'une recette rendue au démantèlement
+DISMANTLE_REFUND = 0.5
+
+
+class Recipe:
+    """One recipe: crafting it once consumes materials and yields quantity copies of result."""
+    __slots__ = ("id", "name", "result", "quantity", "materials", "level")
+
+    def __init__(self, recipe_id, name, result, quantity, materials, level):
+        self.id = recipe_id
+        self.name = name
+        self.result = result
+        self.quantity = quantity
+        self.materials = materials  # ((id du matériau, nombre), ...)
+        self.level = level
+
+    def __repr__(self):
+        return f"<Recipe {self.id} -> {self.result} x{self.quantity}>"
+
+
+class CraftPlan:
+    """
+    What crafting count times a recipe takes, intermediate steps included.
+    - crafts: [(recipe, times)], ingredients first (execution order)
+    - consumed: item id -> copies taken from the inventory
+    - missing: item id -> copies lacking (the plan cannot be executed)
+    """
+    __slots__ = ("recipe", "count", "crafts", "consumed", "missing")
+
+    def __init__(self, recipe, count, crafts, consumed, missing):
+        self.recipe = recipe
+        self.count = count
+        self.crafts = crafts
+        self.consumed = consumed
+        self.missing = missing
+
+    @property
+    def ok(self):
+        return not self.missing
+
+
+class RecipeBook:
+    """
+    Compiled recipes (see compile_recipe_book).
+    - recipes: id -> Recipe
+    - by_result: item id -> ids of the recipes producing it (the first one is used in chains)
+    - users: material id -> ((recipe id, count needed), ...)
+    Recipes whose result is unknown, or which would make the graph cyclic, are ignored.
+    """
+    def __init__(self, recipes_data, items):
+        self.recipes = {}
+        self.by_result = {}
+        self.users = {}
+        for recipe_id, data in recipes_data.items():
+            result = data.get("result", recipe_id)
+            item = items.get(result)
+            if item is None:
+                continue
+            materials = tuple((material, int(count)) for material, count in data.get("materials", {}).items())
+            if any(self._produces(material, result) for material, _ in materials):
+                continue
+            recipe = Recipe(recipe_id, data.get("name", item.get("name", recipe_id)), result,
+                            max(int(data.get("quantity", 1)), 1), materials, data.get("level", 1))
+            self.recipes[recipe_id] = recipe
+            self.by_result.setdefault(result, []).append(recipe_id)
+            for material, count in materials:
+                self.users.setdefault(material, []).append((recipe_id, count))
+        self.by_result = {key: tuple(ids) for key, ids in self.by_result.items()}
+        self.users = {key: tuple(entries) for key, entries in self.users.items()}
+        self.names = TrigramIndex((recipe_id, recipe.name) for recipe_id, recipe in self.recipes.items())
+        self._chains = {}
+
+    def _produces(self, item_id, target):
+        """Vrai si target entre (directement ou non) dans la fabrication de item_id."""
+        pending = [item_id]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current == target:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            for recipe_id in self.by_result.get(current, ()):
+                pending.extend(material for material, _ in self.recipes[recipe_id].materials)
+        return False
+
+    def recipe_for(self, item_id):
+        """Recette utilisée pour fabriquer item_id en étape intermédiaire, ou None."""
+        recipe_ids = self.by_result.get(item_id)
+        return self.recipes[recipe_ids[0]] if recipe_ids else None
+
+    def resolve(self, query):
+        """Recette par id, sinon par nom (accents et fautes de frappe tolérés), ou None."""
+        recipe_id = "_".join(str(query).lower().split())
+        if recipe_id in self.recipes:
+            return self.recipes[recipe_id]
+        recipe_id = self.names.best(query)
+        return self.recipes[recipe_id] if recipe_id is not None else None
+
+    def chain(self, recipe_id):
+        """
+        Matériaux de la recette et de ses étapes intermédiaires, chaque objet avant
+        ses propres ingrédients (ordre topologique, mémorisé par recette).
+        """
+        chain = self._chains.get(recipe_id)
+        if chain is None:
+            order = []
+            visited = set()
+
+            def visit(item_id):
+                visited.add(item_id)
+                recipe = self.recipe_for(item_id)
+                if recipe is not None:
+                    for material, _ in recipe.materials:
+                        if material not in visited:
+                            visit(material)
+                order.append(item_id)
+
+            for material, _ in self.recipes[recipe_id].materials:
+                if material not in visited:
+                    visit(material)
+            chain = self._chains[recipe_id] = tuple(reversed(order))
+        return chain
+
+    def plan(self, recipe_id, count, stock):
+        """
+        CraftPlan pour fabriquer count fois la recette.
+        stock: item id -> exemplaires disponibles (Inventory.count). Les matériaux en
+        stock sont utilisés d'abord, le reste est fabriqué si une recette existe.
+        """
+        recipe = self.recipes[recipe_id]
+        demand = {}
+        for material, needed in recipe.materials:
+            demand[material] = demand.get(material, 0) + needed * count
+        crafts = [(recipe, count)]
+        consumed = {}
+        missing = {}
+        for item_id in self.chain(recipe_id):
+            needed = demand.pop(item_id, 0)
+            if not needed:
+                continue
+            taken = min(stock(item_id), needed)
+            if taken:
+                consumed[item_id] = taken
+                needed -= taken
+            if not needed:
+                continue
+            step = self.recipe_for(item_id)
+            if step is None:
+                missing[item_id] = needed
+                continue
+            times = math.ceil(needed / step.quantity)
+            crafts.append((step, times))
+            for material, per_craft in step.materials:
+                demand[material] = demand.get(material, 0) + per_craft * times
+        crafts.reverse()
+        return CraftPlan(recipe, count, crafts, consumed, missing)
+
+    def __len__(self):
+        return len(self.recipes)
+
+
+def compile_recipe_book(registry):
+    """Construit le RecipeBook du registre (utilisé via ContentRegistry.compiled)."""
+    return RecipeBook(registry.get(RECIPES_FILE, {}), registry.get_items())
+
+
+class CraftingTracker:
+    """
+    Recipes craftable right now from an inventory (one step, materials in hand).
+    Each recipe keeps the number of its materials below the required count; an
+    inventory change of a material only updates the recipes using it.
+    The tracker only holds a weak reference to the inventory (the inventory keeps
+    the tracker alive through watch()), so caches keyed by inventory can drop it.
+    """
+    def __init__(self, book, inventory):
+        self.book = book
+        self._inventory = weakref.ref(inventory)
+        self._lacking = {}  # id de recette -> matériaux insuffisants
+        self.craftable = set()
+        for recipe_id, recipe in book.recipes.items():
+            lacking = sum(1 for material, needed in recipe.materials if inventory.count(material) < needed)
+            self._lacking[recipe_id] = lacking
+            if not lacking:
+                self.craftable.add(recipe_id)
+        inventory.watch(self._on_change)
+
+    @property
+    def inventory(self):
+        """Inventaire suivi (None s'il a été détruit)."""
+        return self._inventory()
+
+    def _on_change(self, item_id, before, after):
+        for recipe_id, needed in self.book.users.get(item_id, ()):
+            enough = after >= needed
+            if enough == (before >= needed):
+                continue
+            lacking = self._lacking[recipe_id] + (-1 if enough else 1)
+            self._lacking[recipe_id] = lacking
+            if lacking:
+                self.craftable.discard(recipe_id)
+            else:
+                self.craftable.add(recipe_id)
+
+    def recipes(self):
+        """Recettes fabricables maintenant, triées par nom."""
+        return sorted((self.book.recipes[recipe_id] for recipe_id in self.craftable), key=lambda recipe: recipe.name)
+
+
+def execute_plan(plan, inventory, items):
+    """Applique un CraftPlan réalisable à l'inventaire (étapes intermédiaires comprises)."""
+    for recipe, times in plan.crafts:
+        for material, needed in recipe.materials:
+            inventory.remove(material, needed * times)
+        inventory.add(items[recipe.result], recipe.quantity * times)
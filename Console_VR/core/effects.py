@@ -0,0 +1,145 @@
+"""
+effects.py - Timed stat effects (buffs, debuffs, stuns) for FateQuest.
+One EffectScheduler per combatant: effects expire in turn order through a min-heap
+and per-stat totals are kept up to date, so reading a modifier is O(1).
+"""
+
+import heapq
+import itertools
+import uuid
+
+
+class Effect:
+    """A stat modifier active until turn expires_at of its scheduler."""
+    __slots__ = ("id", "stat", "amount", "expires_at", "source", "active")
+
+    def __init__(self, effect_id, stat, amount, expires_at, source=None):
+        self.id = effect_id
+        self.stat = stat
+        self.amount = amount
+        self.expires_at = expires_at
+        self.source = source
+        self.active = True
+
+    def __repr__(self):
+        return f"<Effect {self.stat} {self.amount:+} until {self.expires_at}>"
+
+
+class EffectScheduler:
+    """
+    Active effects of one combatant.
+    - add / remove: O(log n) / O(1) (removed effects are skipped when popped)
+    - advance(turns): pops the expired effects in expiry order
+    - total(stat): sum of the active modifiers of a stat, O(1)
+    - has_negative(stat): whether any active modifier of a stat is negative, O(1)
+    `version` changes whenever the set of active effects changes (caches such as
+    StatSheet compare it instead of being notified).
+    """
+    def __init__(self):
+        self.clock = 0
+        self.version = 0
+        self._heap = []  # (expires_at, seq, effect)
+        self._seq = itertools.count()
+        self._effects = {}  # id -> Effect actif
+        self._totals = {}   # stat -> somme des modificateurs actifs
+        self._counts = {}   # stat -> nombre d'effets actifs
+        self._negative = {} # stat -> nombre d'effets actifs de montant négatif
+
+    def add(self, stat, amount, duration, source=None, effect_id=None):
+        """Ajoute un effet de `duration` tours et renvoie son id."""
+        effect_id = effect_id or str(uuid.uuid4())
+        if effect_id in self._effects:
+            self.remove(effect_id)
+        effect = Effect(effect_id, stat, amount, self.clock + max(int(duration), 0), source)
+        self._effects[effect_id] = effect
+        self._totals[stat] = self._totals.get(stat, 0) + amount
+        self._counts[stat] = self._counts.get(stat, 0) + 1
+        if amount < 0:
+            self._negative[stat] = self._negative.get(stat, 0) + 1
+        heapq.heappush(self._heap, (effect.expires_at, next(self._seq), effect))
+        self.version += 1
+        return effect_id
+
+    def remove(self, effect_id):
+        """Retire un effet actif; renvoie l'Effect ou None s'il n'existe pas."""
+        effect = self._effects.pop(effect_id, None)
+        if effect is not None:
+            self._deactivate(effect)
+        return effect
+
+    def advance(self, turns=1):
+        """Avance l'horloge et renvoie la liste des effets expirés."""
+        self.clock += turns
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.clock:
+            effect = heapq.heappop(heap)[2]
+            if effect.active:
+                del self._effects[effect.id]
+                self._deactivate(effect)
+                expired.append(effect)
+        return expired
+
+    def _deactivate(self, effect):
+        effect.active = False
+        self.version += 1
+        stat = effect.stat
+        self._totals[stat] -= effect.amount
+        self._counts[stat] -= 1
+        if effect.amount < 0:
+            self._negative[stat] -= 1
+            if not self._negative[stat]:
+                del self._negative[stat]
+        if not self._counts[stat]:
+            del self._totals[stat]
+            del self._counts[stat]
+
+    def total(self, stat):
+        """Somme des modificateurs actifs d'une statistique."""
+        return self._totals.get(stat, 0)
+
+    def has(self, stat):
+        """True si au moins un effet actif porte sur cette statistique."""
+        return stat in self._counts
+
+    def has_negative(self, stat):
+        """True si au moins un effet actif de cette statistique a un montant négatif."""
+        return stat in self._negative
+
+    def remaining(self, effect):
+        """Tours restants d'un effet."""
+        return effect.expires_at - self.clock
+
+    def clear(self):
+        """Retire tous les effets actifs (l'horloge est conservée)."""
+        self.version += 1
+        self._heap.clear()
+        self._effects.clear()
+        self._totals.clear()
+        self._counts.clear()
+        self._negative.clear()
+
+    def __iter__(self):
+        return iter(self._effects.values())
+
+    def __len__(self):
+        return len(self._effects)
+
+    def __bool__(self):
+        return bool(self._effects)
+
+    def to_list(self):
+        """Format de sauvegarde: [{'id', 'stat', 'value', 'duration', 'source'}] (durée restante)."""
+        return [
+            {'id': e.id, 'stat': e.stat, 'value': e.amount, 'duration': self.remaining(e), 'source': e.source}
+            for e in self._effects.values()
+        ]
+
+    @classmethod
+    def from_list(cls, entries):
+        """Reconstruit un ordonnanceur depuis to_list() (accepte aussi l'ancienne clé 'amount')."""
+        scheduler = cls()
+        for entry in entries or []:
+            scheduler.add(entry.get('stat'), entry.get('value', entry.get('amount', 0)),
+                          entry.get('duration', 0), entry.get('source'), entry.get('id'))
+        return scheduler
@@ -0,0 +1,103 @@
+"""
+estimator.py - Monte-Carlo battle estimates for FateQuest.
+Simulates many fights of the player against one enemy at once, as NumPy arrays,
+to give a win probability, the expected number of turns and the expected HP loss.
+"""
+
+from collections.abc import Mapping
+from typing import NamedTuple
+from core.sampling import np
+
+# Règles de Combat reprises ici (voir Combat._check_surprise_attack, _decide_enemy_action...)
+SURPRISE_CHANCE = 0.10
+ENEMY_ATTACK_CHANCE = 0.7
+ENEMY_HEAL_THRESHOLD = 0.3
+DEFAULT_SKILL_POWER = 5
+
+
+class BattleEstimate(NamedTuple):
+    """Estimate over `samples` simulated fights."""
+    win_probability: float
+    expected_turns: float
+    expected_hp_loss: float
+    samples: int
+
+
+def skill_power(ability):
+    """Puissance d'une capacité ennemie, comme dans Combat._enemy_use_skill."""
+    return ability.get('power', 0) if isinstance(ability, Mapping) else DEFAULT_SKILL_POWER
+
+
+def player_stat(player, stat, default=0):
+    """Statistique du joueur, modificateurs d'effets actifs compris (comme Combat._player_stat)."""
+    effects = getattr(player, 'status_effects', None)
+    return getattr(player, stat, default) + (effects.total(stat) if effects is not None else 0)
+
+
+def estimate_battle(player, enemy, samples=2000, max_turns=200, seed=None):
+    """
+    Estimate the outcome of the player auto-attacking enemy (MonsterInstance or mapping),
+    following the Combat rules: surprise roll, player attacks, enemy heal/attack/skill
+    choice, and halved damage while the player is defending. The player's active
+    effect modifiers are included in attack/defense, as at the start of the fight.
+    Without NumPy, falls back to CombatSimulator with fewer samples.
+    """
+    if np is None:
+        return _estimate_with_simulator(player, enemy, min(samples, 300), max_turns, seed)
+
+    rng = np.random.default_rng(seed)
+    player_attack = player_stat(player, 'attack', 1)
+    player_defense = player_stat(player, 'defense')
+    enemy_max_hp = enemy.get('hp', 0)
+    enemy_hp0 = enemy.get('current_hp', enemy_max_hp)
+    player_hp0 = player.hp
+    player_damage = max(player_attack - enemy.get('defense', 0), 1)
+    attack_damage = max(enemy.get('attack', 1) - player_defense, 1)
+    abilities = list(enemy.get('abilities', ()))
+    skill_damage = np.array([max(skill_power(a) - player_defense, 1) for a in abilities] or [attack_damage])
+    can_heal = 'heal' in abilities
+    heal_power = enemy.get('heal_power', 5)
+
+    player_hp = np.full(samples, player_hp0, dtype=np.int64)
+    enemy_hp = np.full(samples, enemy_hp0, dtype=np.int64)
+    turns = np.zeros(samples, dtype=np.int64)
+    defending = np.full(samples, bool(getattr(player, 'defending', False)))
+    player_turn = rng.random(samples) >= SURPRISE_CHANCE
+    active = np.ones(samples, dtype=bool)
+
+    for _ in range(max_turns):
+        if not active.any():
+            break
+        turns += active
+        # Tour du joueur: attaque de base
+        acting = active & player_turn
+        enemy_hp -= np.where(acting, player_damage, 0)
+        # Tour de l'ennemi: soin, attaque ou compétence
+        acting = active & ~player_turn
+        heal = acting & (enemy_hp < enemy_max_hp * ENEMY_HEAL_THRESHOLD) if can_heal else np.zeros(samples, dtype=bool)
+        roll = rng.random(samples)
+        attack = acting & ~heal & ((roll < ENEMY_ATTACK_CHANCE) | (not abilities))
+        skill = acting & ~heal & ~attack
+        damage = np.where(attack, attack_damage, 0)
+        damage = np.where(attack & defending, np.maximum(damage // 2, 1), damage)
+        defending &= ~attack
+        damage += np.where(skill, skill_damage[rng.integers(0, len(skill_damage), samples)], 0)
+        player_hp -= damage
+        enemy_hp = np.where(heal, np.minimum(enemy_hp + heal_power, enemy_max_hp), enemy_hp)
+        active &= (player_hp > 0) & (enemy_hp > 0)
+        player_turn = ~player_turn
+
+    wins = (enemy_hp <= 0) & (player_hp > 0)
+    hp_loss = player_hp0 - np.maximum(player_hp, 0)
+    return BattleEstimate(float(wins.mean()), float(turns.mean()), float(hp_loss.mean()), samples)
+
+
+def _estimate_with_simulator(player, enemy, samples, max_turns, seed):
+    """Version sans NumPy: combats joués un par un par CombatSimulator."""
+    from core.simulation import CombatSimulator
+    simulator = CombatSimulator(player, None, seed=seed, max_turns=max_turns)
+    outcomes = simulator.run(enemy, samples)
+    wins = sum(1 for outcome in outcomes if outcome.winner == "player")
+    turns = sum(outcome.turns for outcome in outcomes)
+    hp_loss = sum(min(outcome.damage_taken, player.hp) for outcome in outcomes)
+    return BattleEstimate(wins / samples, turns / samples, hp_loss / samples, samples)
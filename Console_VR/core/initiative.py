@@ -0,0 +1,64 @@
+"""
+initiative.py - Speed-based turn order for FateQuest group fights.
+Each combatant acts every ACTION_COST / speed ticks; a min-heap gives the next
+actor in O(log n), so turns stay cheap with dozens of participants.
+"""
+
+import heapq
+import itertools
+
+# Une action coûte ACTION_COST / speed unités de temps
+ACTION_COST = 100.0
+MIN_SPEED = 1
+
+
+class InitiativeQueue:
+    """
+    Priority queue of combatants keyed by the time of their next action.
+    Ties are broken deterministically: higher speed first, then join order.
+    Removed combatants are skipped lazily when they reach the top.
+    """
+    def __init__(self):
+        self._heap = []  # (time, -speed, join order, key)
+        self._order = itertools.count()
+        self._entries = {}  # key -> (combatant, speed, join order)
+        self.time = 0.0
+
+    def add(self, key, combatant, speed, delay=None):
+        """
+        Ajoute un combattant (key: identifiant unique). Il agit pour la première fois
+        après `delay` unités de temps (par défaut son délai d'action).
+        """
+        speed = max(speed or MIN_SPEED, MIN_SPEED)
+        order = next(self._order)
+        first = self.time + (ACTION_COST / speed if delay is None else delay)
+        self._entries[key] = (combatant, speed, order)
+        heapq.heappush(self._heap, (first, -speed, order, key))
+
+    def remove(self, key):
+        """Retire un combattant (mort, fuite); O(1), l'entrée du tas est ignorée plus tard."""
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def pop(self):
+        """
+        Renvoie (key, combatant) du prochain à agir et le replanifie à son tour suivant.
+        None si la file est vide.
+        """
+        heap = self._heap
+        while heap:
+            when, neg_speed, order, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[2] != order:
+                continue  # retiré (ou retiré puis ajouté de nouveau) entre-temps
+            self.time = when
+            combatant, speed = entry[0], entry[1]
+            heapq.heappush(heap, (when + ACTION_COST / speed, neg_speed, order, key))
+            return key, combatant
+        return None
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
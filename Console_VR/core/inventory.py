@@ -0,0 +1,289 @@
+"""
+inventory.py - Player inventory container for FateQuest.
+Keeps the stacks in insertion order like the former list, plus id -> slots and
+name -> slots indexes and per-type counts, so lookups, removals and merges are
+O(1) whatever the number of crafting materials carried.
+"""
+
+from collections.abc import Mapping
+from core.items import ItemInstance
+from core.search import best_match, fold
+
+# Taille de pile des objets 'stackable' sans stack_max / stack_size
+DEFAULT_STACK_SIZE = 99
+
+
+def item_attr(item, key, default=None):
+    """Champ d'un objet, qu'il soit un modèle (dict) ou un objet à attributs."""
+    if isinstance(item, Mapping):
+        return item.get(key, default)
+    return getattr(item, key, default)
+
+
+def stack_limit(item):
+    """Nombre maximal d'exemplaires par pile (1: l'objet ne s'empile pas)."""
+    if isinstance(item, ItemInstance):
+        return 1  # état propre: chaque instance a sa pile
+    limit = item_attr(item, 'stack_max') or item_attr(item, 'stack_size')
+    if limit:
+        return max(int(limit), 1)
+    return DEFAULT_STACK_SIZE if item_attr(item, 'stackable', False) else 1
+
+
+class Stack:
+    """One inventory slot: an item and how many copies of it it holds."""
+    __slots__ = ("item", "count")
+
+    def __init__(self, item, count=1):
+        self.item = item
+        self.count = count
+
+    def __repr__(self):
+        return f"<Stack {item_attr(self.item, 'id')} x{self.count}>"
+
+
+class Inventory:
+    """
+    Ordered collection of item stacks.
+    - add(item, count): fills the open stack of the same id first, O(1) per stack
+    - remove(item_id, count) / find_by_name(name) / count(item_id): O(1)
+    - count_by_type(type): O(1)
+    Iterating yields one item per stack, in order (like the former list).
+    """
+    def __init__(self):
+        self._slots = {}      # numéro de slot -> Stack (ordre d'insertion)
+        self._by_id = {}      # id -> {slot: None} (ensemble ordonné)
+        self._by_name = {}    # nom replié (search.fold) -> {slot: None}
+        self._open = {}       # id -> slot de la dernière pile non pleine
+        self._id_counts = {}  # id -> nombre d'exemplaires
+        self._type_counts = {}  # type -> nombre d'exemplaires
+        self._next_slot = 0
+        self._watchers = []   # callback(item_id, ancien nombre, nouveau nombre)
+
+    # --- Ajout / retrait ---
+
+    def add(self, item, count=1):
+        """Ajoute count exemplaires de item (en complétant les piles existantes)."""
+        item_id = item_attr(item, 'id')
+        limit = stack_limit(item)
+        remaining = count
+        while remaining > 0:
+            slot = self._open.get(item_id) if limit > 1 else None
+            if slot is None:
+                slot = self._new_slot(item)
+                stack = self._slots[slot]
+                if limit > 1:
+                    self._open[item_id] = slot
+            else:
+                stack = self._slots[slot]
+            added = min(limit - stack.count, remaining)
+            stack.count += added
+            remaining -= added
+            if stack.count >= limit and self._open.get(item_id) == slot:
+                del self._open[item_id]
+        self._count(item, count)
+
+    def _new_slot(self, item):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[slot] = Stack(item, 0)
+        self._index_slot(slot, item)
+        return slot
+
+    def _index_slot(self, slot, item):
+        self._by_id.setdefault(item_attr(item, 'id'), {})[slot] = None
+        self._by_name.setdefault(fold(item_attr(item, 'name', '')), {})[slot] = None
+
+    def _drop_slot(self, slot):
+        stack = self._slots.pop(slot)
+        item_id = item_attr(stack.item, 'id')
+        for index, key in ((self._by_id, item_id), (self._by_name, fold(item_attr(stack.item, 'name', '')))):
+            slots = index[key]
+            del slots[slot]
+            if not slots:
+                del index[key]
+        if self._open.get(item_id) == slot:
+            del self._open[item_id]
+
+    def _count(self, item, delta):
+        item_id = item_attr(item, 'id')
+        before = self._id_counts.get(item_id, 0)
+        for counts, key in ((self._id_counts, item_id), (self._type_counts, item_attr(item, 'type'))):
+            total = counts.get(key, 0) + delta
+            if total > 0:
+                counts[key] = total
+            else:
+                counts.pop(key, None)
+        if delta:
+            for watcher in self._watchers:
+                watcher(item_id, before, self._id_counts.get(item_id, 0))
+
+    def watch(self, callback):
+        """Appelle callback(item_id, ancien, nouveau) à chaque changement du nombre d'exemplaires d'un id."""
+        self._watchers.append(callback)
+
+    def remove(self, item_id, count=1):
+        """
+        Retire jusqu'à count exemplaires de item_id (piles les plus récentes d'abord).
+        Renvoie l'objet retiré, ou None si l'inventaire n'en contient pas.
+        """
+        slots = self._by_id.get(item_id)
+        if not slots:
+            return None
+        item = None
+        removed = 0
+        while removed < count and item_id in self._by_id:
+            item, taken = self._take(next(reversed(self._by_id[item_id])), count - removed)
+            removed += taken
+        self._count(item, -removed)
+        return item
+
+    def _take(self, slot, count):
+        """Retire jusqu'à count exemplaires d'une pile; renvoie (objet, nombre retiré)."""
+        stack = self._slots[slot]
+        item = stack.item
+        taken = min(stack.count, count)
+        stack.count -= taken
+        if stack.count <= 0:
+            self._drop_slot(slot)
+        elif stack_limit(item) > 1:
+            self._open[item_attr(item, 'id')] = slot
+        return item, taken
+
+    def discard(self, item, count=1):
+        """
+        Retire count exemplaires d'un objet donné: la pile qui le contient (une
+        ItemInstance précise, par exemple), sinon comme remove().
+        """
+        item_id = item_attr(item, 'id')
+        for slot in reversed(self._by_id.get(item_id, {})):
+            if self._slots[slot].item is item:
+                removed, taken = self._take(slot, count)
+                self._count(removed, -taken)
+                return removed
+        return self.remove(item_id, count)
+
+    def clear(self):
+        """Vide l'inventaire (les observateurs voient chaque objet passer à 0)."""
+        for item_id, count in list(self._id_counts.items()):
+            for watcher in self._watchers:
+                watcher(item_id, count, 0)
+        for mapping in (self._slots, self._by_id, self._by_name, self._open, self._id_counts, self._type_counts):
+            mapping.clear()
+
+    # --- Recherche ---
+
+    def get(self, item_id):
+        """Premier objet d'id item_id, ou None."""
+        slots = self._by_id.get(item_id)
+        return self._slots[next(iter(slots))].item if slots else None
+
+    def find_by_name(self, name, fuzzy=False):
+        """
+        Premier objet portant ce nom (insensible à la casse et aux accents), ou None.
+        fuzzy: à défaut, le nom porté le plus proche (accents, fautes de frappe). Réservé
+        aux consultations: une commande qui consomme ou retire un objet reste exacte.
+        """
+        slots = self._by_name.get(fold(name))
+        if not slots and fuzzy:
+            key = best_match(name, self._by_name, key=lambda candidate: candidate)
+            slots = self._by_name.get(key) if key is not None else None
+        return self._slots[next(iter(slots))].item if slots else None
+
+    def suggest_name(self, name):
+        """Nom de l'objet porté le plus proche de name (suggestion "vouliez-vous dire"), ou None."""
+        key = best_match(name, self._by_name, key=lambda candidate: candidate)
+        if key is None:
+            return None
+        return item_attr(self._slots[next(iter(self._by_name[key]))].item, 'name', key)
+
+    def count(self, item_id):
+        """Nombre d'exemplaires de item_id."""
+        return self._id_counts.get(item_id, 0)
+
+    def count_by_type(self, item_type):
+        """Nombre d'exemplaires des objets d'un type ('weapon', 'consumable'...)."""
+        return self._type_counts.get(item_type, 0)
+
+    def type_counts(self):
+        """Copie des comptes par type."""
+        return dict(self._type_counts)
+
+    def total(self):
+        """Nombre total d'exemplaires (toutes piles confondues)."""
+        return sum(self._id_counts.values())
+
+    def stacks(self):
+        """(objet, nombre) de chaque pile, dans l'ordre."""
+        return [(stack.item, stack.count) for stack in self._slots.values()]
+
+    def __contains__(self, item_id):
+        return item_id in self._by_id
+
+    def __iter__(self):
+        return (stack.item for stack in self._slots.values())
+
+    def __len__(self):
+        """Nombre de piles (emplacements occupés)."""
+        return len(self._slots)
+
+    def __bool__(self):
+        return bool(self._slots)
+
+    # --- Ordre ---
+
+    def sort(self, key=None, reverse=False):
+        """Trie les piles (key s'applique à l'objet de chaque pile, comme list.sort; par défaut le nom)."""
+        if key is None:
+            key = lambda item: str(item_attr(item, 'name', ''))
+        self._slots = dict(sorted(self._slots.items(), key=lambda entry: key(entry[1].item), reverse=reverse))
+        # Les index suivent l'ordre des piles
+        self._by_id = {}
+        self._by_name = {}
+        for slot, stack in self._slots.items():
+            self._index_slot(slot, stack.item)
+
+    # --- Sauvegarde ---
+
+    def to_list(self):
+        """
+        Format de sauvegarde: [[id, nombre], ...], une entrée par id (à la place de sa
+        première pile), et [id, 1, deltas] pour chaque ItemInstance; from_list refait
+        les piles.
+        """
+        counts = {}
+        entries = []
+        for stack in self._slots.values():
+            item = stack.item
+            if isinstance(item, ItemInstance):
+                entries.append([item.id, 1, item.deltas()])
+                continue
+            item_id = item_attr(item, 'id')
+            if item_id not in counts:
+                counts[item_id] = [item_id, 0]
+                entries.append(counts[item_id])
+            counts[item_id][1] += stack.count
+        return entries
+
+    @classmethod
+    def from_list(cls, entries, get_item):
+        """
+        Reconstruit un inventaire depuis to_list() (ou l'ancien format: liste d'ids).
+        get_item: id -> objet (ItemManager.get_item_by_id); les ids inconnus sont ignorés.
+        """
+        inventory = cls()
+        for entry in entries or []:
+            deltas = None
+            if isinstance(entry, (list, tuple)):
+                item_id, count = entry[0], entry[1]
+                if len(entry) > 2:
+                    deltas = entry[2]
+            else:
+                item_id, count = entry, 1
+            item = get_item(item_id)
+            if item is None:
+                continue
+            if deltas is not None:
+                item = ItemInstance(item, deltas)
+            inventory.add(item, count)
+        return inventory
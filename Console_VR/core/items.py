@@ -1,322 +1,578 @@
-"""
-items.py - Item and equipment management for FateQuest.
-Handles item creation, search, usage, crafting, and shop inventories.
-"""
-
-import json
-import random
-import os
-import uuid
-
-class ItemManager:
-    """
-    Manages item data, including loading definitions and handling item operations.
-    """
-    def __init__(self , data_dir="data"):
-        """
-        Initialize the ItemManager and load item data from JSON.
-        """
-        self.data_dir = data_dir
-        self.items = {}  # id -> item template
-        self.items_by_id = {}
-        self.load_items_data()
-        self.identified_items = set()
-    
-    def load_items_data(self):
-        """
-        Charge les données des items depuis les fichiers JSON dans data/items/.
-        """
-        item_files = [
-            "weapons.json", "armor.json", "consumables.json",
-            "quest_items.json", "legendary.json",
-            "crafting_materials.json", "enchantments.json"
-        ]
-        for file_name in item_files:
-            file_path = os.path.join(self.data_dir, "items", file_name)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)  # Lecture et désérialisation
-            except (FileNotFoundError, json.JSONDecodeError):
-                continue  # Fichier absent ou corrompu -> passer au suivant
-
-            # Normaliser en liste d'objets
-            if isinstance(data, dict):
-                items_list = []
-                for item_id, item_data in data.items():
-                    item_data["id"] = item_id
-                    items_list.append(item_data)
-            elif isinstance(data, list):
-                items_list = data
-            else:
-                continue
-
-            type_key = os.path.splitext(file_name)[0]  # ex: "weapons"
-            for item in items_list:
-                # Ajouter le type (singulier)
-                if "type" not in item:
-                    item["type"] = type_key.rstrip('s')
-                self.items[item["id"]] = item
-                self.items_by_id[item["id"]] = item
-    
-    def create_template_file(self, item_type: str, file_path: str):
-        """
-        Create a template JSON file for a new item type.
-        """
-        template = {
-            "id": "",
-            "name": "",
-            "type": item_type,
-            "rarity": 1,
-            "value": 0,
-            "level": 1,
-            "stats": {}
-        }
-        with open(file_path, 'w') as f:
-            json.dump(template, f, indent=4)
-        print(f"Template for {item_type} created at {file_path}.")
-    
-    def get_item_by_id(self, item_id):
-        """
-        Retrieve an item template by its ID.
-        """
-        return self.items_by_id.get(item_id)
-    
-    def get_item_by_name(self, item_name):
-        """Récupère le premier objet dont le nom correspond (insensible à la casse)."""
-        for item in self.items:
-            if item.get("name", "").lower() == item_name.lower():
-                return item
-        return None
-    
-    def get_all_items_of_type(self, item_type):
-        """
-        Get all items matching a given type (e.g., 'weapon', 'potion').
-        """
-        return [item for item in self.items.values() if item.get('type').lower() == item_type.lower()]
-    
-    def search_items(self, keyword):
-        """
-        Recherche basique d'objets contenant le mot-clé dans le nom ou la description.
-        Le critère peut être une chaîne; on renvoie les objets correspondants.
-        """
-        keyword = keyword.lower()
-        results = []
-        for item in self.items.values():
-            name = item.get("name", "").lower()
-            desc = item.get("description", "").lower()
-            if keyword in name or keyword in desc:
-                results.append(item)
-        return results
-    
-    def get_random_item(self, level=1, type_filter=None, rarity_filter=None):
-        """
-        Get a random item, optionally filtered by type, rarity, and approximate level.
-        """
-        candidates = []
-        for item in self.items.values():
-            if type_filter and item.get('type') != type_filter:
-                continue
-            if rarity_filter and item.get('rarity') != rarity_filter:
-                continue
-            if 'level' in item and abs(item['level'] - level) <= 1:
-                candidates.append(item)
-            elif 'level' not in item:
-                candidates.append(item)
-        if not candidates:
-            return None
-        base_item = random.choice(candidates)
-        # Apply variations to create a unique instance
-        return self._apply_variation_to_item(base_item.copy(), base_item.get('rarity', 1), level)
-    
-    def _apply_variation_to_item(self, base_item, rarity, level):
-        """
-        Apply random variations to an item based on its rarity and desired level.
-        """
-        item = base_item
-        item['level'] = level
-        # Increase value by rarity factor
-        item['value'] = item.get('value', 0) * (1 + 0.1 * rarity)
-        # Example: add random bonus stat for rare items
-        if rarity >= 4:
-            item['unique_bonus'] = f"+{rarity*2} to critical strike"
-        return item
-    
-    def create_quest_item(self, quest_id, item_template: dict):
-        """
-        Generate a quest-specific item based on a template.
-        """
-        quest_item = item_template.copy()
-        quest_item['id'] = f"quest_{quest_id}_{uuid.uuid4()}"
-        quest_item['quest_id'] = quest_id
-        return quest_item
-    
-    def get_boss_drop(self, boss_id, level):
-        """
-        Get items dropped by a boss of given ID and level.
-        """
-        # Placeholder: simulate boss drops as random items
-        drops = []
-        for i in range(random.randint(1, 3)):
-            item = self.get_random_item(level)
-            if item:
-                drops.append(item)
-        return drops
-    
-    def use_item(self, item, player):
-        """
-        Use/consume an item, applying its effects to the player.
-        """
-        item_type = item.get('type')
-        if item_type == 'potion':
-            heal = item.get('heal', 0)
-            player.hp = min(player.hp + heal, player.max_hp)
-            print(f"Used {item.get('name')} to heal {heal} HP.")
-        elif item_type == 'buff':
-            stat = item.get('stat')
-            amount = item.get('amount', 0)
-            duration = item.get('duration', 3)
-            player.status_effects.append({'stat': stat, 'amount': amount, 'duration': duration})
-            print(f"Used {item.get('name')} to buff {stat} by {amount} for {duration} turns.")
-        else:
-            print(f"{item.get('name')} cannot be used directly.")
-    
-    def equip_item(self, item, player):
-        """
-        Equip an item onto the player.
-        """
-        # Delegate equipping logic to player
-        success = player.equip_item(item.get('name'))
-        if success:
-            print(f"{player.name} equipped {item.get('name')}.")
-        else:
-            print(f"Failed to equip {item.get('name')}.")
-    
-    def get_shop_inventory(self, shop_id, player_level):
-        """
-        Generate or retrieve the inventory for a shop based on player level.
-        """
-        # For simplicity, pick a few random items appropriate for level
-        inventory = []
-        for _ in range(5):
-            item = self.get_random_item(player_level)
-            if item:
-                inventory.append(item)
-        return inventory
-    
-    def get_item_value(self, item, is_selling=False):
-        """
-        Calculate the buy/sell value of an item.
-        """
-        base = item.get('value', 0)
-        if is_selling:
-            return int(base * 0.5)
-        else:
-            return base
-    
-    def repair_item(self, item, player, full_repair=False):
-        """
-        Repair an item's durability. Reduces player's gold by cost.
-        """
-        cost = item.get('repair_cost', 0)
-        if full_repair:
-            cost *= 2
-        if player.gold >= cost:
-            player.gold -= cost
-            item['durability'] = item.get('max_durability', 100)
-            print(f"Repaired {item.get('name')} for {cost} gold.")
-        else:
-            print("Not enough gold to repair.")
-    
-    def enhance_item(self, item, player):
-        """
-        Enhance an item, increasing its stats at some cost.
-        """
-        cost = item.get('enhance_cost', 0)
-        if player.gold >= cost:
-            player.gold -= cost
-            item['level'] = item.get('level', 1) + 1
-            print(f"Enhanced {item.get('name')} to level {item['level']}.")
-        else:
-            print("Not enough gold to enhance.")
-    
-    def identify_item(self, item, player):
-        """
-        Identify a mysterious item, revealing its properties.
-        """
-        if not item.get('identified', False):
-            item['identified'] = True
-            self.identified_items.add(item['id'])
-            print(f"You identified the item: {item.get('name')}. It is {item.get('rarity')} rarity.")
-        else:
-            print("Item is already identified.")
-    
-    def craft_item(self, recipe_id, player):
-        """
-        Craft an item using a recipe and player's materials.
-        """
-        # Placeholder: assume recipe exists in items with negative id or in a separate structure
-        print(f"Crafting recipe {recipe_id} is not implemented.")
-    
-    def dismantle_item(self, item, player):
-        """
-        Dismantle an item into base materials.
-        """
-        # Placeholder: refund some materials
-        print(f"Dismantling {item.get('name')} yields base materials.")
-        return []
-    
-    def enchant_item(self, item, enchantment_id, player):
-        """
-        Apply an enchantment to an item.
-        """
-        # Placeholder: apply random enchantment
-        enchantment = {'id': enchantment_id, 'effect': 'fiery'}
-        item['enchantment'] = enchantment
-        print(f"{item.get('name')} is now enchanted with {enchantment['effect']}.")
-    
-    def check_legendary_unlock_conditions(self, item_id, player):
-        """
-        Check if conditions to unlock a legendary item are met.
-        """
-        # Placeholder: always return False
-        return False
-    
-    def generate_unique_property(self, item, player_level):
-        """
-        Generate a unique property for an item.
-        """
-        bonus = random.choice(['Fire Resist', 'Water Breath', 'Health Regen'])
-        item['unique_property'] = bonus
-        print(f"Item {item.get('name')} gains unique property: {bonus}.")
-        return bonus
-    
-    def get_item_evolution_path(self, item_id):
-        """
-        Get the evolution path (upgrades) for an item.
-        """
-        # Placeholder: return empty list
-        return []
-    
-    def evolve_item(self, item, player):
-        """
-        Evolve an item to its next tier.
-        """
-        item['level'] = item.get('level', 1) + 1
-        print(f"{item.get('name')} has evolved to level {item['level']}.")
-        return item
-    
-    def get_set_bonus(self, equipped_items):
-        """
-        Calculate set bonuses for equipped items sharing a set.
-        """
-        set_counts = {}
-        for item in equipped_items:
-            set_name = item.get('set_name')
-            if set_name:
-                set_counts.setdefault(set_name, []).append(item)
-        bonuses = {}
-        for set_name, items in set_counts.items():
-            if len(items) > 1:
-                bonus = len(items) * 5
-                bonuses[set_name] = f"+{bonus} to set bonus stat"
-        return bonuses
+"""
+items.py - Item and equipment management for FateQuest.
+Handles item creation, search, usage, crafting, and shop inventories.
+"""
+
+import json
+import random
+import uuid
+import weakref
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from core.content import ContentRegistry
+from core.crafting import CraftingTracker, DISMANTLE_REFUND, compile_recipe_book, execute_plan
+from core.messages import emit
+from core.rarity import UNIQUE_BONUS_RANK, compile_rarity_model
+from core.search import TrigramIndex
+
+
+def normalize_item_name(name):
+    """Clé de recherche d'un nom: insensible à la casse et aux espaces superflus."""
+    return " ".join(str(name).casefold().split())
+
+
+def item_level(item):
+    """Niveau d'un objet ('level', sinon 'level_req'), ou None s'il n'en a pas."""
+    level = item.get('level', item.get('level_req'))
+    return level if isinstance(level, (int, float)) else None
+
+
+# État propre à une instance gardé dans des slots (les autres différences vont dans overrides)
+_INSTANCE_FIELDS = ("durability", "level", "enchantment", "unique_property")
+
+
+class ItemInstance(Mapping):
+    """
+    An item whose state differs from its template (repaired, enhanced, enchanted...).
+    Only the template and the deltas are stored; reads fall back to the shared
+    template, writes (item['level'] = 3) only change the instance.
+    Behaves like the template dicts: item['name'], item.get('durability', 100).
+    Each instance is unique: it never stacks and compares by identity.
+    """
+    __slots__ = ("template",) + _INSTANCE_FIELDS + ("overrides",)
+
+    def __init__(self, template, deltas=None):
+        if isinstance(template, ItemInstance):
+            deltas = {**template.deltas(), **(deltas or {})}
+            template = template.template
+        self.template = template
+        self.durability = None
+        self.level = None
+        self.enchantment = None
+        self.unique_property = None
+        self.overrides = None  # clé -> valeur différente du modèle (créé à la demande)
+        for key, value in (deltas or {}).items():
+            self[key] = value
+
+    @property
+    def id(self):
+        return self.template['id']
+
+    def __getitem__(self, key):
+        if key in _INSTANCE_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.overrides is not None and key in self.overrides:
+            return self.overrides[key]
+        return self.template[key]
+
+    def __setitem__(self, key, value):
+        if key == 'id':
+            raise KeyError("l'id d'une instance est celui de son modèle")
+        if key in _INSTANCE_FIELDS:
+            setattr(self, key, value)
+            return
+        if self.overrides is None:
+            self.overrides = {}
+        self.overrides[key] = value
+
+    def __iter__(self):
+        yield from self.template
+        for key, _ in self._delta_items():
+            if key not in self.template:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def _delta_items(self):
+        for key in _INSTANCE_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                yield key, value
+        if self.overrides:
+            yield from self.overrides.items()
+
+    def deltas(self):
+        """Différences avec le modèle (format de sauvegarde)."""
+        return dict(self._delta_items())
+
+    def copy(self):
+        return ItemInstance(self.template, self.deltas())
+
+    def __repr__(self):
+        return f"<ItemInstance {self.id} {self.deltas()}>"
+
+
+def item_to_save(item):
+    """Format de sauvegarde d'un objet: son id, ou [id, deltas] pour une instance."""
+    if isinstance(item, ItemInstance):
+        return [item.id, item.deltas()]
+    return item.get('id')
+
+
+def item_from_save(entry, get_item):
+    """Objet depuis item_to_save() (get_item: id -> modèle); None si l'id est inconnu."""
+    if isinstance(entry, (list, tuple)):
+        template = get_item(entry[0])
+        return ItemInstance(template, entry[1]) if template is not None else None
+    return get_item(entry) if entry is not None else None
+
+
+class ItemIndex:
+    """
+    Lookup tables over the item templates, built once per content registry.
+    - by_name: normalized name -> id (first item wins, like the old scan)
+    - by_type / by_rarity: lower-cased type / raw rarity -> tuple of ids
+    - levels / level_ids: parallel arrays sorted by level, for bisect range queries
+    - unleveled: ids of items without a level (they match any level)
+    - name_search / text_search: trigram indexes over names and descriptions
+    """
+    def __init__(self, items):
+        by_name = {}
+        by_type = {}
+        by_rarity = {}
+        leveled = []
+        unleveled = []
+        for item_id, item in items.items():
+            by_name.setdefault(normalize_item_name(item.get('name', "")), item_id)
+            by_type.setdefault(str(item.get('type', "")).lower(), []).append(item_id)
+            by_rarity.setdefault(item.get('rarity'), []).append(item_id)
+            level = item_level(item)
+            if level is None:
+                unleveled.append(item_id)
+            else:
+                leveled.append((level, item_id))
+        leveled.sort(key=lambda entry: entry[0])
+        self.by_name = by_name
+        self.by_type = {key: tuple(ids) for key, ids in by_type.items()}
+        self.by_rarity = {key: tuple(ids) for key, ids in by_rarity.items()}
+        # Versions ensemblistes pour les filtres combinés
+        self.type_sets = {key: frozenset(ids) for key, ids in self.by_type.items()}
+        self.rarity_sets = {key: frozenset(ids) for key, ids in self.by_rarity.items()}
+        self.levels = [level for level, _ in leveled]
+        self.level_ids = tuple(item_id for _, item_id in leveled)
+        self.unleveled = tuple(unleveled)
+        self.name_search = TrigramIndex((item_id, item.get('name', "")) for item_id, item in items.items())
+        self.text_search = TrigramIndex((item_id, item.get('description', "")) for item_id, item in items.items())
+
+    def ids_near_level(self, level, spread=1):
+        """Ids dont le niveau vérifie abs(niveau - level) <= spread, plus les objets sans niveau."""
+        lo = bisect_left(self.levels, level - spread)
+        hi = bisect_right(self.levels, level + spread)
+        return self.level_ids[lo:hi] + self.unleveled
+
+
+def set_bonuses(equipped_items):
+    """
+    Bonus de panoplie des objets équipés: {set: description} pour chaque panoplie
+    dont au moins deux pièces sont portées ('set' dans les données, ou 'set_name').
+    """
+    set_counts = {}
+    for item in equipped_items:
+        set_name = item.get('set', item.get('set_name'))
+        if set_name:
+            set_counts[set_name] = set_counts.get(set_name, 0) + 1
+    bonuses = {}
+    for set_name, count in set_counts.items():
+        if count > 1:
+            bonus = count * 5
+            bonuses[set_name] = f"+{bonus} to set bonus stat"
+    return bonuses
+
+
+def compile_item_index(registry):
+    """Construit l'ItemIndex des objets du registre (utilisé via ContentRegistry.compiled)."""
+    return ItemIndex(registry.get_items())
+
+
+class ItemManager:
+    """
+    Manages item data, including loading definitions and handling item operations.
+    """
+    def __init__(self , data_dir="data", content=None):
+        """
+        Initialize the ItemManager and load item data from the shared content registry.
+        """
+        self.data_dir = data_dir
+        self.content = content or ContentRegistry.get_instance(data_dir)
+        self.items = {}  # id -> item template
+        self.items_by_id = {}
+        self.load_items_data()
+        self.identified_items = set()
+        self._crafting_trackers = weakref.WeakKeyDictionary()  # inventaire -> CraftingTracker
+    
+    def load_items_data(self):
+        """
+        Récupère les modèles d'objets (data/items/) depuis le registre de contenu partagé.
+        Les fichiers ne sont parsés qu'une fois par processus.
+        """
+        self.items = self.content.get_items()
+        self.items_by_id = self.items
+        self.index = self.content.compiled("item_index", compile_item_index)
+        self.recipes = self.content.compiled("recipes", compile_recipe_book)
+        self.rarity = self.content.compiled("rarity_model", compile_rarity_model)
+    
+    def create_template_file(self, item_type: str, file_path: str):
+        """
+        Create a template JSON file for a new item type.
+        """
+        template = {
+            "id": "",
+            "name": "",
+            "type": item_type,
+            "rarity": 1,
+            "value": 0,
+            "level": 1,
+            "stats": {}
+        }
+        with open(file_path, 'w') as f:
+            json.dump(template, f, indent=4)
+        emit(f"Template for {item_type} created at {file_path}.")
+    
+    def get_item_by_id(self, item_id):
+        """
+        Retrieve an item template by its ID.
+        """
+        return self.items_by_id.get(item_id)
+    
+    # Nom utilisé par World
+    get_item = get_item_by_id
+    
+    def get_item_by_name(self, item_name):
+        """Récupère le premier objet dont le nom correspond (insensible à la casse)."""
+        item_id = self.index.by_name.get(normalize_item_name(item_name))
+        return self.items_by_id.get(item_id) if item_id is not None else None
+    
+    def get_all_items_of_type(self, item_type):
+        """
+        Get all items matching a given type (e.g., 'weapon', 'potion').
+        """
+        return [self.items_by_id[item_id] for item_id in self.index.by_type.get(item_type.lower(), ())]
+    
+    def get_items_by_rarity(self, rarity):
+        """
+        Get all items of a given rarity (e.g., 'rare').
+        """
+        return [self.items_by_id[item_id] for item_id in self.index.by_rarity.get(rarity, ())]
+    
+    def get_items_near_level(self, level, spread=1):
+        """
+        Get all items whose level is within spread of the given level (items without level included).
+        """
+        return [self.items_by_id[item_id] for item_id in self.index.ids_near_level(level, spread)]
+    
+    def search_items(self, keyword, limit=None):
+        """
+        Recherche d'objets par mot-clé dans le nom ou la description, insensible aux
+        accents et tolérante aux fautes de frappe.
+        Les objets sont classés par pertinence, les correspondances sur le nom d'abord.
+        """
+        scores = {}
+        for item_id, score in self.index.name_search.search(keyword):
+            scores[item_id] = score + 1
+        for item_id, score in self.index.text_search.search(keyword):
+            scores.setdefault(item_id, score)
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.items_by_id[item_id] for item_id in ranked]
+    
+    def resolve_item_name(self, item_name):
+        """Objet dont le nom est le plus proche de item_name (exact d'abord), ou None."""
+        item = self.get_item_by_name(item_name)
+        if item is not None:
+            return item
+        item_id = self.index.name_search.best(item_name)
+        return self.items_by_id.get(item_id) if item_id is not None else None
+    
+    def get_random_item(self, level=1, type_filter=None, rarity_filter=None):
+        """
+        Get a random item, optionally filtered by type, rarity, and approximate level.
+        """
+        candidates = self.index.ids_near_level(level)
+        if type_filter:
+            allowed = self.index.type_sets.get(type_filter.lower(), frozenset())
+            candidates = [item_id for item_id in candidates if item_id in allowed]
+        if rarity_filter:
+            allowed = self.index.rarity_sets.get(rarity_filter, frozenset())
+            candidates = [item_id for item_id in candidates if item_id in allowed]
+        if not candidates:
+            return None
+        base_item = self.items_by_id[random.choice(candidates)]
+        # Apply variations to create a unique instance
+        return self._apply_variation_to_item(ItemInstance(base_item), base_item.get('rarity', 1), level)
+    
+    def get_random_item_by_rarity(self, rarity, rng=random):
+        """
+        Get a random item template of the given rarity (any casing), or None.
+        """
+        item_id = self.rarity.random_item_id(rarity, rng)
+        return self.items_by_id[item_id] if item_id is not None else None
+    
+    def draw_item(self, table, rng=random):
+        """
+        Get a random item template whose rarity is drawn from a rarity_config.json
+        draw table ("merchant", "chest"...), or None.
+        """
+        item_id = self.rarity.draw_item_id(table, rng)
+        return self.items_by_id[item_id] if item_id is not None else None
+    
+    def _apply_variation_to_item(self, base_item, rarity, level):
+        """
+        Apply random variations to an item based on its rarity and desired level.
+        """
+        item = base_item
+        item['level'] = level
+        # Increase value by rarity factor
+        item['value'] = item.get('value', 0) * self.rarity.value_multiplier(rarity)
+        # Example: add random bonus stat for rare items
+        rank = self.rarity.rank(rarity)
+        if rank >= UNIQUE_BONUS_RANK:
+            item['unique_bonus'] = f"+{rank*2} to critical strike"
+        return item
+    
+    def create_quest_item(self, quest_id, item_template: dict):
+        """
+        Generate a quest-specific item based on a template.
+        """
+        quest_item = item_template.copy()
+        quest_item['id'] = f"quest_{quest_id}_{uuid.uuid4()}"
+        quest_item['quest_id'] = quest_id
+        return quest_item
+    
+    def get_boss_drop(self, boss_id, level):
+        """
+        Get items dropped by a boss of given ID and level.
+        """
+        # Placeholder: simulate boss drops as random items
+        drops = []
+        for i in range(random.randint(1, 3)):
+            item = self.get_random_item(level)
+            if item:
+                drops.append(item)
+        return drops
+    
+    def use_item(self, item, player):
+        """
+        Use/consume an item, applying its effects to the player.
+        """
+        item_type = item.get('type')
+        if item_type == 'potion':
+            heal = item.get('heal', 0)
+            player.hp = min(player.hp + heal, player.max_hp)
+            emit(f"Used {item.get('name')} to heal {heal} HP.")
+        elif item_type == 'buff':
+            stat = item.get('stat')
+            amount = item.get('amount', 0)
+            duration = item.get('duration', 3)
+            player.status_effects.add(stat, amount, duration, source=item.get('id'))
+            emit(f"Used {item.get('name')} to buff {stat} by {amount} for {duration} turns.")
+        else:
+            emit(f"{item.get('name')} cannot be used directly.")
+    
+    def equip_item(self, item, player):
+        """
+        Equip an item onto the player.
+        """
+        # Delegate equipping logic to player
+        success = player.equip_item(item.get('name'))
+        if success:
+            emit(f"{player.name} equipped {item.get('name')}.")
+        else:
+            emit(f"Failed to equip {item.get('name')}.")
+    
+    def get_shop_inventory(self, shop_id, player_level):
+        """
+        Generate or retrieve the inventory for a shop based on player level.
+        """
+        # For simplicity, pick a few random items appropriate for level
+        inventory = []
+        for _ in range(5):
+            item = self.get_random_item(player_level)
+            if item:
+                inventory.append(item)
+        return inventory
+    
+    def get_item_value(self, item, is_selling=False):
+        """
+        Calculate the buy/sell value of an item.
+        """
+        base = item.get('value', 0)
+        if is_selling:
+            return int(base * 0.5)
+        else:
+            return base
+    
+    def own_item(self, item, player=None):
+        """
+        ItemInstance to modify instead of a shared template: the template copy held
+        by the player (inventory or equipment) is replaced by the new instance.
+        """
+        if isinstance(item, ItemInstance):
+            return item
+        instance = ItemInstance(item)
+        if player is not None:
+            player.replace_item(item, instance)
+        return instance
+    
+    def repair_item(self, item, player, full_repair=False):
+        """
+        Repair an item's durability. Reduces player's gold by cost.
+        """
+        cost = item.get('repair_cost', 0)
+        if full_repair:
+            cost *= 2
+        if player.gold >= cost:
+            player.gold -= cost
+            item = self.own_item(item, player)
+            item['durability'] = item.get('max_durability', 100)
+            emit(f"Repaired {item.get('name')} for {cost} gold.")
+            return item
+        else:
+            emit("Not enough gold to repair.")
+    
+    def enhance_item(self, item, player):
+        """
+        Enhance an item, increasing its stats at some cost.
+        """
+        cost = item.get('enhance_cost', 0)
+        if player.gold >= cost:
+            player.gold -= cost
+            item = self.own_item(item, player)
+            item['level'] = item.get('level', 1) + 1
+            emit(f"Enhanced {item.get('name')} to level {item['level']}.")
+            return item
+        else:
+            emit("Not enough gold to enhance.")
+    
+    def identify_item(self, item, player):
+        """
+        Identify a mysterious item, revealing its properties.
+        """
+        if not item.get('identified', False):
+            item = self.own_item(item, player)
+            item['identified'] = True
+            self.identified_items.add(item['id'])
+            emit(f"You identified the item: {item.get('name')}. It is {item.get('rarity')} rarity.")
+        else:
+            emit("Item is already identified.")
+    
+    def crafting_tracker(self, inventory):
+        """CraftingTracker d'un inventaire (créé à la première demande, puis tenu à jour)."""
+        tracker = self._crafting_trackers.get(inventory)
+        if tracker is None:
+            tracker = self._crafting_trackers[inventory] = CraftingTracker(self.recipes, inventory)
+        return tracker
+    
+    def craftable_recipes(self, player):
+        """
+        Recipes the player can craft right now with the materials in hand.
+        """
+        return self.crafting_tracker(player.inventory).recipes()
+    
+    def craft_item(self, recipe_id, player, count=1):
+        """
+        Craft count times a recipe (by id or name), crafting missing intermediate
+        materials from the player's stock when they have a recipe.
+        Returns the CraftPlan, or None if the recipe is unknown.
+        """
+        recipe = self.recipes.resolve(recipe_id)
+        if recipe is None:
+            emit(f"Unknown recipe: {recipe_id}.")
+            return None
+        inventory = player.inventory
+        plan = self.recipes.plan(recipe.id, count, inventory.count)
+        if not plan.ok:
+            emit(f"Missing materials to craft {recipe.name} x{count}:")
+            for item_id, needed in plan.missing.items():
+                item = self.get_item_by_id(item_id)
+                emit(f"  - {item['name'] if item else item_id} x{needed}")
+            return plan
+        level = getattr(player, 'level', 1)
+        for step, _ in plan.crafts:
+            if step.level > level:
+                emit(f"{step.name} requires level {step.level}.")
+                return plan
+        execute_plan(plan, inventory, self.items_by_id)
+        for step, times in plan.crafts[:-1]:
+            emit(f"Crafted {step.name} x{step.quantity * times} (intermediate).")
+        emit(f"Crafted {recipe.name} x{recipe.quantity * count}.")
+        return plan
+    
+    def dismantle_item(self, item, player):
+        """
+        Dismantle an item into part of the materials of its recipe.
+        Returns the list of (material, count) given back.
+        """
+        recipe = self.recipes.recipe_for(item.get('id'))
+        if recipe is None:
+            emit(f"{item.get('name')} cannot be dismantled.")
+            return []
+        refund = []
+        for material_id, needed in recipe.materials:
+            material = self.get_item_by_id(material_id)
+            count = int(needed / recipe.quantity * DISMANTLE_REFUND)
+            if material is not None and count > 0:
+                refund.append((material, count))
+        player.inventory.discard(item)
+        for material, count in refund:
+            player.inventory.add(material, count)
+        emit(f"Dismantling {item.get('name')} yields: "
+             + (", ".join(f"{material['name']} x{count}" for material, count in refund) or "nothing"))
+        return refund
+    
+    def enchant_item(self, item, enchantment_id, player):
+        """
+        Apply an enchantment to an item.
+        """
+        # Placeholder: apply random enchantment
+        enchantment = {'id': enchantment_id, 'effect': 'fiery'}
+        item = self.own_item(item, player)
+        item['enchantment'] = enchantment
+        emit(f"{item.get('name')} is now enchanted with {enchantment['effect']}.")
+        return item
+    
+    def check_legendary_unlock_conditions(self, item_id, player):
+        """
+        Check if conditions to unlock a legendary item are met.
+        """
+        # Placeholder: always return False
+        return False
+    
+    def generate_unique_property(self, item, player_level, player=None):
+        """
+        Generate a unique property for an item (an ItemInstance; a template is
+        first replaced by an instance in player's possessions).
+        """
+        item = self.own_item(item, player)
+        bonus = random.choice(['Fire Resist', 'Water Breath', 'Health Regen'])
+        item['unique_property'] = bonus
+        emit(f"Item {item.get('name')} gains unique property: {bonus}.")
+        return bonus
+    
+    def get_item_evolution_path(self, item_id):
+        """
+        Get the evolution path (upgrades) for an item.
+        """
+        # Placeholder: return empty list
+        return []
+    
+    def evolve_item(self, item, player):
+        """
+        Evolve an item to its next tier.
+        """
+        item = self.own_item(item, player)
+        item['level'] = item.get('level', 1) + 1
+        emit(f"{item.get('name')} has evolved to level {item['level']}.")
+        return item
+    
+    def get_set_bonus(self, equipped_items):
+        """
+        Calculate set bonuses for equipped items sharing a set.
+        """
+        return set_bonuses(equipped_items)
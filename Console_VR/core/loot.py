@@ -0,0 +1,169 @@
+"""
+loot.py - Compiled monster loot tables for FateQuest.
+Each monster's loot_table (rarity -> item ids, or the older [{item_id, chance}]
+list) and special_drops are compiled once into tiers: a drop chance and the
+cumulative weights of the tier's items. One kill rolls every tier once; many
+kills are rolled at once with NumPy (roll_many).
+"""
+
+import random
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Mapping
+
+from core.rarity import DEFAULT_LOOT_CHANCES, DEFAULT_SPECIAL_DROP_CHANCE, compile_rarity_model
+from core.sampling import np
+
+GUARANTEED = 'guaranteed'
+
+
+class LootTier:
+    """One roll of a loot table: with probability chance, one of ids picked by weight."""
+    __slots__ = ("chance", "ids", "cumulative", "_array")
+
+    def __init__(self, chance, ids, weights=None):
+        self.chance = chance
+        self.ids = tuple(ids)
+        weights = list(weights) if weights is not None else [1.0] * len(self.ids)
+        total = float(sum(weights))
+        cumulative = []
+        running = 0.0
+        for weight in weights:
+            running += weight
+            cumulative.append(running / total)
+        cumulative[-1] = 1.0
+        self.cumulative = cumulative  # poids cumulés normalisés (dernier = 1.0)
+        self._array = None
+
+    def pick(self, u):
+        """Objet du palier pour u uniforme dans [0, 1)."""
+        return self.ids[min(bisect_right(self.cumulative, u), len(self.ids) - 1)]
+
+    @property
+    def array(self):
+        """Poids cumulés en tableau NumPy (pour np.searchsorted)."""
+        if self._array is None:
+            self._array = np.array(self.cumulative)
+        return self._array
+
+
+class LootTable:
+    """
+    Compiled loot of a monster.
+    roll(rng, luck): item ids dropped by one kill (rng: random module or Random).
+    roll_many(n, luck, np_rng): Counter item id -> copies dropped by n kills.
+    luck multiplies every tier chance (capped at 100%).
+    """
+    __slots__ = ("tiers", "guaranteed")
+
+    def __init__(self, tiers, guaranteed=()):
+        self.tiers = tuple(tiers)
+        self.guaranteed = tuple(guaranteed)
+
+    @classmethod
+    def from_monster(cls, monster, chances=None, special_chance=DEFAULT_SPECIAL_DROP_CHANCE):
+        """
+        Compile loot_table et special_drops d'un monstre (modèle ou instance).
+        chances: rareté -> chance de drop en % (RarityModel.loot_chances).
+        """
+        chances = DEFAULT_LOOT_CHANCES if chances is None else chances
+        tiers = []
+        guaranteed = []
+        loot_table = monster.get('loot_table') or ()
+        if isinstance(loot_table, Mapping):
+            # Format des données: {rareté: [ids] ou {id: poids}}, 'guaranteed' tombe toujours
+            for rarity, entries in loot_table.items():
+                if not entries:
+                    continue
+                if rarity == GUARANTEED:
+                    guaranteed.extend(entries)
+                    continue
+                chance = chances.get(rarity, 0) / 100
+                if chance <= 0:
+                    continue
+                if isinstance(entries, Mapping):
+                    tiers.append(LootTier(chance, entries.keys(), entries.values()))
+                else:
+                    tiers.append(LootTier(chance, entries))
+        else:
+            # Ancien format: [{item_id, chance}], un tirage indépendant par entrée
+            for entry in loot_table:
+                chance = entry.get('chance', 100) / 100
+                if chance > 0 and entry.get('item_id') is not None:
+                    tiers.append(LootTier(chance, (entry['item_id'],)))
+        special = monster.get('special_drops') or ()
+        if special and special_chance > 0:
+            tiers.append(LootTier(special_chance / 100, special))
+        return cls(tiers, guaranteed)
+
+    def roll(self, rng=random, luck=1.0):
+        """Objets lâchés par un ennemi vaincu (un tirage rng.random() par palier)."""
+        loot = list(self.guaranteed)
+        loot.extend(self._roll_tiers(rng, luck))
+        return loot
+
+    def _roll_tiers(self, rng, luck):
+        """Objets tirés dans les paliers pour un ennemi (sans les objets garantis)."""
+        for tier in self.tiers:
+            chance = min(tier.chance * luck, 1.0)
+            u = rng.random()
+            if u < chance:
+                yield tier.pick(u / chance)
+
+    def roll_many(self, n, luck=1.0, np_rng=None, rng=random):
+        """
+        Objets lâchés par n ennemis vaincus, en Counter id -> nombre.
+        Avec NumPy, tous les tirages sont faits en une passe par palier.
+        """
+        drops = Counter()
+        if n <= 0:
+            return drops
+        for item_id in self.guaranteed:
+            drops[item_id] += n
+        if not self.tiers:
+            return drops
+        if np is None:
+            for _ in range(n):
+                drops.update(self._roll_tiers(rng, luck))
+            return drops
+        np_rng = np_rng if np_rng is not None else np.random.default_rng()
+        draws = np_rng.random((len(self.tiers), n))
+        for tier, u in zip(self.tiers, draws):
+            chance = min(tier.chance * luck, 1.0)
+            hits = u[u < chance]
+            if not hits.size:
+                continue
+            if len(tier.ids) == 1:
+                drops[tier.ids[0]] += int(hits.size)
+                continue
+            picks = np.minimum(np.searchsorted(tier.array, hits / chance, side='right'), len(tier.ids) - 1)
+            for index, count in enumerate(np.bincount(picks, minlength=len(tier.ids)).tolist()):
+                if count:
+                    drops[tier.ids[index]] += count
+        return drops
+
+
+class LootBook:
+    """LootTables of every monster template, by monster id (see compile_loot_tables)."""
+    def __init__(self, monsters, rarity):
+        self.chances = rarity.loot_chances
+        self.special_chance = rarity.special_drop_chance
+        self.tables = {monster['id']: LootTable.from_monster(monster, self.chances, self.special_chance)
+                       for monster in monsters}
+
+    def table_for(self, monster):
+        """
+        LootTable d'un monstre: celle compilée pour son modèle (MonsterInstance), sinon
+        (dict, ou instance avec sa propre table) compilée à la volée.
+        """
+        if hasattr(monster, 'template'):
+            overrides = monster.overrides or ()
+            table = self.tables.get(monster.get('id'))
+            if table is not None and 'loot_table' not in overrides and 'special_drops' not in overrides:
+                return table
+        return LootTable.from_monster(monster, self.chances, self.special_chance)
+
+
+def compile_loot_tables(registry):
+    """Construit le LootBook des monstres du registre (utilisé via ContentRegistry.compiled)."""
+    return LootBook(registry.get_monsters(), registry.compiled("rarity_model", compile_rarity_model))
@@ -0,0 +1,157 @@
+"""
+messages.py - Game output bus for FateQuest.
+Subsystems emit structured messages instead of printing; the active sink decides
+what happens to them: the terminal sink buffers and renders them in one write per
+command, the null sink drops them (headless runs, simulations), the list sink keeps
+them (UI, checks).
+"""
+
+import sys
+import atexit
+import contextlib
+from termcolor import colored
+
+
+class Message:
+    """One line (or fragment, see end) of game output, with its termcolor styling."""
+    __slots__ = ("text", "color", "on_color", "attrs", "end")
+
+    def __init__(self, text, color=None, on_color=None, attrs=None, end="\n"):
+        self.text = text
+        self.color = color
+        self.on_color = on_color
+        self.attrs = attrs
+        self.end = end
+
+    def render(self):
+        """Texte final (codes de couleur ANSI compris)."""
+        if self.color or self.on_color or self.attrs:
+            return colored(self.text, self.color, self.on_color, self.attrs) + self.end
+        return self.text + self.end
+
+    def __repr__(self):
+        return f"<Message {self.text!r}>"
+
+
+class TerminalSink:
+    """
+    Buffers messages and writes them to the terminal in a single call on flush().
+    Flushes on its own past max_buffer messages so scripts that never flush still print.
+    """
+    accepts = True
+
+    def __init__(self, stream=None, max_buffer=500):
+        self.stream = stream
+        self.max_buffer = max_buffer
+        self.buffer = []
+
+    def write(self, message):
+        self.buffer.append(message)
+        if len(self.buffer) >= self.max_buffer:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("".join(message.render() for message in self.buffer))
+        stream.flush()
+        self.buffer.clear()
+
+
+class NullSink:
+    """Drops everything: emit() returns before building the message."""
+    accepts = False
+
+    def write(self, message):
+        pass
+
+    def flush(self):
+        pass
+
+
+class ListSink:
+    """Keeps the messages (UI front ends, checks); flush() does nothing."""
+    accepts = True
+
+    def __init__(self):
+        self.messages = []
+
+    def write(self, message):
+        self.messages.append(message)
+
+    def flush(self):
+        pass
+
+    def text(self):
+        """Texte brut (sans couleurs) des messages reçus."""
+        return "".join(message.text + message.end for message in self.messages)
+
+
+class MessageBus:
+    """
+    Routes emitted messages to the current sink.
+    """
+    def __init__(self, sink=None):
+        self.sink = sink if sink is not None else TerminalSink()
+
+    def emit(self, text="", color=None, on_color=None, attrs=None, end="\n"):
+        """Même signature que termcolor.colored (plus end, comme print)."""
+        sink = self.sink
+        if sink.accepts:
+            sink.write(Message(str(text), color, on_color, attrs, end))
+
+    def flush(self):
+        self.sink.flush()
+
+    def set_sink(self, sink):
+        """Remplace le puits de sortie (le précédent est vidé) et renvoie l'ancien."""
+        previous = self.sink
+        previous.flush()
+        self.sink = sink
+        return previous
+
+
+# Bus du processus, utilisé par tous les sous-systèmes
+bus = MessageBus()
+
+
+def emit(text="", color=None, on_color=None, attrs=None, end="\n"):
+    """Émet un message sur le bus du processus."""
+    sink = bus.sink
+    if sink.accepts:
+        sink.write(Message(str(text), color, on_color, attrs, end))
+
+
+def flush():
+    """Affiche les messages en attente (appelé une fois par commande par le front end)."""
+    bus.sink.flush()
+
+
+def set_sink(sink):
+    """Change le puits du bus du processus; renvoie le précédent."""
+    return bus.set_sink(sink)
+
+
+@contextlib.contextmanager
+def muted():
+    """Ignore tous les messages émis dans le bloc."""
+    previous = set_sink(NullSink())
+    try:
+        yield
+    finally:
+        bus.sink = previous
+
+
+@contextlib.contextmanager
+def captured():
+    """Collecte les messages émis dans le bloc dans un ListSink (renvoyé par le with)."""
+    sink = ListSink()
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        bus.sink = previous
+
+
+atexit.register(flush)
@@ -1,291 +1,513 @@
-"""
-monsters.py - Enemy and boss management for FateQuest.
-Handles monster templates, spawning, and related utilities.
-"""
-import os
-import json
-import random
-import uuid
-
-class MonsterManager:
-    """
-    Manages monster data, including loading definitions and generating encounters.
-    """
-    def __init__(self, data_dir="data"):
-        """
-        Initialise en chargeant tous les monstres et données associées.
-        """
-        self.data_dir = data_dir
-        self.monsters = []
-        self.monsters_by_id = {}
-        # Charger données auxiliaires
-        self.factions = {}
-        self.abilities = {}
-        self.behaviors = {}
-        self.load_monster_data()
-    
-    def load_monster_data(self):
-        """
-        Charge les JSON de monstres et descripteurs (factions, abilities, behaviors).
-        """
-        # Charger factions, capacités, comportements
-        try:
-            with open(os.path.join(self.data_dir, "monsters", "factions.json"), 'r', encoding='utf-8') as f:
-                self.factions = json.load(f)
-        except:
-            self.factions = {}
-        try:
-            with open(os.path.join(self.data_dir, "monsters", "abilities.json"), 'r', encoding='utf-8') as f:
-                self.abilities = json.load(f)
-        except:
-            self.abilities = {}
-        try:
-            with open(os.path.join(self.data_dir, "monsters", "behaviors.json"), 'r', encoding='utf-8') as f:
-                self.behaviors = json.load(f)
-        except:
-            self.behaviors = {}
-
-        # Fichiers de monstres groupés par rareté
-        monster_files = [
-            ("common.json", "common"),
-            ("uncommon.json", "uncommon"),
-            ("rare.json", "rare"),
-            ("elite.json", "elite"),
-            ("bosses.json", "boss")
-        ]
-        for file_name, rarity in monster_files:
-            path = os.path.join(self.data_dir, "monsters", file_name)
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                continue
-            # Normaliser en liste
-            if isinstance(data, dict):
-                monsters_list = []
-                for mon_id, mon_data in data.items():
-                    mon_data["id"] = mon_id
-                    monsters_list.append(mon_data)
-            elif isinstance(data, list):
-                monsters_list = data
-            else:
-                continue
-
-            for monster in monsters_list:
-                monster.setdefault("rarity", rarity)
-                monster.setdefault("faction", None)
-                # Remplacer IDs d'abilities par les données réelles si disponible
-                if "abilities" in monster and isinstance(monster["abilities"], list):
-                    monster["abilities"] = [
-                        self.abilities.get(ab_id, ab_id) for ab_id in monster["abilities"]
-                    ]
-                # Ajouter comportement si défini
-                if monster["id"] in self.behaviors:
-                    monster["behavior"] = self.behaviors[monster["id"]]
-                self.monsters.append(monster)
-                self.monsters_by_id[monster["id"]] = monster
-
-    def get_monster_by_id(self, monster_id):
-        """Retourne un monstre par son ID."""
-        return self.monsters_by_id.get(monster_id)
-
-    # Pour la compatibilité avec le code existant :
-    get_enemy = get_monster_by_id  # Alias si nécessaire
-    
-    def create_template_files(self, monster_type: str, file_path: str):
-        """
-        Create a template JSON file for a new monster type.
-        """
-        template = {
-            "id": "",
-            "name": "",
-            "type": monster_type,
-            "level": 1,
-            "hp": 10,
-            "attack": 1,
-            "defense": 0,
-            "abilities": [],
-            "weaknesses": [],
-            "resistances": [],
-            "loot_table": []
-        }
-        with open(file_path, 'w') as f:
-            json.dump(template, f, indent=4)
-        print(f"Monster template created at {file_path}.")
-    
-    def get_enemy(self, monster_id=None, location=None, level=None):
-        """
-        Retrieve a specific or random enemy. If monster_id is given, return that monster.
-        Otherwise, choose a random monster matching location or level.
-        """
-        if monster_id:
-            monster = self.get_monster_by_id(monster_id)
-            if monster:
-                return self._apply_variation_to_monster(monster.copy(), level or monster.get('level', 1))
-        # Random selection
-        candidates = []
-        for monster in self.monsters.values():
-            if location and monster.get('location') != location:
-                continue
-            if level and monster.get('level') != level:
-                continue
-            candidates.append(monster)
-        if not candidates:
-            # fallback to any monster
-            candidates = list(self.monsters.values())
-        base = random.choice(candidates)
-        return self._apply_variation_to_monster(base.copy(), level or base.get('level', 1))
-    
-    def get_boss(self, boss_id=None, difficulty=1):
-        """
-        Get a boss by ID and apply difficulty scaling.
-        """
-        if boss_id and boss_id in self.monsters:
-            boss = self.monsters[boss_id].copy()
-        else:
-            # Choose a random monster as boss if none specified
-            boss = random.choice(list(self.monsters.values())).copy()
-        boss = self._apply_variation_to_monster(boss, boss.get('level', 1) * difficulty, is_boss=True)
-        return boss
-    
-    def get_enemies_for_location(self, location, level, count=3):
-        """
-        Generate a list of enemies suitable for the given location and level.
-        """
-        enemies = []
-        for _ in range(count):
-            enemy = self.get_enemy(location=location, level=level)
-            if enemy:
-                enemies.append(enemy)
-        return enemies
-    
-    def get_random_monster(self, level=1, type_filter=None, faction_filter=None):
-        """
-        Get a random monster with optional type or faction filters.
-        """
-        candidates = []
-        for monster in self.monsters.values():
-            if type_filter and monster.get('type') != type_filter:
-                continue
-            if faction_filter and monster.get('faction') != faction_filter:
-                continue
-            if 'level' in monster and monster['level'] == level:
-                candidates.append(monster)
-        if not candidates:
-            candidates = list(self.monsters.values())
-        base = random.choice(candidates)
-        return self._apply_variation_to_monster(base.copy(), level)
-    
-    def _apply_variation_to_monster(self, base_monster, level, is_boss=False):
-        """
-        Apply statistical variations to a monster based on its level or boss status.
-        """
-        monster = base_monster
-        monster['level'] = level
-        # Scale HP and attack by level
-        monster['hp'] = monster.get('hp', 10) + (level - 1) * 5
-        monster['attack'] = monster.get('attack', 1) + (level - 1) * 1
-        if is_boss:
-            # Bosses are tougher
-            monster['hp'] *= 2
-            monster['attack'] *= 2
-        monster['current_hp'] = monster['hp']
-        return monster
-    
-    def _generate_unique_monster_id(self):
-        """
-        Generate a unique ID for a newly created monster instance.
-        """
-        return str(uuid.uuid4())
-    
-    def get_monster_by_id(self, monster_id):
-        """
-        Get a monster template by ID.
-        """
-        return self.monsters.get(monster_id)
-    
-    def search_monsters(self, criteria: dict):
-        """
-        Search for monsters by criteria (e.g., type, level).
-        """
-        results = []
-        for m in self.monsters:
-            if all(m.get(k) == v for k, v in criteria.items()):
-                results.append(m)
-        return results
-    
-    def calculate_monster_exp_reward(self, monster, player_level):
-        """
-        Calculate the experience reward for defeating a monster.
-        """
-        base_exp = monster.get('level', 1) * 10
-        level_diff = monster.get('level', 1) - player_level
-        exp = base_exp + max(level_diff * 5, 0)
-        return max(exp, 1)
-    
-    def calculate_monster_loot_table(self, monster, player_luck=1):
-        """
-        Calculate loot items dropped by a monster.
-        """
-        loot = []
-        for drop in monster.get('loot_table', []):
-            chance = drop.get('chance', 100)
-            roll = random.randint(1, 100)
-            if roll <= chance * player_luck:
-                loot.append(drop.get('item_id'))
-        return loot
-    
-    def get_monster_abilities(self, monster):
-        """
-        Return the abilities of a monster.
-        """
-        return monster.get('abilities', [])
-    
-    def get_monster_weakness(self, monster):
-        """
-        Return the weaknesses of a monster (e.g., elemental).
-        """
-        return monster.get('weaknesses', [])
-    
-    def get_monster_resistance(self, monster):
-        """
-        Return the resistances of a monster (e.g., elemental).
-        """
-        return monster.get('resistances', [])
-    
-    def check_monster_faction_relations(self, monster_id, target_faction):
-        """
-        Check relations between monster's faction and target faction.
-        """
-        monster = self.get_monster_by_id(monster_id)
-        if not monster:
-            return None
-        faction = monster.get('faction')
-        if faction == target_faction:
-            return 'ally'
-        return 'enemy'
-    
-    def get_monster_description(self, monster, player_knowledge=0):
-        """
-        Generate a description of the monster, varying by player's knowledge.
-        """
-        name = monster.get('name', 'Unknown')
-        lvl = monster.get('level', 1)
-        desc = f"A level {lvl} {name}."
-        if player_knowledge > 0:
-            desc += f" It has {monster.get('hp')} HP and deals {monster.get('attack')} damage."
-        return desc
-    
-    def get_monster_behavior(self, monster_id, combat_state):
-        """
-        Determine monster behavior in combat (e.g., aggressive, cautious).
-        """
-        # Placeholder: random or simple AI traits
-        return random.choice(['aggressive', 'defensive', 'cautious'])
-    
-    def update_monster_population(self, location, monster_type, killed=False):
-        """
-        Update the population or spawn rate of monsters in a location.
-        """
-        # Placeholder: could spawn more if killed=False, or reduce if killed
-        pass
+"""
+monsters.py - Enemy and boss management for FateQuest.
+Handles monster templates, spawning, and related utilities.
+"""
+import json
+import random
+import uuid
+from core.content import ContentRegistry, freeze
+from core.sampling import WeightedChoice, np
+from core.messages import emit
+from core.effects import EffectScheduler
+from core.loot import compile_loot_tables
+from core.rarity import DEFAULT_SPAWN_WEIGHTS, compile_rarity_model
+
+# Champs propres à une instance (les autres sont lus dans le modèle)
+_INSTANCE_FIELDS = frozenset(("level", "current_hp", "status_effects"))
+
+
+def compile_monster_templates(registry):
+    """
+    Compile les monstres normalisés du registre en modèles immuables (id -> modèle).
+    """
+    return {monster["id"]: freeze(monster) for monster in registry.get_monsters()}
+
+
+# Largeur des tranches de niveau de l'index d'apparition
+LEVEL_BAND_SIZE = 5
+# Types de lieux (world/locations.json) -> étiquette spawn_locations des monstres
+LOCATION_TYPE_TAGS = {
+    "forêt": "forest",
+    "plaine": "plains",
+    "grotte": "cave",
+    "caverne": "cave",
+    "marais": "swamp",
+    "montagne": "mountain",
+    "désert": "desert",
+    "ruines": "ruins",
+    "cimetière": "graveyard",
+    "crypte": "crypt",
+    "route": "road",
+    "rivière": "river",
+    "lac": "lake",
+    "jungle": "jungle",
+    "volcan": "volcano",
+    "collines": "hills",
+    "océan": "ocean",
+    "champs": "fields",
+    "égouts": "sewers",
+}
+ANY_LOCATION = "*"
+
+
+def level_band(level):
+    """Tranche de niveau (0 pour 1-5, 1 pour 6-10, ...)."""
+    return max(0, (int(level) - 1) // LEVEL_BAND_SIZE)
+
+
+def spawn_weight(template, weights=DEFAULT_SPAWN_WEIGHTS):
+    """Poids d'apparition d'un modèle de monstre ("spawn_weight", sinon le poids de sa rareté)."""
+    weight = template.get("spawn_weight")
+    if weight is None:
+        weight = weights.get(template.get("rarity"), 1)
+    return weight
+
+
+class SpawnIndex:
+    """
+    Precomputed spawn tables for the non-boss monster templates.
+    Buckets are keyed by (kind, value, level band) where kind is "location"
+    (a spawn_locations tag, or "*" for anywhere), "type" or "faction";
+    each bucket holds an alias table weighted by rarity, so a draw is O(1).
+    weights: rarity -> spawn weight (RarityModel.spawn_weights).
+    """
+    def __init__(self, templates, weights=DEFAULT_SPAWN_WEIGHTS):
+        buckets = {}
+        for template in templates:
+            if template.get("rarity") == "boss" or spawn_weight(template, weights) <= 0:
+                continue
+            level_range = template.get("level_range") or (template.get("level", 1),) * 2
+            bands = range(level_band(level_range[0]), level_band(level_range[-1]) + 1)
+            keys = [("location", ANY_LOCATION)]
+            keys += [("location", tag) for tag in template.get("spawn_locations", ())]
+            keys.append(("type", template.get("type")))
+            keys.append(("faction", template.get("faction")))
+            for kind, value in keys:
+                for band in bands:
+                    buckets.setdefault((kind, value, band), []).append(template)
+        self.tables = {
+            key: WeightedChoice(members, [spawn_weight(t, weights) for t in members])
+            for key, members in buckets.items()
+        }
+        self.max_band = max((key[2] for key in self.tables), default=0)
+
+    def table(self, kind, value, level):
+        """
+        Alias table for (kind, value) at this level, falling back to the nearest
+        lower band (then higher) when the exact band is empty. None if nothing matches.
+        """
+        band = min(level_band(level), self.max_band)
+        tables = self.tables
+        for candidate in range(band, -1, -1):
+            table = tables.get((kind, value, candidate))
+            if table is not None:
+                return table
+        for candidate in range(band + 1, self.max_band + 1):
+            table = tables.get((kind, value, candidate))
+            if table is not None:
+                return table
+        return None
+
+
+def compile_spawn_index(registry):
+    """Construit le SpawnIndex (utilisé via ContentRegistry.compiled)."""
+    return SpawnIndex(registry.compiled("monster_templates", compile_monster_templates).values(),
+                      registry.compiled("rarity_model", compile_rarity_model).spawn_weights)
+
+
+def location_spawn_tag(location):
+    """Étiquette d'apparition d'un lieu: dict de world/locations.json ou étiquette directe."""
+    if isinstance(location, str):
+        return location
+    location_type = location.get("type", ANY_LOCATION)
+    return LOCATION_TYPE_TAGS.get(location_type, location_type)
+
+
+class MonsterInstance:
+    """
+    A monster met in the world or in combat.
+    Only the per-instance state is stored (level, current HP, status effects and
+    the stats that differ from the template); everything else is read from the
+    shared, immutable template. Behaves like the former enemy dicts:
+    enemy['name'], enemy.get('attack', 1), enemy['current_hp'] -= 5...
+    """
+    __slots__ = ("template", "level", "current_hp", "status_effects", "overrides")
+
+    def __init__(self, template, level=None):
+        self.template = template
+        self.level = level if level is not None else template.get("level", 1)
+        self.current_hp = template.get("hp", 0)
+        self.status_effects = None  # EffectScheduler créé à l'entrée en combat
+        self.overrides = None  # clé -> valeur différente du modèle (créé à la demande)
+
+    def __getitem__(self, key):
+        if key in _INSTANCE_FIELDS:
+            return getattr(self, key)
+        overrides = self.overrides
+        if overrides is not None and key in overrides:
+            return overrides[key]
+        return self.template[key]
+
+    def __setitem__(self, key, value):
+        if key in _INSTANCE_FIELDS:
+            setattr(self, key, value)
+            return
+        if self.overrides is None:
+            self.overrides = {}
+        self.overrides[key] = value
+
+    def __contains__(self, key):
+        return key in _INSTANCE_FIELDS or key in self.template or (self.overrides is not None and key in self.overrides)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        """Nouvelle instance du même modèle avec le même état."""
+        clone = MonsterInstance(self.template, self.level)
+        clone.current_hp = self.current_hp
+        if self.status_effects is not None:
+            clone.status_effects = EffectScheduler.from_list(self.status_effects.to_list())
+        if self.overrides is not None:
+            clone.overrides = dict(self.overrides)
+        return clone
+
+    def to_dict(self):
+        """Vue dict complète (modèle + état de l'instance), pour l'affichage ou le debug."""
+        data = dict(self.template)
+        if self.overrides:
+            data.update(self.overrides)
+        for key in _INSTANCE_FIELDS:
+            data[key] = getattr(self, key)
+        return data
+
+    def __repr__(self):
+        return f"<MonsterInstance {self.template.get('id')} lvl={self.level} hp={self.current_hp}>"
+
+
+class MonsterManager:
+    """
+    Manages monster data, including loading definitions and generating encounters.
+    """
+    def __init__(self, data_dir="data", content=None):
+        """
+        Initialise en chargeant tous les monstres et données associées.
+        """
+        self.data_dir = data_dir
+        self.content = content or ContentRegistry.get_instance(data_dir)
+        self.monsters = []
+        self.monsters_by_id = {}
+        # Charger données auxiliaires
+        self.factions = {}
+        self.abilities = {}
+        self.behaviors = {}
+        self.load_monster_data()
+    
+    def load_monster_data(self):
+        """
+        Récupère les monstres et descripteurs (factions, abilities, behaviors)
+        depuis le registre de contenu partagé.
+        """
+        self.factions = self.content.get("monsters/factions.json", {})
+        self.abilities = self.content.get("monsters/abilities.json", {})
+        self.behaviors = self.content.get("monsters/behaviors.json", {})
+
+        # Modèles compilés une seule fois par registre, immuables et partagés
+        self.monsters_by_id = self.content.compiled("monster_templates", compile_monster_templates)
+        self.monsters = list(self.monsters_by_id.values())
+        self.spawn_index = self.content.compiled("spawn_index", compile_spawn_index)
+        # Tables des listes "enemies" explicites des lieux (tuple d'ids -> WeightedChoice)
+        self._explicit_tables = {}
+        # Tableaux (hp, attack) des modèles d'une table, pour spawn_batch
+        self._batch_stats = {}
+        self.np_rng = np.random.default_rng() if np is not None else None
+        # Tables de butin compilées (rarity_config.json pour les chances par rareté)
+        self.loot = self.content.compiled("loot_tables", compile_loot_tables)
+
+    def get_monster_by_id(self, monster_id):
+        """Retourne le modèle (immuable) d'un monstre par son ID."""
+        return self.monsters_by_id.get(monster_id)
+
+    def instantiate(self, template, level=None):
+        """
+        Create a MonsterInstance from a template, a template ID or a plain dict.
+        """
+        if isinstance(template, str):
+            template = self.get_monster_by_id(template)
+            if template is None:
+                return None
+        elif isinstance(template, dict):
+            template = freeze(template)
+        return MonsterInstance(template, level)
+
+    def get_monster(self, monster_id):
+        """
+        Nouvelle instance d'un monstre au niveau de son modèle, ou None s'il est inconnu.
+        """
+        return self.instantiate(monster_id)
+
+    def adjust_monster_stats(self, monster, level):
+        """
+        Ajuste les statistiques d'une instance à un niveau donné.
+        """
+        return self._apply_variation_to_monster(monster, level)
+    
+    def create_template_files(self, monster_type: str, file_path: str):
+        """
+        Create a template JSON file for a new monster type.
+        """
+        template = {
+            "id": "",
+            "name": "",
+            "type": monster_type,
+            "level": 1,
+            "hp": 10,
+            "attack": 1,
+            "defense": 0,
+            "abilities": [],
+            "weaknesses": [],
+            "resistances": [],
+            "loot_table": []
+        }
+        with open(file_path, 'w') as f:
+            json.dump(template, f, indent=4)
+        emit(f"Monster template created at {file_path}.")
+    
+    def get_enemy(self, monster_id=None, location=None, level=None):
+        """
+        Retrieve a specific or random enemy. If monster_id is given, return that monster.
+        Otherwise, choose a random monster matching location or level.
+        """
+        if monster_id:
+            monster = self.get_monster_by_id(monster_id)
+            if monster:
+                return self._apply_variation_to_monster(self.instantiate(monster), level or monster.get('level', 1))
+        # Random selection through the spawn index
+        base = self._pick_template(location, level or 1)
+        return self._apply_variation_to_monster(self.instantiate(base), level or base.get('level', 1))
+    
+    def _pick_template(self, location=None, level=1):
+        """
+        Tire un modèle pour un lieu (dict ou étiquette) et un niveau, en O(1).
+        """
+        return self._spawn_table(location, level).choice()
+    
+    def _spawn_table(self, location=None, level=1):
+        """
+        Table d'apparition d'un lieu (dict ou étiquette) à un niveau donné.
+        Ordre: ennemis explicites du lieu connus, étiquette du lieu, n'importe où, tous les monstres.
+        """
+        table = None
+        if isinstance(location, dict) and location.get("enemies"):
+            table = self._explicit_table(location["enemies"])
+        if table is None and location:
+            table = self.spawn_index.table("location", location_spawn_tag(location), level)
+        if table is None:
+            table = self.spawn_index.table("location", ANY_LOCATION, level)
+        if table is None:
+            table = self._explicit_table([monster["id"] for monster in self.monsters])
+        return table
+    
+    def _explicit_table(self, enemy_ids):
+        """Table des ids explicites d'un lieu qui existent (None si aucun), mise en cache."""
+        key = tuple(enemy_ids)
+        if key not in self._explicit_tables:
+            known = [self.monsters_by_id[i] for i in key if i in self.monsters_by_id]
+            self._explicit_tables[key] = WeightedChoice(known, [1] * len(known)) if known else None
+        return self._explicit_tables[key]
+    
+    def get_boss(self, boss_id=None, difficulty=1):
+        """
+        Get a boss by ID and apply difficulty scaling.
+        """
+        if boss_id and boss_id in self.monsters_by_id:
+            boss = self.instantiate(self.monsters_by_id[boss_id])
+        else:
+            # Choose a random monster as boss if none specified
+            boss = self.instantiate(random.choice(self.monsters))
+        boss = self._apply_variation_to_monster(boss, boss.get('level', 1) * difficulty, is_boss=True)
+        return boss
+    
+    def get_enemies_for_location(self, location, level, count=3, level_spread=0):
+        """
+        Generate a list of enemies suitable for the given location and level.
+        location is a location dict (world/locations.json) or a spawn tag ("forest").
+        Each enemy level varies by up to level_spread around the given level.
+        """
+        enemies = []
+        for _ in range(count):
+            enemy_level = max(1, level + random.randint(-level_spread, level_spread))
+            base = self._pick_template(location, enemy_level)
+            enemies.append(self._apply_variation_to_monster(self.instantiate(base), enemy_level))
+        return enemies
+    
+    def spawn_batch(self, location, player_level, n, level_spread=1):
+        """
+        Spawn n enemies for a location around player_level in one pass.
+        Template ids, level variations and scaled HP/attack are drawn and computed
+        as NumPy arrays (same formulas as _apply_variation_to_monster); only the
+        MonsterInstance objects are created one by one. Without NumPy, falls back
+        to get_enemies_for_location.
+        """
+        if n <= 0:
+            return []
+        if np is None:
+            return self.get_enemies_for_location(location, player_level, n, level_spread)
+        table = self._spawn_table(location, player_level)
+        base_hp, base_attack = self._table_stats(table)
+        rng = self.np_rng
+        picks = table.table.sample_many(n, rng)
+        levels = np.maximum(1, player_level + rng.integers(-level_spread, level_spread + 1, n))
+        hp = base_hp[picks] + (levels - 1) * 5
+        attack = base_attack[picks] + (levels - 1)
+        templates = table.values
+        enemies = []
+        for pick, level, enemy_hp, enemy_attack in zip(picks.tolist(), levels.tolist(), hp.tolist(), attack.tolist()):
+            enemy = MonsterInstance(templates[pick], level)
+            enemy.overrides = {"hp": enemy_hp, "attack": enemy_attack}
+            enemy.current_hp = enemy_hp
+            enemies.append(enemy)
+        return enemies
+    
+    def _table_stats(self, table):
+        """Tableaux NumPy (hp, attack) de base des modèles d'une table, mis en cache."""
+        stats = self._batch_stats.get(id(table))
+        if stats is None:
+            stats = (
+                np.array([t.get('hp', 10) for t in table.values], dtype=np.int64),
+                np.array([t.get('attack', 1) for t in table.values], dtype=np.int64),
+            )
+            self._batch_stats[id(table)] = stats
+        return stats
+    
+    def get_random_monster(self, level=1, type_filter=None, faction_filter=None):
+        """
+        Get a random monster with optional type or faction filters.
+        """
+        table = None
+        if type_filter and faction_filter:
+            # Combinaison rare: filtrage de la table du type
+            type_table = self.spawn_index.table("type", type_filter, level)
+            candidates = [m for m in (type_table.values if type_table else ()) if m.get('faction') == faction_filter]
+            if candidates:
+                return self._apply_variation_to_monster(self.instantiate(random.choice(candidates)), level)
+        elif type_filter:
+            table = self.spawn_index.table("type", type_filter, level)
+        elif faction_filter:
+            table = self.spawn_index.table("faction", faction_filter, level)
+        if table is None:
+            table = self.spawn_index.table("location", ANY_LOCATION, level)
+        base = table.choice() if table is not None else random.choice(self.monsters)
+        return self._apply_variation_to_monster(self.instantiate(base), level)
+    
+    def _apply_variation_to_monster(self, base_monster, level, is_boss=False):
+        """
+        Apply statistical variations to a monster based on its level or boss status.
+        """
+        monster = base_monster
+        monster['level'] = level
+        # Scale HP and attack by level
+        monster['hp'] = monster.get('hp', 10) + (level - 1) * 5
+        monster['attack'] = monster.get('attack', 1) + (level - 1) * 1
+        if is_boss:
+            # Bosses are tougher
+            monster['hp'] *= 2
+            monster['attack'] *= 2
+        monster['current_hp'] = monster['hp']
+        return monster
+    
+    def _generate_unique_monster_id(self):
+        """
+        Generate a unique ID for a newly created monster instance.
+        """
+        return str(uuid.uuid4())
+    
+    def search_monsters(self, criteria: dict):
+        """
+        Search for monsters by criteria (e.g., type, level).
+        """
+        results = []
+        for m in self.monsters:
+            if all(m.get(k) == v for k, v in criteria.items()):
+                results.append(m)
+        return results
+    
+    def calculate_monster_exp_reward(self, monster, player_level):
+        """
+        Calculate the experience reward for defeating a monster.
+        """
+        base_exp = monster.get('level', 1) * 10
+        level_diff = monster.get('level', 1) - player_level
+        exp = base_exp + max(level_diff * 5, 0)
+        return max(exp, 1)
+    
+    def calculate_monster_loot_table(self, monster, player_luck=1):
+        """
+        Calculate loot items dropped by a monster.
+        """
+        return self.loot.table_for(monster).roll(random, player_luck)
+    
+    def roll_loot(self, monster, n_kills=1, luck=1.0):
+        """
+        Loot dropped by n_kills defeats of a monster, as a Counter item id -> count.
+        Drawn in one vectorized pass when NumPy is available (auto-resolve, farming).
+        """
+        return self.loot.table_for(monster).roll_many(n_kills, luck, self.np_rng)
+    
+    def get_monster_abilities(self, monster):
+        """
+        Return the abilities of a monster.
+        """
+        return monster.get('abilities', [])
+    
+    def get_monster_weakness(self, monster):
+        """
+        Return the weaknesses of a monster (e.g., elemental).
+        """
+        return monster.get('weaknesses', [])
+    
+    def get_monster_resistance(self, monster):
+        """
+        Return the resistances of a monster (e.g., elemental).
+        """
+        return monster.get('resistances', [])
+    
+    def check_monster_faction_relations(self, monster_id, target_faction):
+        """
+        Check relations between monster's faction and target faction.
+        """
+        monster = self.get_monster_by_id(monster_id)
+        if not monster:
+            return None
+        faction = monster.get('faction')
+        if faction == target_faction:
+            return 'ally'
+        return 'enemy'
+    
+    def get_monster_description(self, monster, player_knowledge=0):
+        """
+        Generate a description of the monster, varying by player's knowledge.
+        """
+        name = monster.get('name', 'Unknown')
+        lvl = monster.get('level', 1)
+        desc = f"A level {lvl} {name}."
+        if player_knowledge > 0:
+            desc += f" It has {monster.get('hp')} HP and deals {monster.get('attack')} damage."
+        return desc
+    
+    def get_monster_behavior(self, monster_id, combat_state):
+        """
+        Determine monster behavior in combat (e.g., aggressive, cautious).
+        """
+        # Placeholder: random or simple AI traits
+        return random.choice(['aggressive', 'defensive', 'cautious'])
+    
+    def update_monster_population(self, location, monster_type, killed=False):
+        """
+        Update the population or spawn rate of monsters in a location.
+        """
+        # Placeholder: could spawn more if killed=False, or reduce if killed
+        pass
@@ -0,0 +1,199 @@
+"""
+profiling.py - Startup profiler for FateQuest (python main.py --profile-startup).
+Measures module import times, per-file JSON read/parse times and the
+construction time of the game systems, as text or JSON.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import contextlib
+
+# Modules mesurés, dans l'ordre d'import du jeu
+THIRD_PARTY_MODULES = ["colorama", "termcolor"]
+UI_MODULES = ["PyQt5", "PyQt5.QtWidgets"]
+CORE_MODULES = [
+    "core.content", "core.player", "core.world", "core.combat", "core.items",
+    "core.monsters", "core.achievements", "core.logic_engine", "core.save_system"
+]
+
+# Code exécuté dans l'interpréteur fils: un échec d'import ne doit pas arrêter la mesure
+# (__import__ et non importlib.import_module: seul le premier passe par le chemin C
+# qui journalise -X importtime pour le module de premier niveau)
+_IMPORT_SCRIPT = """
+import sys
+for name in sys.argv[1:]:
+    try:
+        __import__(name)
+    except Exception:
+        pass
+"""
+
+
+class StartupProfiler:
+    """
+    Collects a cold-start breakdown of the game.
+    Imports are timed in a fresh interpreter (python -X importtime) since the
+    running process has already imported everything.
+    """
+    def __init__(self, game_factory, data_dir="data", include_ui=False):
+        """
+        game_factory is the Game class of main.py (called without arguments).
+        """
+        self.game_factory = game_factory
+        self.data_dir = data_dir
+        self.include_ui = include_ui
+        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run(self):
+        """
+        Run every measurement and return the report as a dict.
+        """
+        report = {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "imports": self.profile_imports(),
+        }
+        report["content"] = self.profile_content()
+        report["construction"] = self.profile_construction()
+        return report
+
+    def profile_imports(self):
+        """
+        Import time of each module in a child interpreter, in milliseconds.
+        Missing modules are reported with None.
+        """
+        modules = list(THIRD_PARTY_MODULES)
+        if self.include_ui:
+            modules += UI_MODULES
+        modules += CORE_MODULES
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT] + modules,
+            cwd=self.base_dir, capture_output=True, text=True
+        )
+        # Format: "import time: self [us] | cumulative | imported package"
+        measured = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            parts = line[len("import time:"):].split("|")
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                continue
+            name = parts[2].strip()
+            measured[name] = (int(parts[0]) / 1000.0, int(parts[1]) / 1000.0)
+        imports = {}
+        for name in modules:
+            if name in measured:
+                self_ms, cumulative_ms = measured[name]
+                imports[name] = {"self_ms": self_ms, "cumulative_ms": cumulative_ms}
+            else:
+                imports[name] = None
+        return imports
+
+    def profile_content(self):
+        """
+        Content loading: snapshot or JSON, plus per-file read/parse times (ms)
+        from a forced JSON load.
+        """
+        from core.content import ContentRegistry
+        start = time.perf_counter()
+        registry = ContentRegistry(self.data_dir)
+        load_ms = (time.perf_counter() - start) * 1000.0
+        json_registry = ContentRegistry(self.data_dir, use_snapshot=False)
+        files = {
+            rel: {"read_ms": read_s * 1000.0, "parse_ms": parse_s * 1000.0}
+            for rel, (read_s, parse_s) in json_registry.load_times.items()
+        }
+        return {"source": registry.source, "load_ms": load_ms, "json_files": files}
+
+    def profile_construction(self):
+        """
+        Construction time (ms) of Game.__init__ with a cold content registry,
+        then of each manager on a warm registry.
+        """
+        from core.content import ContentRegistry
+        from core.messages import muted
+        from core.items import ItemManager
+        from core.monsters import MonsterManager
+        from core.player import Player
+        from core.achievements import AchievementSystem
+        from core.logic_engine import LogicEngine
+        from core.world import World
+
+        timings = {}
+        ContentRegistry.clear_instances()
+        # La sortie des constructeurs ne doit pas polluer le rapport
+        with muted(), contextlib.redirect_stdout(io.StringIO()):
+            game = self._timed(timings, "Game.__init__", self.game_factory)
+            item_manager = self._timed(timings, "ItemManager", ItemManager, self.data_dir)
+            monster_manager = self._timed(timings, "MonsterManager", MonsterManager, self.data_dir)
+            player_class = next(iter(Player.base_classes), None)
+            player = self._timed(timings, "Player", Player, "Profil", player_class)
+            achievements = self._timed(timings, "AchievementSystem", AchievementSystem, player, self.data_dir)
+            self._timed(timings, "LogicEngine", LogicEngine, player, None, monster_manager, achievements, self.data_dir)
+            self._timed(timings, "World", World, player, monster_manager, item_manager, self.data_dir)
+        del game
+        return timings
+
+    def _timed(self, timings, label, factory, *args):
+        """Appelle factory(*args), note sa durée en ms (ou l'erreur) et renvoie le résultat."""
+        start = time.perf_counter()
+        try:
+            result = factory(*args)
+        except Exception as e:
+            timings[label] = {"ms": None, "error": f"{type(e).__name__}: {e}"}
+            return None
+        timings[label] = {"ms": (time.perf_counter() - start) * 1000.0}
+        return result
+
+
+def format_report(report):
+    """
+    Render a profiler report as human-readable text.
+    """
+    lines = ["=== Profil de démarrage FateQuest ===", f"Python {report['python']}", ""]
+    lines.append("Imports (ms)                     self   cumulé")
+    for name, timing in report["imports"].items():
+        if timing is None:
+            lines.append(f"  {name:<28} (non disponible)")
+        else:
+            lines.append(f"  {name:<28} {timing['self_ms']:7.2f} {timing['cumulative_ms']:8.2f}")
+    content = report["content"]
+    lines.append("")
+    lines.append(f"Contenu chargé depuis: {content['source']} ({content['load_ms']:.2f} ms)")
+    lines.append("Fichiers JSON (ms)               lecture  parsing")
+    total_read = total_parse = 0.0
+    for rel, timing in sorted(content["json_files"].items()):
+        total_read += timing["read_ms"]
+        total_parse += timing["parse_ms"]
+        lines.append(f"  {rel:<32} {timing['read_ms']:6.2f} {timing['parse_ms']:8.2f}")
+    lines.append(f"  {'total':<32} {total_read:6.2f} {total_parse:8.2f}")
+    lines.append("")
+    lines.append("Construction (ms)")
+    for label, timing in report["construction"].items():
+        if timing["ms"] is None:
+            lines.append(f"  {label:<28} erreur: {timing['error']}")
+        else:
+            lines.append(f"  {label:<28} {timing['ms']:8.2f}")
+    return "\n".join(lines)
+
+
+def run_startup_profile(game_factory, include_ui=False, output_format="text", output=None):
+    """
+    Entry point used by main.py: profile, print (or write to output) and return an exit code.
+    """
+    report = StartupProfiler(game_factory, include_ui=include_ui).run()
+    if output_format == "json":
+        text = json.dumps(report, indent=2)
+    else:
+        text = format_report(report)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
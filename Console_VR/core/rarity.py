@@ -0,0 +1,128 @@
+"""
+rarity.py - Rarity model for FateQuest.
+One RarityModel per content registry, built from data/system/rarity_config.json:
+rarity ranks, display colors and value multipliers, the item ids of each rarity,
+and alias tables for the weighted rarity draws (merchants, chests), so drawing
+an item of a random rarity is O(1). Loot chances and monster spawn weights are
+read from the same file.
+"""
+
+import random
+
+from core.sampling import WeightedChoice
+
+RARITY_CONFIG_FILE = "system/rarity_config.json"
+
+# Valeurs par défaut si rarity_config.json ne les donne pas
+DEFAULT_RARITIES = {
+    "common": {"rank": 1, "color": "white"},
+    "uncommon": {"rank": 2, "color": "green"},
+    "rare": {"rank": 3, "color": "blue"},
+    "epic": {"rank": 4, "color": "magenta"},
+    "legendary": {"rank": 5, "color": "yellow"},
+    "mythic": {"rank": 6, "color": "red"},
+}
+DEFAULT_LOOT_CHANCES = {'common': 50, 'uncommon': 20, 'rare': 5, 'epic': 2, 'legendary': 1}
+DEFAULT_SPECIAL_DROP_CHANCE = 10
+# Poids d'apparition par rareté des monstres (un monstre peut le surcharger avec "spawn_weight")
+DEFAULT_SPAWN_WEIGHTS = {"common": 60, "uncommon": 25, "rare": 10, "elite": 5}
+# Rang à partir duquel un objet généré reçoit un bonus unique
+UNIQUE_BONUS_RANK = 4
+
+# Couleurs termcolor -> codes ANSI (affichage sans termcolor)
+ANSI_COLORS = {
+    "white": "\033[0m",
+    "grey": "\033[90m",
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "magenta": "\033[95m",
+    "cyan": "\033[96m",
+}
+
+
+class RarityModel:
+    """
+    Rarity data shared by items, shops, world events, loot and spawns.
+    - normalize(rarity): canonical name ('Rare', 'rare' and 3 all give 'rare')
+    - rank / color / ansi / value_multiplier(rarity)
+    - buckets: rarity -> item ids of that rarity
+    - draw_item_id(table): item id drawn from a weighted rarity table
+      ("merchant", "chest"...); tables only keep rarities that have items
+    """
+    def __init__(self, config, items):
+        config = config or {}
+        rarities = config.get("rarities") or DEFAULT_RARITIES
+        self.order = sorted(rarities, key=lambda name: rarities[name].get("rank", 0))
+        self.ranks = {name: rarities[name].get("rank", index + 1) for index, name in enumerate(self.order)}
+        self._by_rank = {rank: name for name, rank in self.ranks.items()}
+        self.colors = {name: rarities[name].get("color", "white") for name in self.order}
+        # Multiplicateur de valeur des objets générés (1 + 0.1 x rang par défaut)
+        self.multipliers = {name: rarities[name].get("value_multiplier", 1 + 0.1 * self.ranks[name])
+                            for name in self.order}
+        self.loot_chances = dict(config.get("loot_chances") or DEFAULT_LOOT_CHANCES)
+        self.special_drop_chance = config.get("special_drop_chance", DEFAULT_SPECIAL_DROP_CHANCE)
+        self.spawn_weights = dict(config.get("spawn_weights") or DEFAULT_SPAWN_WEIGHTS)
+
+        buckets = {}
+        for item_id, item in items.items():
+            rarity = self.normalize(item.get("rarity"))
+            if rarity is not None:
+                buckets.setdefault(rarity, []).append(item_id)
+        self.buckets = {rarity: tuple(ids) for rarity, ids in buckets.items()}
+
+        self.tables = {}
+        for name, weights in (config.get("draw_tables") or {}).items():
+            available = [rarity for rarity in weights if self.buckets.get(self.normalize(rarity)) and weights[rarity] > 0]
+            if available:
+                self.tables[name] = WeightedChoice([self.normalize(rarity) for rarity in available],
+                                                   [weights[rarity] for rarity in available])
+
+    def normalize(self, rarity):
+        """Nom canonique d'une rareté (nom insensible à la casse, ou rang numérique), ou None."""
+        if isinstance(rarity, str):
+            name = rarity.strip().lower()
+            return name if name in self.ranks else None
+        if isinstance(rarity, (int, float)) and not isinstance(rarity, bool):
+            return self._by_rank.get(int(rarity))
+        return None
+
+    def rank(self, rarity):
+        """Rang d'une rareté (0 si inconnue)."""
+        name = self.normalize(rarity)
+        return self.ranks[name] if name is not None else 0
+
+    def color(self, rarity):
+        """Couleur termcolor d'une rareté ('white' si inconnue)."""
+        name = self.normalize(rarity)
+        return self.colors[name] if name is not None else "white"
+
+    def ansi(self, rarity):
+        """Code couleur ANSI d'une rareté."""
+        return ANSI_COLORS.get(self.color(rarity), ANSI_COLORS["white"])
+
+    def value_multiplier(self, rarity):
+        """Multiplicateur de valeur d'un objet généré de cette rareté (1.0 si inconnue)."""
+        name = self.normalize(rarity)
+        return self.multipliers[name] if name is not None else 1.0
+
+    def draw(self, table, rng=random):
+        """Rareté tirée dans une table de draw_tables, ou None si la table n'existe pas."""
+        choice = self.tables.get(table)
+        return choice.choice(rng) if choice is not None else None
+
+    def random_item_id(self, rarity, rng=random):
+        """Id d'un objet de cette rareté pris au hasard, ou None."""
+        ids = self.buckets.get(self.normalize(rarity))
+        return ids[int(rng.random() * len(ids))] if ids else None
+
+    def draw_item_id(self, table, rng=random):
+        """Id d'un objet dont la rareté est tirée dans la table, ou None."""
+        rarity = self.draw(table, rng)
+        return self.random_item_id(rarity, rng) if rarity is not None else None
+
+
+def compile_rarity_model(registry):
+    """Construit le RarityModel du registre (utilisé via ContentRegistry.compiled)."""
+    return RarityModel(registry.get(RARITY_CONFIG_FILE, {}), registry.get_items())
@@ -0,0 +1,461 @@
+"""
+replay.py - Binary combat recording for FateQuest.
+A fight run through Combat can be recorded as a compact event stream (turn, actor,
+event code, value): actions, every RNG draw and HP deltas, packed with struct and
+array instead of JSON. tools/replay.py re-runs a recording headless and checks
+that it reproduces.
+"""
+
+import os
+import sys
+import atexit
+import math
+import struct
+from array import array
+from datetime import datetime
+
+MAGIC = b"FQRP"
+VERSION = 1
+
+# Modes de combat
+MODE_SINGLE = 0
+MODE_GROUP = 1
+MODE_AUTO = 2     # combat résolu d'office (Combat.auto_resolve), enregistré en un tour
+
+# Acteurs: 0 = joueur, i + 1 = i-ème ennemi du combat
+PLAYER_ACTOR = 0
+
+# Codes d'événements
+ACTION_ATTACK = 1
+ACTION_DEFEND = 2
+ACTION_SKILL = 3
+ACTION_ITEM = 4
+ACTION_ESCAPE = 5
+ACTION_ANALYZE = 6
+ACTION_ENEMY_ATTACK = 10
+ACTION_ENEMY_SKILL = 11
+ACTION_ENEMY_HEAL = 12
+ACTION_STUNNED = 13
+RNG_INT = 20      # valeur tirée par randint
+RNG_FLOAT = 21    # valeur tirée par random
+RNG_CHOICE = 22   # indice choisi par choice
+HP_PLAYER = 30    # variation des PV du joueur pendant le tour
+HP_ENEMY = 31     # variation des PV de l'ennemi ciblé (ou agissant) pendant le tour
+END = 40          # fin du combat, valeur: RESULT_*
+
+RNG_CODES = (RNG_INT, RNG_FLOAT, RNG_CHOICE)
+
+RESULT_ENEMY = 0
+RESULT_PLAYER = 1
+RESULT_FLED = 2
+RESULT_UNDECIDED = 3  # limite de tours atteinte (combat résolu d'office)
+
+# Fichiers de session (CombatRecorder): combats écrits par lots, taille et nombre de fichiers bornés
+FLUSH_EVERY = 32
+MAX_SESSION_BYTES = 4 * 1024 * 1024
+MAX_SESSION_FILES = 10
+
+EVENT_NAMES = {
+    ACTION_ATTACK: "attack", ACTION_DEFEND: "defend", ACTION_SKILL: "skill", ACTION_ITEM: "item",
+    ACTION_ESCAPE: "escape", ACTION_ANALYZE: "analyze", ACTION_ENEMY_ATTACK: "enemy_attack",
+    ACTION_ENEMY_SKILL: "enemy_skill", ACTION_ENEMY_HEAL: "enemy_heal", ACTION_STUNNED: "stunned",
+    RNG_INT: "rng_int", RNG_FLOAT: "rng_float", RNG_CHOICE: "rng_choice",
+    HP_PLAYER: "hp_player", HP_ENEMY: "hp_enemy", END: "end",
+}
+
+# magic, version, mode, nombre d'ennemis, joueur (hp, max_hp, attack, defense, speed),
+# nombre de titres, nombre d'effets
+_HEADER = struct.Struct("<4sBBH5dHH")
+_ENEMY = struct.Struct("<6d")         # level, hp, attack, defense, speed, heal_power
+_EFFECT = struct.Struct("<di")        # valeur, durée restante
+_COUNT = struct.Struct("<I")
+_STRING = struct.Struct("<H")
+
+PLAYER_STATS = ("hp", "max_hp", "attack", "defense", "speed")
+ENEMY_STATS = ("level", "hp", "attack", "defense", "speed", "heal_power")
+# Colonnes du flux d'événements (typecodes array)
+_COLUMNS = (("turns", "I"), ("actors", "H"), ("codes", "B"), ("values", "d"))
+
+
+class ReplayFormatError(ValueError):
+    """The data is not a valid combat recording."""
+
+
+class CombatLog:
+    """
+    One recorded fight: the starting state (header) and the event stream, stored
+    column-wise in arrays (15 bytes per event).
+    While recording, each event is appended to a flat list as a (code, value)
+    pair, and each turn adds one (position, turn, actor) mark. The turn and actor
+    columns are rebuilt from the marks when the events are packed into the arrays
+    on first read. Missing stats are stored as NaN and come back as None.
+    """
+    def __init__(self, mode=MODE_SINGLE, player=None, titles=(), effects=(), enemies=(), enemy_sources=None):
+        self.mode = mode
+        self.player = player or {}     # stat -> valeur (PLAYER_STATS)
+        self.titles = list(titles)
+        self.effects = list(effects)   # [(stat, valeur, durée restante)]
+        self._enemies = list(enemies)  # [(id, {stat: valeur})] (ENEMY_STATS)
+        # Ennemis du combat en cours: leurs statistiques (hors PV courants) ne changent pas
+        # pendant le combat, on ne les lit qu'au premier accès à `enemies`
+        self._enemy_sources = enemy_sources
+        self.turns = array("I")
+        self.actors = array("H")
+        self.codes = array("B")
+        self.values = array("d")
+        self._pending = []  # code, value, code, value... pas encore rangés dans les colonnes
+        self._marks = [(0, 0, PLAYER_ACTOR)]  # (position dans _pending, tour, acteur) à chaque début de tour
+        self.record = self._pending.extend  # record((code, value)): ajoute un événement au tour courant
+
+    @property
+    def enemies(self):
+        if self._enemy_sources is not None:
+            self._enemies = [(enemy.get('id', ''), {stat: enemy.get(stat) for stat in ENEMY_STATS})
+                             for enemy in self._enemy_sources]
+            self._enemy_sources = None
+        return self._enemies
+
+    @property
+    def turn(self):
+        """Tour courant de l'enregistrement."""
+        return self._marks[-1][1]
+
+    @property
+    def actor(self):
+        """Acteur du tour courant."""
+        return self._marks[-1][2]
+
+    def start_turn(self, turn, actor):
+        """Les événements suivants appartiennent à ce tour et à cet acteur."""
+        self._marks.append((len(self._pending), turn, actor))
+
+    def event(self, code, value=0):
+        """Ajoute un événement au tour et à l'acteur courants."""
+        self._pending.extend((code, value))
+
+    def pack(self):
+        """Range les événements en attente dans les colonnes."""
+        pending = self._pending
+        if not pending:
+            return
+        marks = self._marks
+        turns = []
+        actors = []
+        end = len(pending)
+        for start, turn, actor in reversed(marks):
+            count = (end - start) >> 1
+            turns += [turn] * count
+            actors += [actor] * count
+            end = start
+        turns.reverse()
+        actors.reverse()
+        # array(typecode, list) est bien plus rapide que array.extend(list)
+        self.turns += array("I", turns)
+        self.actors += array("H", actors)
+        self.codes.frombytes(bytes(pending[0::2]))
+        self.values += array("d", pending[1::2])
+        pending.clear()
+        # En place: CombatRecorder garde une référence aux listes du combat en cours
+        marks[:] = [(0, marks[-1][1], marks[-1][2])]
+
+    def events(self):
+        """Itère sur les événements (turn, actor, code, value)."""
+        self.pack()
+        return zip(self.turns, self.actors, self.codes, self.values)
+
+    def rng_draws(self):
+        """Tirages aléatoires enregistrés, dans l'ordre: [(code, valeur)]."""
+        self.pack()
+        return [(code, value) for code, value in zip(self.codes, self.values) if code in RNG_CODES]
+
+    @property
+    def result(self):
+        """RESULT_* du combat, ou None s'il n'est pas terminé."""
+        self.pack()
+        for code, value in zip(reversed(self.codes), reversed(self.values)):
+            if code == END:
+                return int(value)
+        return None
+
+    def __len__(self):
+        return len(self.codes) + len(self._pending) // 2
+
+    # --- Sérialisation ---
+
+    def to_bytes(self):
+        self.pack()
+        player = self.player
+        parts = [_HEADER.pack(MAGIC, VERSION, self.mode, len(self.enemies),
+                              *[_stat(player.get(stat)) for stat in PLAYER_STATS],
+                              len(self.titles), len(self.effects))]
+        parts.extend(_pack_string(title) for title in self.titles)
+        for stat, value, duration in self.effects:
+            parts.append(_pack_string(stat))
+            parts.append(_EFFECT.pack(value, duration))
+        for enemy_id, stats in self.enemies:
+            parts.append(_pack_string(enemy_id))
+            parts.append(_ENEMY.pack(*(_stat(stats.get(stat)) for stat in ENEMY_STATS)))
+        parts.append(_COUNT.pack(len(self.codes)))
+        for name, _typecode in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != "little":
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Premier combat enregistré dans data."""
+        return cls._read(memoryview(data), 0)[0]
+
+    @classmethod
+    def iter_bytes(cls, data):
+        """Tous les combats d'un flux (un fichier de session en contient plusieurs à la suite)."""
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            log, offset = cls._read(view, offset)
+            yield log
+
+    @classmethod
+    def _read(cls, view, offset):
+        """Lit un combat à partir de offset; renvoie (log, offset suivant)."""
+        try:
+            fields = _HEADER.unpack_from(view, offset)
+            magic, version, mode, enemy_count = fields[:4]
+            if magic != MAGIC or version != VERSION:
+                raise ReplayFormatError("not a FateQuest combat recording (or unsupported version)")
+            offset += _HEADER.size
+            player = dict(zip(PLAYER_STATS, map(_unstat, fields[4:9])))
+            title_count, effect_count = fields[9:]
+            titles = []
+            for _ in range(title_count):
+                title, offset = _unpack_string(view, offset)
+                titles.append(title)
+            effects = []
+            for _ in range(effect_count):
+                stat, offset = _unpack_string(view, offset)
+                value, duration = _EFFECT.unpack_from(view, offset)
+                offset += _EFFECT.size
+                effects.append((stat, value, duration))
+            enemies = []
+            for _ in range(enemy_count):
+                enemy_id, offset = _unpack_string(view, offset)
+                stats = dict(zip(ENEMY_STATS, map(_unstat, _ENEMY.unpack_from(view, offset))))
+                offset += _ENEMY.size
+                enemies.append((enemy_id, stats))
+            (count,) = _COUNT.unpack_from(view, offset)
+            offset += _COUNT.size
+            log = cls(mode, player, titles, effects, enemies)
+            for name, typecode in _COLUMNS:
+                column = array(typecode)
+                size = column.itemsize * count
+                if offset + size > len(view):
+                    raise ReplayFormatError("truncated event stream")
+                column.frombytes(view[offset:offset + size])
+                if sys.byteorder != "little":
+                    column.byteswap()
+                setattr(log, name, column)
+                offset += size
+        except struct.error as e:
+            raise ReplayFormatError(f"truncated recording: {e}") from e
+        return log, offset
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def load_all(cls, path):
+        """Tous les combats d'un fichier (voir CombatRecorder)."""
+        with open(path, 'rb') as f:
+            return list(cls.iter_bytes(f.read()))
+
+
+def _stat(value):
+    return math.nan if value is None else float(value)
+
+
+def _unstat(value):
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def _pack_string(text):
+    data = str(text).encode("utf-8")
+    return _STRING.pack(len(data)) + data
+
+
+def _unpack_string(view, offset):
+    (size,) = _STRING.unpack_from(view, offset)
+    offset += _STRING.size
+    if offset + size > len(view):
+        raise ReplayFormatError("truncated string")
+    return bytes(view[offset:offset + size]).decode("utf-8"), offset + size
+
+
+class RecordingRandom:
+    """
+    Wraps the combat RNG and logs every draw used by the combat rules
+    (randint, random, choice). Draws the same numbers as the wrapped generator.
+    """
+    def __init__(self, rng, log):
+        self._rng = rng
+        self._log = log
+        self._extend = log.record
+        self._randint = rng.randint
+        self._random = rng.random
+        self._randrange = rng.randrange
+
+    def randint(self, a, b):
+        value = self._randint(a, b)
+        self._extend((RNG_INT, value))
+        return value
+
+    def random(self):
+        value = self._random()
+        self._extend((RNG_FLOAT, value))
+        return value
+
+    def choice(self, seq):
+        # randrange(n) consomme le générateur exactement comme choice()
+        index = self._randrange(len(seq))
+        self._extend((RNG_CHOICE, index))
+        return seq[index]
+
+    def __getattr__(self, name):
+        return getattr(self._rng, name)
+
+
+class CombatRecorder:
+    """
+    Records the fights of a Combat (Combat(..., recorder=CombatRecorder(...))).
+    The last finished fight is kept in `last`. With a directory, finished fights
+    are also appended to a session file, <directory>/<date>.fqr. The fights are
+    written by batches of `flush_every` (and at exit). A session file that
+    reaches `max_bytes` is continued in a new one, and only the `max_files` most
+    recent .fqr files of the directory are kept.
+    """
+    def __init__(self, directory=None, flush_every=FLUSH_EVERY, max_bytes=MAX_SESSION_BYTES, max_files=MAX_SESSION_FILES):
+        self.directory = directory
+        self.flush_every = flush_every
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.path = None   # fichier de session courant, créé au premier écrit
+        self.log = None    # combat en cours
+        self.last = None   # dernier combat terminé
+        self.record = None # log.record du combat en cours (Combat._record), sinon None
+        self._file = None
+        self._written = 0  # octets écrits dans le fichier courant
+        self._unwritten = []  # combats terminés pas encore écrits
+        self._rng = None
+        self._marks = None
+        self._pending = None
+        self._player_hp = 0
+        self._enemy_hp = 0
+
+    @property
+    def active(self):
+        return self.log is not None
+
+    def begin(self, combat, mode, enemies):
+        """
+        Start recording from the current state of combat (before title effects)
+        and return the RNG the fight must draw from.
+        """
+        player = combat.player
+        speed = getattr(player, 'speed', None)
+        if speed is None:
+            speed = getattr(player, 'stats', {}).get('dex', 10)
+        player_stats = {
+            'hp': player.hp, 'max_hp': player.max_hp, 'speed': speed,
+            'attack': getattr(player, 'attack', None), 'defense': getattr(player, 'defense', None),
+        }
+        scheduler = player.status_effects
+        effects = [(e.stat, e.amount, scheduler.remaining(e)) for e in scheduler] if scheduler else ()
+        self.log = log = CombatLog(mode, player_stats, getattr(player, 'titles', ()), effects,
+                                   enemy_sources=list(enemies))
+        self.record = log.record
+        self._marks = log._marks
+        self._pending = log._pending
+        self._rng = combat.rng
+        return RecordingRandom(combat.rng, log)
+
+    def start_turn(self, turn, actor, player_hp, enemy_hp):
+        # Même chose que log.start_turn, sans appel intermédiaire (une fois par tour)
+        self._marks.append((len(self._pending), turn, actor))
+        self._player_hp = player_hp
+        self._enemy_hp = enemy_hp
+
+    def action(self, code):
+        self.log.record((code, 0))
+
+    def end_turn(self, player_hp, enemy_hp):
+        log = self.log
+        if log is None:
+            return  # combat terminé pendant le tour (fuite)
+        if player_hp != self._player_hp:
+            log.record((HP_PLAYER, player_hp - self._player_hp))
+        if enemy_hp != self._enemy_hp:
+            log.record((HP_ENEMY, enemy_hp - self._enemy_hp))
+
+    def finish(self, result):
+        """Termine l'enregistrement (RESULT_*), l'écrit si besoin et renvoie le RNG d'origine."""
+        log = self.log
+        log.event(END, result)
+        self.log = None
+        self.record = self._marks = self._pending = None
+        self.last = log
+        if self.directory:
+            self._unwritten.append(log)
+            if len(self._unwritten) >= self.flush_every:
+                self.flush()
+        rng, self._rng = self._rng, None
+        return rng
+
+    def flush(self):
+        """Écrit les combats terminés en attente dans le fichier de session."""
+        if not self._unwritten:
+            return
+        data = b"".join(log.to_bytes() for log in self._unwritten)
+        self._unwritten.clear()
+        if self._file is None or self._written >= self.max_bytes:
+            self._open_session()
+        self._file.write(data)
+        self._written += len(data)
+
+    def _open_session(self):
+        """Ouvre un nouveau fichier de session et supprime les plus anciens au-delà de max_files."""
+        if self._file is not None:
+            self._file.close()
+        else:
+            atexit.register(self.close)
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+        path = os.path.join(self.directory, f"{stamp}.fqr")
+        number = 1
+        while os.path.exists(path):
+            number += 1
+            path = os.path.join(self.directory, f"{stamp}_{number}.fqr")
+        self.path = path
+        self._file = open(path, 'ab')
+        self._written = 0
+        if self.max_files:
+            sessions = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(".fqr")),
+                              key=lambda entry: entry.stat().st_mtime)
+            for entry in sessions[:-self.max_files]:
+                if entry.path != path:
+                    os.remove(entry.path)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
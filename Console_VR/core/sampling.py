@@ -0,0 +1,92 @@
+"""
+sampling.py - Weighted random sampling helpers for FateQuest.
+Alias tables (Vose) give O(1) draws from a fixed discrete distribution.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: les tirages groupés se font alors en Python
+    np = None
+
+
+class AliasTable:
+    """
+    Discrete distribution over range(len(weights)), sampled in constant time.
+    Built once in O(n) (Vose's alias method); weights need not be normalized.
+    """
+    __slots__ = ("prob", "alias", "size", "_arrays")
+
+    def __init__(self, weights):
+        weights = [float(w) for w in weights]
+        total = sum(weights)
+        if not weights or total <= 0:
+            raise ValueError("AliasTable: il faut au moins un poids strictement positif")
+        size = len(weights)
+        scaled = [w * size / total for w in weights]
+        prob = [0.0] * size
+        alias = [0] * size
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            prob[lo] = scaled[lo]
+            alias[lo] = hi
+            scaled[hi] = scaled[hi] + scaled[lo] - 1.0
+            if scaled[hi] < 1.0:
+                small.append(hi)
+            else:
+                large.append(hi)
+        # Restes (erreurs d'arrondi): probabilité 1
+        for i in large + small:
+            prob[i] = 1.0
+            alias[i] = i
+        self.prob = prob
+        self.alias = alias
+        self.size = size
+        self._arrays = None
+
+    def sample(self, rng=random):
+        """Tire un indice selon les poids (rng: module random ou random.Random)."""
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample_many(self, count, np_rng=None, rng=random):
+        """
+        Tire count indices d'un coup. Avec NumPy, renvoie un tableau d'entiers calculé
+        en une passe (np_rng: numpy.random.Generator); sinon une liste.
+        """
+        if np is None:
+            return [self.sample(rng) for _ in range(count)]
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.prob), np.asarray(self.alias, dtype=np.intp))
+        prob, alias = self._arrays
+        np_rng = np_rng if np_rng is not None else np.random.default_rng()
+        columns = np_rng.integers(0, self.size, count)
+        keep = np_rng.random(count) < prob[columns]
+        return np.where(keep, columns, alias[columns])
+
+    def __len__(self):
+        return self.size
+
+
+class WeightedChoice:
+    """
+    Alias table over a fixed sequence of values: choice() returns one of them.
+    """
+    __slots__ = ("values", "table")
+
+    def __init__(self, values, weights):
+        self.values = tuple(values)
+        if len(self.values) != len(weights):
+            raise ValueError("WeightedChoice: autant de poids que de valeurs")
+        self.table = AliasTable(weights)
+
+    def choice(self, rng=random):
+        """Tire une valeur selon les poids."""
+        return self.values[self.table.sample(rng)]
+
+    def __len__(self):
+        return len(self.values)
@@ -0,0 +1,224 @@
+"""
+search.py - Accent-insensitive fuzzy text search for FateQuest.
+Names and descriptions are folded (case, accents, spacing) and cut into
+trigrams; a TrigramIndex maps each trigram to the entries containing it, so a
+query only touches the entries sharing at least one trigram with it.
+best_match() resolves a typed name against a handful of candidates (NPCs,
+objects, inventory) with the same scoring.
+"""
+
+import heapq
+import math
+import unicodedata
+from collections import Counter
+from itertools import islice
+from core.sampling import np
+
+# Score minimal (coefficient de Dice sur les trigrammes) pour accepter un nom approché
+FUZZY_THRESHOLD = 0.45
+# Part minimale des trigrammes de la requête présents dans un résultat de recherche
+SEARCH_THRESHOLD = 0.5
+# Nombre d'entrées à partir duquel search() compte les trigrammes avec NumPy (s'il est installé)
+NUMPY_MIN_ENTRIES = 4096
+
+
+def fold(text):
+    """Forme de comparaison: minuscules, sans accents, espaces normalisés ("Élixir  de Force" -> "elixir de force")."""
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.split())
+
+
+def trigrams(text):
+    """Ensemble des trigrammes d'un texte déjà replié (bords marqués par des espaces)."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over (key, text) entries.
+    search(query): entries containing most of the query trigrams, ranked by the
+    share of query trigrams found, then by similarity (shorter texts first).
+    best(query): the single closest entry by Dice similarity, or None.
+    Large indexes count trigrams with NumPy when it is installed; otherwise only
+    the rarest query trigrams are scanned and the common ones are checked on the
+    candidates they produce.
+    """
+    def __init__(self, entries):
+        self.keys = []
+        self.texts = []
+        self.sizes = []       # nombre de trigrammes de chaque entrée
+        self.postings = {}    # trigramme -> liste des numéros d'entrée
+        self.exact = {}       # texte replié -> numéro de la première entrée
+        self._sets = {}       # trigramme fréquent -> ensemble de ses entrées (créé au premier test)
+        for key, text in entries:
+            folded = fold(text)
+            doc = len(self.keys)
+            grams = trigrams(folded)
+            self.keys.append(key)
+            self.texts.append(folded)
+            self.sizes.append(len(grams))
+            self.exact.setdefault(folded, doc)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(doc)
+        # Entrées de la plus courte à la plus longue (ordre des résultats à score égal)
+        self.by_size = sorted(range(len(self.keys)), key=self.sizes.__getitem__)
+        # Grand index avec NumPy: trigramme -> numpy.array des entrées (créé au premier usage)
+        self._arrays = None
+        if np is not None and len(self.keys) >= NUMPY_MIN_ENTRIES:
+            self._arrays = {}
+            self._size_array = np.array(self.sizes, dtype=np.int64)
+
+    def _posting_set(self, gram):
+        docs = self._sets.get(gram)
+        if docs is None:
+            docs = self._sets[gram] = frozenset(self.postings[gram])
+        return docs
+
+    def _hits(self, grams, needed=1):
+        """
+        Nombre de trigrammes communs avec chaque entrée qui en partage au moins needed
+        (les autres peuvent apparaître avec un compte inférieur).
+        Une telle entrée contient forcément un des len(grams) - needed + 1 trigrammes
+        les plus rares: seules leurs listes sont parcourues (comptage en C par Counter).
+        Les trigrammes plus fréquents (" de", "on "...) sont seulement testés sur ces
+        candidats, par intersection avec l'ensemble de leurs entrées.
+        """
+        postings = self.postings
+        grams = sorted((gram for gram in grams if gram in postings), key=lambda gram: len(postings[gram]))
+        split = len(grams) - needed + 1
+        hits = Counter()
+        for gram in grams[:split]:
+            hits.update(postings[gram])
+        for gram in grams[split:]:
+            if len(postings[gram]) <= len(hits):
+                hits.update(postings[gram])
+            else:
+                hits.update(self._posting_set(gram).intersection(hits))
+        return hits
+
+    def _containing_all(self, grams):
+        """Ensemble des entrées contenant tous les trigrammes (intersections en C, du plus rare au plus fréquent)."""
+        postings = self.postings
+        if any(gram not in postings for gram in grams):
+            return set()
+        grams = sorted(grams, key=lambda gram: len(postings[gram]))
+        docs = set(postings[grams[0]])
+        for gram in grams[1:]:
+            if not docs:
+                break
+            docs.intersection_update(self._posting_set(gram) if len(postings[gram]) > len(docs) else postings[gram])
+        return docs
+
+    def _shortest(self, docs, limit):
+        """Les limit entrées de docs les plus courtes (puis de plus petit numéro)."""
+        if len(docs) * 16 >= len(self.keys):
+            # Beaucoup d'entrées: le parcours de by_size (en C) s'arrête vite
+            return list(islice(filter(docs.__contains__, self.by_size), limit))
+        sizes = self.sizes
+        return [doc for _size, doc in heapq.nsmallest(limit, ((sizes[doc], doc) for doc in docs))]
+
+    def _ranked_array(self, grams, needed, limit):
+        """
+        search() sur un grand index avec NumPy: comptage de toutes les listes par
+        bincount, puis tri d'une clé entière (trigrammes manquants, taille, numéro).
+        """
+        arrays = self._arrays
+        postings = self.postings
+        lists = []
+        for gram in grams:
+            docs = arrays.get(gram)
+            if docs is None:
+                if gram not in postings:
+                    continue
+                docs = arrays[gram] = np.array(postings[gram], dtype=np.int64)
+            lists.append(docs)
+        if not lists:
+            return []
+        entries = len(self.keys)
+        counts = np.bincount(np.concatenate(lists), minlength=entries)
+        docs = np.flatnonzero(counts >= needed)
+        total = len(grams)
+        span = (int(self._size_array.max()) + 1) * entries
+        order = (total - counts[docs]) * span + self._size_array[docs] * entries + docs
+        if limit is not None and order.size > limit:
+            order = np.partition(order, limit - 1)[:limit]
+        order.sort()
+        keys = self.keys
+        return [(keys[doc], (total - missing) / total)
+                for missing, doc in zip((order // span).tolist(), (order % entries).tolist())]
+
+    def search(self, query, limit=None, threshold=SEARCH_THRESHOLD):
+        """Liste [(key, score)] triée, score = part des trigrammes de la requête trouvés."""
+        folded = fold(query)
+        if not folded:
+            return []
+        grams = trigrams(folded)
+        if self._arrays is not None:
+            return self._ranked_array(grams, max(math.ceil(threshold * len(grams)), 1), limit)
+        keys = self.keys
+        if limit is not None:
+            # Si au moins limit entrées contiennent toute la requête, ce sont les
+            # premiers résultats: inutile de compter les correspondances partielles
+            complete = self._containing_all(grams)
+            if len(complete) >= limit:
+                return [(keys[doc], 1.0) for doc in self._shortest(complete, limit)]
+        total = len(grams)
+        needed = max(math.ceil(threshold * total), 1)
+        sizes = self.sizes
+        # Ordre (part trouvée, similarité de Dice, numéro): à nombre de trigrammes
+        # communs égal, la similarité ne dépend que de la taille de l'entrée
+        ranked = [(-count, sizes[doc], doc) for doc, count in self._hits(grams, needed).items() if count >= needed]
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        return [(keys[doc], -count / total) for count, _size, doc in ranked]
+
+    def best(self, query, threshold=FUZZY_THRESHOLD):
+        """Clé de l'entrée la plus proche (correspondance exacte d'abord), ou None."""
+        folded = fold(query)
+        if not folded:
+            return None
+        doc = self.exact.get(folded)
+        if doc is not None:
+            return self.keys[doc]
+        grams = trigrams(folded)
+        total = len(grams)
+        sizes = self.sizes
+        best_doc, best_score = None, threshold
+        for doc, count in self._hits(grams).items():
+            score = 2 * count / (total + sizes[doc])
+            if score > best_score or (score == best_score and best_doc is not None and doc < best_doc):
+                best_doc, best_score = doc, score
+        return self.keys[best_doc] if best_doc is not None else None
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def best_match(query, candidates, key=None, threshold=FUZZY_THRESHOLD):
+    """
+    Candidat dont le nom correspond le mieux à query (insensible à la casse et aux
+    accents, tolérant aux fautes de frappe), ou None.
+    key: nom d'un candidat (par défaut candidate["name"]).
+    """
+    key = key or (lambda candidate: candidate["name"])
+    folded = fold(query)
+    if not folded:
+        return None
+    scored = []
+    for candidate in candidates:
+        name = fold(key(candidate))
+        if name == folded:
+            return candidate
+        scored.append((name, candidate))
+    grams = trigrams(folded)
+    best, best_score = None, threshold
+    for name, candidate in scored:
+        other = trigrams(name)
+        score = 2 * len(grams & other) / (len(grams) + len(other))
+        if score > best_score:
+            best, best_score = candidate, score
+    return best
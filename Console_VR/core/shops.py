@@ -0,0 +1,137 @@
+"""
+shops.py - Shop stock management for FateQuest.
+The ShopService materializes each shop's stock (items resolved, prices computed)
+when it is first opened and keeps it until the shop restocks on the world clock,
+so open_shop and buy_item always see the same articles at the same prices.
+"""
+
+from core.messages import emit
+
+# Jours de jeu entre deux réassorts si la boutique ne précise pas 'restock_days'
+DEFAULT_RESTOCK_DAYS = 1
+# Nombre d'articles tirés pour une boutique sans inventaire fixe
+RANDOM_STOCK_SIZE = 5
+
+
+class ShopEntry:
+    """One article on sale: the item template, its cached price and the copies left (None: unlimited)."""
+    __slots__ = ("item", "price", "quantity")
+
+    def __init__(self, item, price, quantity=None):
+        self.item = item
+        self.price = price
+        self.quantity = quantity
+
+    @property
+    def sold_out(self):
+        return self.quantity is not None and self.quantity <= 0
+
+    def __repr__(self):
+        return f"<ShopEntry {self.item.get('id')} {self.price}g x{self.quantity}>"
+
+
+class ShopService:
+    """
+    Materialized shop inventories.
+    - shop_for_npc(npc): O(1) (NPC id -> shop id table built once)
+    - stock(shop_id): the cached entries, rebuilt when the restock day is reached
+    - buy(shop_id, index, player): takes one copy and charges the cached price
+    clock: callable returning the current game day (World.day_count).
+    level: callable returning the level used for shops with a random stock.
+    """
+    def __init__(self, item_manager, shops, npcs=None, clock=None, level=None):
+        self.item_manager = item_manager
+        self.shops = shops
+        self.clock = clock or (lambda: 1)
+        self.level = level or (lambda: 1)
+        self.by_npc = {}
+        for npc_id, npc in (npcs or {}).items():
+            shop_id = npc.get("dialogue", {}).get("shop")
+            if shop_id in shops:
+                self.by_npc[npc_id] = shop_id
+        for shop_id, shop in shops.items():
+            owner = shop.get("owner") or shop.get("npc")
+            if owner:
+                self.by_npc.setdefault(owner, shop_id)
+        self._stock = {}         # shop id -> [ShopEntry]
+        self._restock_day = {}   # shop id -> jour du prochain réassort
+
+    # --- Recherche ---
+
+    def shop_id_for_npc(self, npc):
+        """Id de la boutique tenue par un PNJ (dict ou id), ou None."""
+        if isinstance(npc, dict):
+            shop_id = self.by_npc.get(npc.get("id"))
+            if shop_id is None:
+                # PNJ créés en cours de partie: pas encore dans la table
+                shop_id = npc.get("dialogue", {}).get("shop")
+            return shop_id if shop_id in self.shops else None
+        return self.by_npc.get(npc)
+
+    def shop_for_npc(self, npc):
+        """Données de la boutique tenue par un PNJ, ou None."""
+        shop_id = self.shop_id_for_npc(npc)
+        return self.shops.get(shop_id) if shop_id is not None else None
+
+    # --- Stock ---
+
+    def stock(self, shop_id):
+        """Articles de la boutique (réassortis si le jour de réassort est atteint)."""
+        entries = self._stock.get(shop_id)
+        if entries is None or self.clock() >= self._restock_day[shop_id]:
+            entries = self.restock(shop_id)
+        return entries
+
+    def restock(self, shop_id):
+        """Reconstruit le stock de la boutique et programme le réassort suivant."""
+        shop = self.shops[shop_id]
+        entries = []
+        inventory = shop.get("inventory")
+        if inventory:
+            for entry in inventory:
+                item = self.item_manager.get_item(entry["id"])
+                if item is None:
+                    continue
+                price = entry.get("price", self.item_manager.get_item_value(item))
+                entries.append(ShopEntry(item, price, entry.get("quantity", entry.get("stock"))))
+        else:
+            # Boutique sans inventaire fixe: tirage selon le niveau, figé jusqu'au réassort
+            for _ in range(shop.get("size", RANDOM_STOCK_SIZE)):
+                item = self.item_manager.get_random_item(self.level())
+                if item:
+                    entries.append(ShopEntry(item, self.item_manager.get_item_value(item), 1))
+        self._stock[shop_id] = entries
+        self._restock_day[shop_id] = self.clock() + shop.get("restock_days", DEFAULT_RESTOCK_DAYS)
+        return entries
+
+    def restock_day(self, shop_id):
+        """Jour du prochain réassort (None si la boutique n'a jamais été ouverte)."""
+        return self._restock_day.get(shop_id)
+
+    # --- Transactions ---
+
+    def buy(self, shop_id, index, player):
+        """
+        Achète l'article numéro index (à partir de 1).
+        Renvoie l'entrée achetée, ou None (article invalide, épuisé ou or insuffisant).
+        """
+        entries = self.stock(shop_id)
+        if index < 1 or index > len(entries):
+            emit("Article invalide.", "red")
+            return None
+        entry = entries[index - 1]
+        if entry.sold_out:
+            emit(f"{entry.item['name']} est épuisé.", "red")
+            return None
+        if player.gold < entry.price:
+            emit(f"Vous n'avez pas assez d'or. (Vous avez {player.gold}, besoin de {entry.price})", "red")
+            return None
+        player.gold -= entry.price
+        if entry.quantity is not None:
+            entry.quantity -= 1
+        player.add_item(entry.item)
+        return entry
+
+    def sell_price(self, item):
+        """Prix de rachat d'un objet par une boutique."""
+        return self.item_manager.get_item_value(item, is_selling=True)
@@ -0,0 +1,210 @@
+"""
+simulation.py - Headless combat simulation for FateQuest.
+Runs fights with the Combat rules, without console output and with a seeded RNG,
+for balancing and regression checks.
+"""
+
+import random
+from typing import NamedTuple, Optional
+from core.combat import Combat
+from core.estimator import skill_power
+from core.monsters import MonsterInstance
+from core.effects import EffectScheduler
+
+
+class CombatOutcome(NamedTuple):
+    """
+    Compact result of a simulated fight.
+    winner: "player", "enemy", "fled" or None if the turn limit was reached.
+    """
+    winner: Optional[str]
+    turns: int
+    damage_dealt: int
+    damage_taken: int
+
+
+class ShadowPlayer:
+    """
+    Copy of the player fields read or written by the combat rules, so that
+    simulations never touch the real Player. attack/defense are only copied
+    if the player has them (the rules fall back to getattr defaults otherwise).
+    """
+    __slots__ = ("name", "hp", "max_hp", "titles", "skills", "defending", "status_effects", "attack", "defense")
+
+    def __init__(self, player):
+        self.name = getattr(player, 'name', "")
+        self.hp = player.hp
+        self.max_hp = player.max_hp
+        self.titles = list(getattr(player, 'titles', []))
+        self.skills = getattr(player, 'skills', {})
+        self.defending = False
+        effects = getattr(player, 'status_effects', None)
+        self.status_effects = EffectScheduler.from_list(effects.to_list()) if effects else EffectScheduler()
+        for stat in ("attack", "defense"):
+            if hasattr(player, stat):
+                setattr(self, stat, getattr(player, stat))
+
+
+# Règles de Combat réécrites en ligne par CombatSimulator._simulate_plain
+_PLAIN_RULES = ("_player_attack", "_enemy_turn", "_enemy_attack", "_enemy_use_skill", "_enemy_heal",
+                "_decide_enemy_action", "_check_enemy_can_act", "_update_status_effects", "_try_escape",
+                "_check_surprise_attack", "_player_stat", "_enemy_stat")
+
+
+class CombatSimulator(Combat):
+    """
+    Combat without output: the player auto-attacks (like start_combat) and may try
+    to escape below a HP ratio. Every roll goes through a random.Random seeded at
+    construction, so a given seed always replays the same fights.
+    Fights without any active effect (the usual case: auto-attacks never add one)
+    run through an inlined copy of the rules with the same draws, several times
+    faster than the general turn loop.
+    """
+    def __init__(self, player, monster_manager, seed=None, max_turns=500, flee_below=None, content=None):
+        super().__init__(player, monster_manager, None, None, rng=random.Random(seed),
+                         content=content or getattr(monster_manager, 'content', None))
+        self.source_player = player
+        self.max_turns = max_turns
+        self.flee_below = flee_below
+        # Raccourci désactivé si une sous-classe redéfinit une des règles
+        self._plain_rules = all(getattr(type(self), name) is getattr(CombatSimulator, name)
+                                for name in _PLAIN_RULES)
+
+    def _say(self, message):
+        """Aucune sortie en simulation."""
+        pass
+
+    def _display_combat_status(self):
+        """Pas de barres de vie en simulation."""
+        pass
+
+    def _prepare_enemy(self, enemy_template):
+        """
+        Copie plate (dict) de l'ennemi: la simulation ne modifie ni l'instance
+        ni le modèle, et l'accès aux champs reste un simple accès dict.
+        """
+        if isinstance(enemy_template, MonsterInstance):
+            enemy = enemy_template.to_dict()
+        elif isinstance(enemy_template, str):
+            enemy = dict(self.monster_manager.get_monster_by_id(enemy_template))
+        else:
+            enemy = dict(enemy_template)
+        enemy['current_hp'] = enemy.get('hp', 0)
+        enemy['status_effects'] = EffectScheduler()
+        return enemy
+
+    def simulate(self, enemy):
+        """
+        Run one fight against enemy (instance, template or id) and return a CombatOutcome.
+        """
+        self.player = player = ShadowPlayer(self.source_player)
+        self.enemy = enemy = self._prepare_enemy(enemy)
+        self.skill_history = []
+        self._reset_combos()
+        self.turn_count = 0
+        self.combat_active = True
+        self.player_turn = True
+        self._apply_title_effects()
+        self._calculate_history_modifier()
+        if self._check_surprise_attack():
+            self.player_turn = False
+        if self._plain_rules and not player.status_effects:
+            return self._simulate_plain(player, enemy)
+
+        damage_dealt = damage_taken = 0
+        winner = None
+        flee_below = self.flee_below
+        while self.combat_active and self.turn_count < self.max_turns:
+            self.turn_count += 1
+            enemy_hp = enemy['current_hp']
+            player_hp = player.hp
+            if self.player_turn:
+                if flee_below is not None and player.hp < player.max_hp * flee_below:
+                    self._try_escape()
+                    if not self.combat_active:
+                        winner = "fled"
+                        break
+                else:
+                    self._player_attack()
+            else:
+                self._enemy_turn()
+            self._update_status_effects()
+            if enemy['current_hp'] < enemy_hp:
+                damage_dealt += enemy_hp - enemy['current_hp']
+            if player.hp < player_hp:
+                damage_taken += player_hp - player.hp
+
+            if player.hp <= 0:
+                winner = "enemy"
+                break
+            if enemy['current_hp'] <= 0:
+                winner = "player"
+                break
+            self.player_turn = not self.player_turn
+        self.combat_active = False
+        return CombatOutcome(winner, self.turn_count, damage_dealt, damage_taken)
+
+    def _simulate_plain(self, player, enemy):
+        """
+        Suite de simulate() sans effet actif: mêmes règles et mêmes tirages que la
+        boucle générale (Combat._enemy_turn, _enemy_attack...), sur des variables locales.
+        """
+        rng = self.rng
+        random_ = rng.random
+        player_hp = player.hp
+        max_hp = player.max_hp
+        defense = getattr(player, 'defense', 0)
+        enemy_hp = enemy['current_hp']
+        enemy_max_hp = enemy['hp']
+        player_damage = max(getattr(player, 'attack', 1) - enemy.get('defense', 0), 1)
+        attack_damage = max(enemy.get('attack', 1) - defense, 1)
+        abilities = enemy.get('abilities', [])
+        skill_damage = [max(skill_power(ability) - defense, 1) for ability in abilities]
+        can_heal = 'heal' in abilities
+        heal_power = enemy.get('heal_power', 5)
+        flee_hp = max_hp * self.flee_below if self.flee_below is not None else None
+        player_turn = self.player_turn
+        max_turns = self.max_turns
+
+        turns = damage_dealt = damage_taken = 0
+        winner = None
+        while turns < max_turns:
+            turns += 1
+            if player_turn:
+                if flee_hp is not None and player_hp < flee_hp:
+                    if rng.randint(1, 100) <= 50:
+                        winner = "fled"
+                        break
+                else:
+                    enemy_hp -= player_damage
+                    damage_dealt += player_damage
+            else:
+                if can_heal and enemy_hp / enemy_max_hp < 0.3:
+                    enemy_hp = min(enemy_hp + heal_power, enemy_max_hp)
+                else:
+                    if random_() < 0.7 or not abilities:
+                        damage = attack_damage
+                    else:
+                        damage = rng.choice(skill_damage)
+                    player_hp -= damage
+                    damage_taken += damage
+            if player_hp <= 0:
+                winner = "enemy"
+                break
+            if enemy_hp <= 0:
+                winner = "player"
+                break
+            player_turn = not player_turn
+
+        player.hp = player_hp
+        enemy['current_hp'] = enemy_hp
+        self.turn_count = turns
+        self.combat_active = False
+        return CombatOutcome(winner, turns, damage_dealt, damage_taken)
+
+    def run(self, enemy, count):
+        """
+        Run count fights against the same enemy and return the list of outcomes.
+        """
+        simulate = self.simulate
+        return [simulate(enemy) for _ in range(count)]
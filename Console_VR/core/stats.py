@@ -0,0 +1,68 @@
+"""
+stats.py - Derived player stats for FateQuest.
+The StatSheet materializes the total of every stat (base + equipment + active
+effects) once; reads are dict lookups until equipment, level, class or effects
+change.
+"""
+
+from core.inventory import item_attr
+from core.items import set_bonuses
+
+
+def equipment_bonuses(item):
+    """Bonus de statistiques d'un objet équipé ('stat_bonuses', sinon 'stats' des données)."""
+    return item_attr(item, 'stat_bonuses') or item_attr(item, 'stats') or {}
+
+
+class StatSheet:
+    """
+    Cached stat totals of a player.
+    invalidate() is called by the player when base stats or equipment change
+    (equip/unequip, level up, class upgrade, load); effect changes are detected
+    through the EffectScheduler version, so buffs and expirations need no call.
+    """
+    def __init__(self, player):
+        self.player = player
+        self._totals = None
+        self._set_bonuses = {}
+        self._effects = None  # ordonnanceur et version des effets pris en compte
+        self._effects_version = -1
+
+    def invalidate(self):
+        """Les totaux seront recalculés à la prochaine lecture."""
+        self._totals = None
+
+    def _current(self):
+        effects = self.player.status_effects
+        if self._totals is None or effects is not self._effects or effects.version != self._effects_version:
+            self._rebuild(effects)
+        return self._totals
+
+    def _rebuild(self, effects):
+        player = self.player
+        totals = dict(player.stats)
+        equipped = [item for item in player.equipment.values() if item]
+        for item in equipped:
+            for stat, value in equipment_bonuses(item).items():
+                if isinstance(value, (int, float)):
+                    totals[stat] = totals.get(stat, 0) + value
+        for effect in effects:
+            totals[effect.stat] = totals.get(effect.stat, 0) + effect.amount
+        self._set_bonuses = set_bonuses([item for item in equipped if hasattr(item, 'get')])
+        self._totals = totals
+        self._effects = effects
+        self._effects_version = effects.version
+
+    def get(self, stat):
+        """Total d'une statistique (0 si le joueur ne l'a pas)."""
+        return self._current().get(stat, 0)
+
+    def totals(self):
+        """Copie de tous les totaux."""
+        return dict(self._current())
+
+    @property
+    def set_bonuses(self):
+        """Bonus de panoplie des objets équipés (voir items.set_bonuses)."""
+        self._current()
+        return self._set_bonuses
@@ -0,0 +1 @@
+# Outils hors jeu (équilibrage, analyse)
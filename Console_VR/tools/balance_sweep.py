@@ -0,0 +1,169 @@
+"""
+balance_sweep.py - Class x monster x level balance sweep for FateQuest.
+Runs headless fights (CombatSimulator) for every base class against every monster
+over a level range, spread over a process pool, and writes win rates and mean
+turns as a CSV (one row per cell) or an NPZ matrix.
+
+Usage (depuis Console_VR/):
+    python -m tools.balance_sweep --levels 1-20 --fights 200 --output sweep.csv
+"""
+
+import sys
+import csv
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from core.content import ContentRegistry, DEFAULT_DATA_DIR
+from core.messages import muted
+from core.monsters import MonsterManager
+from core.player import Player
+from core.simulation import CombatSimulator
+from core.sampling import np
+
+# État propre à chaque processus ouvrier (chargé une fois par _init_worker)
+_worker = {}
+
+
+def _init_worker(data_dir):
+    """Charge le contenu et les modèles de monstres une fois par processus."""
+    with muted():
+        _worker["monsters"] = MonsterManager(data_dir)
+    _worker["data_dir"] = data_dir
+
+
+def make_player(class_id, level, data_dir):
+    """Joueur de la classe donnée, monté jusqu'au niveau demandé (messages ignorés)."""
+    with muted():
+        player = Player("Sweep", class_id, data_dir=data_dir)
+        while player.level < level:
+            player.level_up()
+    player.max_hp = max(player.max_hp, player.hp)
+    return player
+
+
+def sweep_cell(task):
+    """
+    One (class, level) cell against every monster: returns
+    (class_index, level_index, win rates, mean turns), one value per monster.
+    """
+    class_index, class_id, level_index, level, monster_ids, fights, seed = task
+    monster_manager = _worker["monsters"]
+    player = make_player(class_id, level, _worker["data_dir"])
+    # Graine dérivée de la cellule: le résultat ne dépend pas de l'ordre d'exécution
+    simulator = CombatSimulator(player, monster_manager, seed=f"{seed}:{class_id}:{level}")
+    win_rates = []
+    mean_turns = []
+    for monster_id in monster_ids:
+        enemy = monster_manager.get_enemy(monster_id, level=level)
+        outcomes = simulator.run(enemy, fights)
+        win_rates.append(sum(1 for o in outcomes if o.winner == "player") / fights)
+        mean_turns.append(sum(o.turns for o in outcomes) / fights)
+    return class_index, level_index, win_rates, mean_turns
+
+
+def parse_levels(text):
+    """'1-20' -> [1..20], '1,5,10' -> [1, 5, 10]."""
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            start, end = part.split("-", 1)
+            levels.extend(range(int(start), int(end) + 1))
+        elif part.strip():
+            levels.append(int(part))
+    return levels
+
+
+def run_sweep(class_ids, monster_ids, levels, fights=100, workers=None, seed=0, data_dir=DEFAULT_DATA_DIR, progress=None):
+    """
+    Run the sweep and return (win_rate, mean_turns) as nested lists indexed
+    [class][monster][level].
+    """
+    shape = (len(class_ids), len(monster_ids), len(levels))
+    win_rate = [[[0.0] * shape[2] for _ in range(shape[1])] for _ in range(shape[0])]
+    mean_turns = [[[0.0] * shape[2] for _ in range(shape[1])] for _ in range(shape[0])]
+    tasks = [
+        (ci, class_id, li, level, monster_ids, fights, seed)
+        for ci, class_id in enumerate(class_ids)
+        for li, level in enumerate(levels)
+    ]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        # Une tâche = une cellule (classe, niveau) contre tous les monstres
+        for done, (ci, li, rates, turns) in enumerate(pool.map(sweep_cell, tasks), 1):
+            for mi in range(shape[1]):
+                win_rate[ci][mi][li] = rates[mi]
+                mean_turns[ci][mi][li] = turns[mi]
+            if progress:
+                progress(done, len(tasks))
+    return win_rate, mean_turns
+
+
+def write_csv(path, class_ids, monster_ids, levels, win_rate, mean_turns):
+    """Une ligne par cellule: class, monster, level, win_rate, mean_turns."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["class", "monster", "level", "win_rate", "mean_turns"])
+        for ci, class_id in enumerate(class_ids):
+            for mi, monster_id in enumerate(monster_ids):
+                for li, level in enumerate(levels):
+                    writer.writerow([class_id, monster_id, level,
+                                     f"{win_rate[ci][mi][li]:.4f}", f"{mean_turns[ci][mi][li]:.2f}"])
+
+
+def write_npz(path, class_ids, monster_ids, levels, win_rate, mean_turns):
+    """Matrices [classe, monstre, niveau] plus les libellés des axes."""
+    if np is None:
+        raise RuntimeError("NumPy est requis pour la sortie NPZ (utilisez --output fichier.csv)")
+    np.savez_compressed(
+        path,
+        classes=np.array(class_ids), monsters=np.array(monster_ids), levels=np.array(levels),
+        win_rate=np.array(win_rate, dtype=np.float32), mean_turns=np.array(mean_turns, dtype=np.float32)
+    )
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m tools.balance_sweep
+    """
+    parser = argparse.ArgumentParser(prog="python -m tools.balance_sweep",
+                                     description="Matrice d'équilibrage classes x monstres x niveaux.")
+    parser.add_argument("--levels", default="1-20", help="Niveaux, ex. 1-20 ou 1,5,10 (défaut: 1-20)")
+    parser.add_argument("--fights", type=int, default=100, help="Combats par cellule (défaut: 100)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: nombre de coeurs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--classes", default=None, help="Classes séparées par des virgules (défaut: toutes)")
+    parser.add_argument("--monsters", default=None, help="Monstres séparés par des virgules (défaut: tous)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", default="balance_sweep.csv", help="Fichier .csv ou .npz")
+    args = parser.parse_args(argv)
+
+    registry = ContentRegistry.get_instance(args.data_dir)
+    class_ids = args.classes.split(",") if args.classes else list(registry.get("classes/base_classes.json", {}))
+    monster_ids = args.monsters.split(",") if args.monsters else [m["id"] for m in registry.get_monsters()]
+    levels = parse_levels(args.levels)
+    if not class_ids or not monster_ids or not levels:
+        print("Rien à simuler (classes, monstres ou niveaux vides).", file=sys.stderr)
+        return 1
+
+    cells = len(class_ids) * len(monster_ids) * len(levels)
+    print(f"{len(class_ids)} classes x {len(monster_ids)} monstres x {len(levels)} niveaux "
+          f"= {cells} cellules, {cells * args.fights} combats", file=sys.stderr)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} tâches", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    win_rate, mean_turns = run_sweep(class_ids, monster_ids, levels, args.fights,
+                                     args.workers, args.seed, args.data_dir, progress)
+    print(f"\nTerminé en {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    if args.output.endswith(".npz"):
+        write_npz(args.output, class_ids, monster_ids, levels, win_rate, mean_turns)
+    else:
+        write_csv(args.output, class_ids, monster_ids, levels, win_rate, mean_turns)
+    print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+replay.py - Re-run recorded FateQuest fights headless and check they reproduce.
+The recorded RNG draws are fed back to the combat rules in order; the replay is
+recorded again and compared event by event (actions, draws, HP deltas, result).
+A divergence means the rules or the data changed since the fight, or the
+recording is not the fight that was played.
+
+Usage (depuis Console_VR/):
+    python -m tools.replay saves/replays/20250101_120000.fqr
+    python -m tools.replay saves/replays/*.fqr --events
+"""
+
+import sys
+import argparse
+from typing import NamedTuple, Optional
+
+from core.combat import Combat
+from core.content import DEFAULT_DATA_DIR
+from core.effects import EffectScheduler
+from core.items import ItemManager
+from core.messages import muted
+from core.monsters import MonsterManager
+from core import replay
+from core.replay import CombatLog, CombatRecorder, EVENT_NAMES
+
+
+class ReplayDivergence(Exception):
+    """The replayed fight asked for a draw the recording does not have."""
+
+
+class ReplayResult(NamedTuple):
+    """ok: the replay reproduced the recording; otherwise index/message describe the first difference."""
+    ok: bool
+    events: int
+    index: Optional[int] = None
+    message: str = ""
+
+
+class ReplayRandom:
+    """
+    Serves the recorded draws in order instead of drawing new ones (randint,
+    random and randrange, which RecordingRandom uses for choice).
+    """
+    def __init__(self, log):
+        self._draws = iter(log.rng_draws())
+        self.used = 0
+
+    def _next(self, code):
+        try:
+            recorded, value = next(self._draws)
+        except StopIteration:
+            raise ReplayDivergence(f"draw #{self.used + 1} ({EVENT_NAMES[code]}) is not in the recording")
+        if recorded != code:
+            raise ReplayDivergence(f"draw #{self.used + 1}: recorded {EVENT_NAMES[recorded]}, "
+                                   f"replay asked for {EVENT_NAMES[code]}")
+        self.used += 1
+        return value
+
+    def randint(self, a, b):
+        value = int(self._next(replay.RNG_INT))
+        if not a <= value <= b:
+            raise ReplayDivergence(f"draw #{self.used}: {value} outside randint({a}, {b})")
+        return value
+
+    def random(self):
+        return self._next(replay.RNG_FLOAT)
+
+    def randrange(self, n):
+        index = int(self._next(replay.RNG_CHOICE))
+        if not 0 <= index < n:
+            raise ReplayDivergence(f"draw #{self.used}: index {index} outside a choice of {n}")
+        return index
+
+
+class ReplayPlayer:
+    """Player rebuilt from the recording header (only the fields the combat rules use)."""
+    def __init__(self, log):
+        stats = log.player
+        self.name = "Replay"
+        self.hp = stats['hp']
+        self.max_hp = stats['max_hp']
+        self.speed = stats['speed']
+        for stat in ('attack', 'defense'):
+            if stats.get(stat) is not None:
+                setattr(self, stat, stats[stat])
+        self.titles = list(log.titles)
+        self.skills = {}
+        self.defending = False
+        self.status_effects = EffectScheduler.from_list(
+            [{'stat': stat, 'value': value, 'duration': duration} for stat, value, duration in log.effects]
+        )
+        self.loot = []
+
+    def add_item(self, item):
+        self.loot.append(item)
+
+
+class ReplayCombat(Combat):
+    """Combat without output, recording itself to compare with the original."""
+    def _say(self, message):
+        pass
+
+    def _display_combat_status(self):
+        pass
+
+
+def build_enemies(log, monster_manager):
+    """Instances des ennemis du combat, avec les statistiques enregistrées."""
+    enemies = []
+    for enemy_id, stats in log.enemies:
+        template = monster_manager.get_monster_by_id(enemy_id) or {'id': enemy_id, 'name': enemy_id}
+        enemy = monster_manager.instantiate(template, stats.get('level'))
+        for stat in replay.ENEMY_STATS[1:]:
+            if stats.get(stat) is not None:
+                enemy[stat] = stats[stat]
+        enemies.append(enemy)
+    return enemies
+
+
+def replay_log(log, monster_manager, item_manager):
+    """Rejoue un CombatLog et renvoie un ReplayResult."""
+    recorder = CombatRecorder()
+    combat = ReplayCombat(ReplayPlayer(log), monster_manager, item_manager, None,
+                          rng=ReplayRandom(log), content=monster_manager.content, recorder=recorder)
+    enemies = build_enemies(log, monster_manager)
+    try:
+        with muted():
+            if log.mode == replay.MODE_GROUP:
+                combat.start_group_combat(enemies)
+            elif log.mode == replay.MODE_AUTO:
+                combat.auto_resolve(enemies[0])
+            else:
+                combat.start_combat(enemies[0])
+    except ReplayDivergence as e:
+        partial = recorder.log
+        return ReplayResult(False, len(log), len(partial) if partial is not None else 0, str(e))
+    return compare_logs(log, recorder.last)
+
+
+def compare_logs(expected, actual):
+    """Premier événement différent entre deux enregistrements."""
+    if actual is None:
+        return ReplayResult(False, len(expected), 0, "the replay did not finish the fight")
+    for index, (want, got) in enumerate(zip(expected.events(), actual.events())):
+        if want != got:
+            return ReplayResult(False, len(expected), index,
+                                f"expected {format_event(want)}, replay gave {format_event(got)}")
+    if len(expected) != len(actual):
+        index = min(len(expected), len(actual))
+        return ReplayResult(False, len(expected), index,
+                            f"recording has {len(expected)} events, replay has {len(actual)}")
+    return ReplayResult(True, len(expected))
+
+
+def format_event(event):
+    turn, actor, code, value = event
+    who = "player" if actor == replay.PLAYER_ACTOR else f"enemy#{actor - 1}"
+    value = int(value) if float(value).is_integer() else value
+    return f"turn {turn} {who} {EVENT_NAMES.get(code, code)} {value}"
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m tools.replay
+    """
+    parser = argparse.ArgumentParser(prog="python -m tools.replay",
+                                     description="Rejoue des combats enregistrés et vérifie qu'ils se reproduisent.")
+    parser.add_argument("files", nargs="+", help="Fichiers .fqr")
+    parser.add_argument("--events", action="store_true", help="Affiche aussi les événements enregistrés")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    args = parser.parse_args(argv)
+
+    with muted():
+        monster_manager = MonsterManager(args.data_dir)
+        item_manager = ItemManager(args.data_dir, content=monster_manager.content)
+    results = {replay.RESULT_PLAYER: "player won", replay.RESULT_ENEMY: "enemy won", replay.RESULT_FLED: "fled",
+               replay.RESULT_UNDECIDED: "undecided"}
+    failures = 0
+    for path in args.files:
+        try:
+            logs = CombatLog.load_all(path)
+        except (OSError, replay.ReplayFormatError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        # Un fichier de session contient tous les combats de la session
+        for number, log in enumerate(logs, 1):
+            name = f"{path}#{number}"
+            if args.events:
+                for event in log.events():
+                    print("  " + format_event(event))
+            result = replay_log(log, monster_manager, item_manager)
+            outcome = results.get(log.result, "unfinished")
+            if result.ok:
+                print(f"{name}: OK ({result.events} events, {outcome})")
+            else:
+                failures += 1
+                print(f"{name}: DIVERGENCE at event {result.index}: {result.message}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())